@@ -0,0 +1,293 @@
+"""
+Generation Benchmark
+Drives TTSGenerator.generate_audio over a fixed corpus and reports latency
+percentiles, time-to-first-audio, real-time factor and peak memory
+
+Usage (from the repository root):
+    python src/benchmarks/generation.py --languages en,es --runs 3 --output bench.json
+    python src/benchmarks/generation.py --baseline bench.json --tolerance 0.1
+    python src/benchmarks/generation.py --qualities final,draft --output draft_vs_final.json
+"""
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import summarize, compare_to_baseline, load_report, write_report
+from utils.memory import peak_rss_bytes
+from utils.config import SUPPORTED_LANGUAGES, PRECISIONS, DEFAULT_PRECISION, GENERATION_QUALITIES
+from utils.resource_path import get_reference_voices_dir
+
+# Fixed corpus - keep the texts stable so reports stay comparable
+CORPUS = {
+    "en": {
+        "short": "Hello there, welcome back.",
+        "medium": (
+            "The quick brown fox jumps over the lazy dog. It then takes a short nap in the "
+            "afternoon sun, while the farmer repairs the old wooden fence."
+        ),
+        "long": (
+            "Every morning the lighthouse keeper climbed the narrow stairs to check the lamp. "
+            "The sea was calm on most days, but in winter the storms came without warning. "
+            "Ships passing the rocks relied on the steady beam to find their way home. "
+            "Over the years he kept a journal of every vessel that sailed by. "
+            "Some entries were short, just a name and a time, while others filled whole pages. "
+            "When he finally retired, the journal was given to the town museum, "
+            "where visitors still read it on quiet afternoons."
+        ),
+    },
+    "es": {
+        "short": "Hola, bienvenidos de nuevo.",
+        "medium": (
+            "El zorro marrón salta sobre el perro perezoso. Después duerme una siesta "
+            "al sol de la tarde mientras el granjero arregla la cerca."
+        ),
+    },
+    "fr": {
+        "short": "Bonjour, et bon retour parmi nous.",
+        "medium": (
+            "Le renard brun saute par-dessus le chien paresseux. Ensuite, il fait une sieste "
+            "au soleil pendant que le fermier répare la vieille clôture."
+        ),
+    },
+    "de": {
+        "short": "Hallo, willkommen zurück.",
+        "medium": (
+            "Der schnelle braune Fuchs springt über den faulen Hund. Danach macht er ein "
+            "Nickerchen in der Nachmittagssonne, während der Bauer den Zaun repariert."
+        ),
+    },
+    "ja": {
+        "short": "こんにちは、おかえりなさい。",
+        "medium": "素早い茶色の狐が怠け者の犬を飛び越えます。その後、午後の日差しの中で昼寝をします。",
+    },
+    "zh": {
+        "short": "你好，欢迎回来。",
+        "medium": "敏捷的棕色狐狸跳过了懒狗。然后它在午后的阳光下小睡了一会儿。",
+    },
+}
+
+# Lower is better for every compared metric
+COMPARED_METRICS = ["latency_p50", "latency_p95", "ttfa_p50", "rtf_p50", "peak_rss_mb"]
+
+
+def _voice_configs(language: str, custom_voice: str = None) -> dict:
+    """Voice variants for a language: default, first predefined voice, optional custom file"""
+    voices = {"default": {"mode": "predefined", "voice": "Default", "voice_file": None}}
+    
+    lang_folder = get_reference_voices_dir() / language
+    files = sorted(lang_folder.glob("*.wav")) + sorted(lang_folder.glob("*.flac")) if lang_folder.exists() else []
+    if files:
+        voices["predefined"] = {"mode": "predefined", "voice": files[0].stem, "voice_file": files[0]}
+    
+    if custom_voice:
+        voices["custom"] = {"mode": "custom", "custom_path": Path(custom_voice)}
+    
+    return voices
+
+
+def build_cases(args) -> list:
+    """Expand the corpus into (case id, text, language, voice config, pitch, quality) tuples"""
+    cases = []
+    for language in args.languages:
+        texts = CORPUS[language]
+        voices = _voice_configs(language, args.custom_voice)
+        for length in args.lengths:
+            if length not in texts:
+                continue
+            for voice_name, voice_config in voices.items():
+                for pitch in args.pitch_shifts:
+                    for quality in args.qualities:
+                        # Final cases keep their ids so older reports stay comparable
+                        case_id = f"{language}/{length}/{voice_name}/pitch{pitch:+d}"
+                        if quality != "final":
+                            case_id += f"/{quality}"
+                        cases.append((case_id, texts[length], language, voice_config, pitch, quality))
+    return cases
+
+
+def _audio_seconds(path: Path) -> float:
+    """Duration of a written audio file"""
+    import torchaudio
+    info = torchaudio.info(str(path))
+    return info.num_frames / info.sample_rate
+
+
+def _track_first_audio(generator):
+    """
+    Record when the first chunk's waveform of a generation is ready
+    
+    Returns:
+        dict: {"first": perf_counter timestamp or None} - reset it before each run
+    """
+    marker = {"first": None}
+    submit_model_chunk = generator.submit_model_chunk
+    
+    def submit(*args, **kwargs):
+        future = submit_model_chunk(*args, **kwargs)
+        
+        def ready(_):
+            if marker["first"] is None:
+                marker["first"] = time.perf_counter()
+        
+        future.add_done_callback(ready)
+        return future
+    
+    generator.submit_model_chunk = submit
+    return marker
+
+
+def run_case(generator, marker, case, args, output_dir: Path) -> dict:
+    """Render one case args.runs times and summarize it"""
+    case_id, text, language, voice_config, pitch, quality = case
+    expression_config = {"mode": "parameters", "energy": 0.7, "speed": 0.4, "emphasis": 0.9, "pitch": pitch}
+    output_path = output_dir / (case_id.replace("/", "_") + ".wav")
+    
+    latencies, ttfas, rtfs = [], [], []
+    audio_seconds = 0.0
+    for run in range(args.runs):
+        marker["first"] = None
+        start = time.perf_counter()
+        result = generator.generate_audio(
+            text, voice_config, expression_config, output_path, language, quality=quality, seed=args.seed + run
+        )
+        elapsed = time.perf_counter() - start
+        if not result:
+            raise RuntimeError(f"generation failed for {case_id}")
+        
+        audio_seconds = _audio_seconds(result)
+        latencies.append(elapsed)
+        ttfas.append((marker["first"] or time.perf_counter()) - start)
+        rtfs.append(elapsed / audio_seconds if audio_seconds else 0.0)
+        print(f"   {case_id} run {run + 1}: {elapsed:.2f}s for {audio_seconds:.2f}s of audio (RTF {rtfs[-1]:.3f})")
+    
+    peak = peak_rss_bytes()
+    return {
+        "runs": args.runs,
+        "audio_seconds": round(audio_seconds, 3),
+        **summarize(latencies, "latency"),
+        **summarize(ttfas, "ttfa"),
+        **summarize(rtfs, "rtf", digits=4),
+        "peak_rss_mb": round(peak / 1024**2, 1) if peak else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark generate_audio over a fixed corpus")
+    parser.add_argument("--languages", default="en", help=f"Comma separated languages ({', '.join(CORPUS)})")
+    parser.add_argument("--lengths", default="short,medium,long", help="Comma separated text lengths")
+    parser.add_argument("--pitch-shifts", default="0,3", help="Comma separated pitch shifts in semitones")
+    parser.add_argument("--custom-voice", default=None, help="Reference audio file for the custom voice case")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default=None, help="Device (default: auto-detect)")
+    parser.add_argument("--precision", choices=PRECISIONS, default=DEFAULT_PRECISION, help="Token model precision")
+    parser.add_argument("--quantize", action="store_true", help="Use the int8 token model (CPU only)")
+    parser.add_argument("--qualities", default="final", help=f"Comma separated qualities ({', '.join(GENERATION_QUALITIES)})")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per case (after one warm-up generation)")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed of the first run (incremented per run)")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a report from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs the baseline (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+    
+    args.languages = [code.strip() for code in args.languages.split(",") if code.strip()]
+    args.lengths = [length.strip() for length in args.lengths.split(",") if length.strip()]
+    args.pitch_shifts = [int(value) for value in args.pitch_shifts.split(",") if value.strip()]
+    args.qualities = [quality.strip() for quality in args.qualities.split(",") if quality.strip()]
+    for quality in args.qualities:
+        if quality not in GENERATION_QUALITIES:
+            print(f"❌ Unknown quality '{quality}' (available: {', '.join(GENERATION_QUALITIES)})")
+            return 1
+    for code in args.languages:
+        if code not in CORPUS or code not in SUPPORTED_LANGUAGES:
+            print(f"❌ No benchmark corpus for language '{code}' (available: {', '.join(CORPUS)})")
+            return 1
+    
+    from features.generate import TTSGenerator
+    
+    generator = TTSGenerator()
+    if not generator.initialize(force_device=args.device, quantize=args.quantize, precision=args.precision):
+        print("❌ Could not load models")
+        return 1
+    
+    cases = build_cases(args)
+    print(f"\n📏 {len(cases)} case(s) x {args.runs} run(s) on {generator.device_name}")
+    
+    with tempfile.TemporaryDirectory(prefix="chatterbox_bench_") as temp_dir:
+        output_dir = Path(temp_dir)
+        
+        # One untimed generation so model warm-up does not skew the first case
+        generator.generate_audio(CORPUS["en"]["short"], {"mode": "predefined"}, {"mode": "text"}, output_dir / "warmup.wav")
+        
+        marker = _track_first_audio(generator)
+        results = {}
+        for case in cases:
+            results[case[0]] = run_case(generator, marker, case, args, output_dir)
+    
+    all_latency = [case["latency_p50"] for case in results.values()]
+    all_rtf = [case["rtf_p50"] for case in results.values()]
+    all_ttfa = [case["ttfa_p50"] for case in results.values()]
+    peak = peak_rss_bytes()
+    
+    # Final latency / draft latency of the same text, voice and pitch
+    draft_speedups = {
+        case_id[:-len("/draft")]: round(results[case_id[:-len("/draft")]]["latency_p50"] / case["latency_p50"], 2)
+        for case_id, case in results.items()
+        if case_id.endswith("/draft") and case_id[:-len("/draft")] in results and case["latency_p50"]
+    }
+    
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "device": generator.device,
+            "precision": generator.precision,
+            "quantize": generator.quantize,
+            "runs": args.runs,
+            "seed": args.seed,
+            "qualities": args.qualities,
+        },
+        "summary": {
+            "cases": len(results),
+            **summarize(all_latency, "case_latency"),
+            **summarize(all_ttfa, "case_ttfa"),
+            **summarize(all_rtf, "case_rtf", digits=4),
+            "peak_rss_mb": round(peak / 1024**2, 1) if peak else None,
+            **(summarize(list(draft_speedups.values()), "draft_speedup", digits=2) if draft_speedups else {}),
+        },
+        "draft_speedup": draft_speedups,
+        "cases": results,
+    }
+    
+    regressions = []
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        report["baseline"] = {"path": args.baseline, "tolerance": args.tolerance}
+        report["comparison"], regressions = compare_to_baseline(
+            results, baseline.get("cases", {}), COMPARED_METRICS, args.tolerance
+        )
+        report["regressions"] = regressions
+    
+    generator.cleanup()
+    write_report(report, args.output)
+    
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
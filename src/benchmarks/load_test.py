@@ -0,0 +1,323 @@
+"""
+Daemon Load Test
+Fires concurrent request mixes at one or more local daemons (render nodes)
+and reports throughput, tail latency and error rate per configuration
+
+Each configuration starts fresh daemon processes (--daemon with their own
+info files), so node counts and batch windows are compared under the same
+request stream. Mixes cover languages, text lengths and a repeat ratio
+(exact repeats of earlier requests, which reuse the voice conditioning).
+
+Usage (from the repository root):
+    python src/benchmarks/load_test.py --stub-models --stub-rtf 0.1 --nodes 1,2,4 --batch-windows 0,100
+    python src/benchmarks/load_test.py --device cpu --nodes 1,2 --requests 30 --concurrency 4 --output load.json
+    python src/benchmarks/load_test.py --stub-models --baseline load.json --tolerance 0.1
+"""
+
+import argparse
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import percentile, summarize, compare_to_baseline, load_report, write_report
+from benchmarks.generation import CORPUS, _voice_configs
+from features.daemon import DaemonClient
+from features.metrics import GenerationMetrics
+from features.stub_models import configure_stub_models
+from utils.config import PRIORITY_NORMAL
+
+MAIN_SCRIPT = Path(__file__).resolve().parent.parent / "main.py"
+
+# Lower is better for all of them (seconds_per_request is 1 / throughput)
+COMPARED_METRICS = ["latency_p50", "latency_p95", "latency_p99", "seconds_per_request"]
+
+EXPRESSION = {"mode": "parameters", "energy": 0.7, "speed": 0.4, "emphasis": 0.9, "pitch": 0}
+
+
+def _parse_mix(text: str) -> dict:
+    """"short=0.6,medium=0.3,long=0.1" -> {"short": 0.6, ...}"""
+    mix = {}
+    for part in text.split(","):
+        if part.strip():
+            name, _, weight = part.partition("=")
+            mix[name.strip()] = float(weight or 1)
+    return mix
+
+
+def build_requests(args) -> list:
+    """
+    The request stream shared by every configuration
+    
+    Returns:
+        list: (language, length, text, voice config, seed) tuples
+    """
+    rng = random.Random(args.seed)
+    voices = {language: list(_voice_configs(language, args.custom_voice).values()) for language in args.languages}
+    
+    requests = []
+    for index in range(args.requests):
+        if requests and rng.random() < args.repeat_ratio:
+            requests.append(rng.choice(requests))
+            continue
+        
+        language = rng.choice(args.languages)
+        lengths = [name for name in args.mix if name in CORPUS[language]]
+        length = rng.choices(lengths, weights=[args.mix[name] for name in lengths])[0]
+        requests.append((language, length, CORPUS[language][length], rng.choice(voices[language]), args.seed + index))
+    return requests
+
+
+def start_nodes(count: int, batch_window_ms: int, args, work_dir: Path) -> list:
+    """
+    Launch daemons and wait until they accept requests
+    
+    Returns:
+        list: (process, DaemonClient) per node
+    """
+    nodes = []
+    for index in range(count):
+        info_path = work_dir / f"node{index}.json"
+        command = [
+            sys.executable, str(MAIN_SCRIPT), "--daemon", "--daemon-info", str(info_path),
+            "--metrics-port", "0", "--batch-window-ms", str(batch_window_ms), "--no-warmup",
+        ]
+        if args.device:
+            command += ["--device", args.device]
+        if args.stub_models:
+            command.append("--stub-models")
+        log_file = open(work_dir / f"node{index}.log", "w", encoding="utf-8")
+        process = subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+        nodes.append((process, info_path, log_file))
+    
+    ready = []
+    deadline = time.time() + args.startup_timeout
+    for process, info_path, log_file in nodes:
+        client = None
+        while client is None:
+            if process.poll() is not None or time.time() > deadline:
+                stop_nodes([(p, None) for p, _, _ in nodes])
+                raise RuntimeError(f"daemon {info_path.stem} did not start - see {log_file.name}")
+            time.sleep(0.5)
+            if info_path.exists():
+                client = DaemonClient.connect(info_path)
+        ready.append((process, client))
+    return ready
+
+
+def stop_nodes(nodes: list):
+    """Shut the daemons down (killing any that do not exit)"""
+    for process, client in nodes:
+        if client is not None:
+            try:
+                client.shutdown()
+            except Exception:
+                pass
+    for process, _ in nodes:
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def run_config(node_count: int, batch_window_ms: int, requests: list, args, work_dir: Path) -> dict:
+    """Run the request stream against node_count daemons and summarize it"""
+    nodes = start_nodes(node_count, batch_window_ms, args, work_dir)
+    clients = [client for _, client in nodes]
+    outstanding = [0] * len(clients)
+    lock = threading.Lock()
+    results = []
+    
+    def send(index: int, request) -> dict:
+        language, length, text, voice_config, seed = request
+        # Least outstanding requests first
+        with lock:
+            node = min(range(len(clients)), key=lambda i: outstanding[i])
+            outstanding[node] += 1
+        
+        metrics = GenerationMetrics(f"Load {index}", auto_log=False, kind="load")
+        start = time.perf_counter()
+        try:
+            result = clients[node].generate_audio(
+                text, voice_config, EXPRESSION, work_dir / f"out_{index}.wav", language,
+                seed=seed, metrics=metrics, priority=PRIORITY_NORMAL
+            )
+            error = None if result else "generation failed"
+        except Exception as e:
+            error = str(e)
+        finally:
+            with lock:
+                outstanding[node] -= 1
+        
+        return {
+            "node": node,
+            "language": language,
+            "length": length,
+            "latency": time.perf_counter() - start,
+            "audio_seconds": metrics.audio_seconds or 0.0,
+            "error": error,
+        }
+    
+    try:
+        # One untimed request per node loads lazily initialized state
+        for client in clients:
+            client.generate_audio(CORPUS["en"]["short"], _voice_configs("en")["default"], EXPRESSION, work_dir / "warmup.wav", "en")
+        
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            results = list(pool.map(send, range(len(requests)), requests))
+        elapsed = time.perf_counter() - started
+    finally:
+        stop_nodes(nodes)
+    
+    ok = [r for r in results if not r["error"]]
+    latencies = [r["latency"] for r in ok]
+    errors = sorted({r["error"] for r in results if r["error"]})
+    return {
+        "nodes": node_count,
+        "batch_window_ms": batch_window_ms,
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "error_rate": round((len(results) - len(ok)) / len(results), 4),
+        "wall_seconds": round(elapsed, 2),
+        "throughput_rps": round(len(ok) / elapsed, 3),
+        "seconds_per_request": round(elapsed / len(ok), 3) if ok else None,
+        "audio_seconds_per_second": round(sum(r["audio_seconds"] for r in ok) / elapsed, 3),
+        **summarize(latencies, "latency"),
+        "latency_p99": round(percentile(latencies, 99), 3) if latencies else None,
+        "by_length": {
+            length: summarize([r["latency"] for r in ok if r["length"] == length], "latency")
+            for length in sorted({r["length"] for r in ok})
+        },
+        "requests_per_node": [sum(1 for r in results if r["node"] == node) for node in range(node_count)],
+        "error_messages": errors[:5],
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Load test local daemons with concurrent request mixes")
+    parser.add_argument("--nodes", default="1,2", help="Comma separated daemon counts to compare")
+    parser.add_argument("--batch-windows", default="0,100", help="Comma separated daemon batch windows (ms) to compare")
+    parser.add_argument("--requests", type=int, default=40, help="Requests per configuration")
+    parser.add_argument("--concurrency", type=int, default=4, help="Requests in flight at once")
+    parser.add_argument("--languages", default="en", help=f"Comma separated languages ({', '.join(CORPUS)})")
+    parser.add_argument("--mix", default="short=0.6,medium=0.3,long=0.1", help="Text length weights")
+    parser.add_argument("--repeat-ratio", type=float, default=0.2, help="Fraction of requests repeating an earlier one")
+    parser.add_argument("--custom-voice", default=None, help="Reference audio file added to the voice mix")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default=None, help="Daemon device (default: auto-detect)")
+    parser.add_argument("--stub-models", action="store_true", help="Run the daemons with the stub models")
+    parser.add_argument("--stub-rtf", type=float, default=0.1, help="Simulated stub compute per second of audio")
+    parser.add_argument("--seed", type=int, default=1234, help="Seed of the request stream")
+    parser.add_argument("--startup-timeout", type=float, default=900, help="Seconds to wait for the daemons to load")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a report from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs the baseline (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+    
+    args.languages = [code.strip() for code in args.languages.split(",") if code.strip()]
+    args.mix = _parse_mix(args.mix)
+    node_counts = [int(value) for value in args.nodes.split(",") if value.strip()]
+    windows = [int(value) for value in args.batch_windows.split(",") if value.strip()]
+    for code in args.languages:
+        if code not in CORPUS:
+            print(f"❌ No corpus for language '{code}' (available: {', '.join(CORPUS)})")
+            return 1
+    
+    if args.stub_models:
+        # Inherited by the daemon processes
+        configure_stub_models(rtf=args.stub_rtf)
+    
+    requests = build_requests(args)
+    configs = {}
+    with tempfile.TemporaryDirectory(prefix="chatterbox_load_") as temp_dir:
+        for node_count in node_counts:
+            for window in windows:
+                print(f"\n📡 {node_count} node(s), batch window {window} ms: {len(requests)} requests x {args.concurrency} concurrent")
+                work_dir = Path(temp_dir) / f"n{node_count}_w{window}"
+                work_dir.mkdir()
+                try:
+                    result = run_config(node_count, window, requests, args, work_dir)
+                except RuntimeError as e:
+                    print(f"❌ {e}")
+                    print((work_dir / "node0.log").read_text(encoding="utf-8", errors="replace")[-2000:])
+                    return 1
+                configs[f"n{node_count}_w{window}"] = result
+                print(
+                    f"   {result['throughput_rps']:.2f} req/s, p50 {result['latency_p50']}s, "
+                    f"p99 {result['latency_p99']}s, errors {result['error_rate']:.1%}"
+                )
+    
+    # Best configuration per node count, and how well throughput scales with nodes
+    best = {}
+    for result in configs.values():
+        if result["nodes"] not in best or result["throughput_rps"] > best[result["nodes"]]["throughput_rps"]:
+            best[result["nodes"]] = result
+    single = best.get(min(best)) if best else None
+    sizing = [
+        {
+            "nodes": nodes,
+            "batch_window_ms": result["batch_window_ms"],
+            "throughput_rps": result["throughput_rps"],
+            "latency_p95": result["latency_p95"],
+            "scaling_efficiency": round(
+                result["throughput_rps"] / (single["throughput_rps"] * nodes / single["nodes"]), 3
+            ) if single and single["throughput_rps"] else None,
+        }
+        for nodes, result in sorted(best.items())
+    ]
+    
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "languages": args.languages,
+            "mix": args.mix,
+            "repeat_ratio": args.repeat_ratio,
+            "device": args.device,
+            "stub_models": args.stub_models,
+            "stub_rtf": args.stub_rtf if args.stub_models else None,
+        },
+        "sizing": sizing,
+        "configs": configs,
+    }
+    
+    regressions = []
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        report["baseline"] = {"path": args.baseline, "tolerance": args.tolerance}
+        report["comparison"], regressions = compare_to_baseline(
+            configs, baseline.get("configs", {}), COMPARED_METRICS, args.tolerance
+        )
+        report["regressions"] = regressions
+    
+    write_report(report, args.output)
+    
+    failed = [config_id for config_id, result in configs.items() if result["errors"]]
+    if failed:
+        print(f"\n❌ Failed requests in: {', '.join(failed)}")
+        return 1
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+App Overhead Benchmark
+Times everything around the model - progress thread, pitch shift, saving,
+export copy and player loading - using the stub models, so it runs on any
+machine without the model weights
+
+Usage (from the repository root):
+    python src/benchmarks/overhead.py --runs 20 --output overhead.json
+    python src/benchmarks/overhead.py --stub-rtf 0.05 --isolated --baseline overhead.json
+"""
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import summarize, compare_to_baseline, load_report, write_report
+from utils.memory import peak_rss_bytes
+from benchmarks.generation import CORPUS
+from features.stub_models import configure_stub_models
+from utils.config import PITCH_TIERS
+
+EXPRESSION = {"mode": "parameters", "energy": 0.7, "speed": 0.4, "emphasis": 0.9, "pitch": 0}
+
+COMPARED_METRICS = ["seconds_p50", "seconds_p95", "overhead_p50", "overhead_p95"]
+
+
+def _timed(runs: int, action) -> list:
+    """Run action() runs times and return the durations"""
+    durations = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        action()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def bench_generate(generator, args, output_dir: Path) -> dict:
+    """
+    End-to-end generate_audio per text length and pitch shift
+    
+    Model time is measured around each chunk's synthesis, so "overhead" is
+    everything generate_audio spends outside the (stub) model.
+    """
+    model_seconds = []
+    submit_model_chunk = generator.submit_model_chunk
+    
+    def timed_submit(*call_args, **kwargs):
+        start = time.perf_counter()
+        future = submit_model_chunk(*call_args, **kwargs)
+        future.result()
+        model_seconds.append(time.perf_counter() - start)
+        return future
+    
+    generator.submit_model_chunk = timed_submit
+    progress_updates = []
+    
+    results = {}
+    for length, text in CORPUS["en"].items():
+        for pitch in (0, args.pitch):
+            case_id = f"generate/{length}/pitch{pitch:+d}"
+            expression = dict(EXPRESSION, pitch=pitch)
+            latencies, overheads = [], []
+            progress_updates.clear()
+            
+            for run in range(args.runs):
+                model_seconds.clear()
+                start = time.perf_counter()
+                generator.generate_audio(
+                    text, {"mode": "predefined"}, expression, output_dir / "bench.wav", "en",
+                    progress_callback=lambda percent, status: progress_updates.append(percent)
+                )
+                elapsed = time.perf_counter() - start
+                latencies.append(elapsed)
+                overheads.append(elapsed - sum(model_seconds))
+            
+            results[case_id] = {
+                **summarize(latencies, "seconds", digits=4),
+                **summarize(overheads, "overhead", digits=4),
+                "progress_updates_per_run": round(len(progress_updates) / args.runs, 1),
+            }
+            print(f"   {case_id}: p50 {results[case_id]['seconds_p50']:.4f}s, overhead p50 {results[case_id]['overhead_p50']:.4f}s")
+    
+    generator.submit_model_chunk = submit_model_chunk
+    return results
+
+
+def bench_stages(generator, args, output_dir: Path) -> dict:
+    """Time the post-processing stages on their own"""
+    import torchaudio as ta
+    from features.export import copy_export
+    
+    model = generator.residency.get("english")
+    wav = model.generate(CORPUS["en"]["long"])
+    source = output_dir / "stage.wav"
+    ta.save(str(source), wav, generator.sample_rate)
+    
+    stages = {
+        "pitch_shift/quality": lambda: generator._apply_pitch_shift(wav, args.pitch, PITCH_TIERS["quality"]),
+        "pitch_shift/fast": lambda: generator._apply_pitch_shift(wav, args.pitch, PITCH_TIERS["fast"]),
+        "save": lambda: ta.save(str(output_dir / "save.wav"), wav, generator.sample_rate),
+        "export_copy": lambda: copy_export(source, output_dir / "export", "wav"),
+    }
+    
+    player_load = _player_load_action(source)
+    if player_load:
+        stages["player_load"] = player_load
+    
+    results = {}
+    for name, action in stages.items():
+        results[f"stage/{name}"] = summarize(_timed(args.runs, action), "seconds", digits=4)
+        print(f"   stage/{name}: p50 {results[f'stage/{name}']['seconds_p50']:.4f}s")
+    return results
+
+
+def _player_load_action(audio_path: Path):
+    """Loading into the built-in player (skipped without a display or pygame)"""
+    import tkinter as tk
+    from components.audio_player import AudioPlayerComponent
+    
+    try:
+        root = tk.Tk()
+        root.withdraw()
+    except tk.TclError:
+        print("   ⚠️ No display - skipping player_load")
+        return None
+    
+    player = AudioPlayerComponent(root)
+    if not player.audio_available:
+        print("   ⚠️ pygame not installed - skipping player_load")
+        root.destroy()
+        return None
+    
+    return lambda: player.load_audio(audio_path)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark app overhead around the model with stub models")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per case")
+    parser.add_argument("--pitch", type=int, default=3, help="Pitch shift used for the shifted cases")
+    parser.add_argument("--stub-rtf", type=float, default=0.0, help="Simulated model compute per second of audio")
+    parser.add_argument("--stub-delay", type=float, default=0.0, help="Simulated fixed model cost per chunk")
+    parser.add_argument("--isolated", action="store_true", help="Run the stub models in the synthesis worker process")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a report from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown vs the baseline (0.15 = 15%%)")
+    args = parser.parse_args(argv)
+    
+    configure_stub_models(rtf=args.stub_rtf, fixed_delay=args.stub_delay)
+    
+    from features.generate import TTSGenerator
+    
+    generator = TTSGenerator()
+    if not generator.initialize(force_device="cpu", isolate=args.isolated, stub_models=True):
+        print("❌ Could not start the stub models")
+        return 1
+    
+    with tempfile.TemporaryDirectory(prefix="chatterbox_overhead_") as temp_dir:
+        output_dir = Path(temp_dir)
+        print(f"\n📏 generate_audio with stub models ({args.runs} runs per case)")
+        results = bench_generate(generator, args, output_dir)
+        
+        if not args.isolated:
+            print("\n📏 Post-processing stages")
+            results.update(bench_stages(generator, args, output_dir))
+    
+    peak = peak_rss_bytes()
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "runs": args.runs,
+            "pitch": args.pitch,
+            "stub_rtf": args.stub_rtf,
+            "stub_delay": args.stub_delay,
+            "isolated": args.isolated,
+        },
+        "peak_rss_mb": round(peak / 1024**2, 1) if peak else None,
+        "cases": results,
+    }
+    
+    regressions = []
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        report["baseline"] = {"path": args.baseline, "tolerance": args.tolerance}
+        report["comparison"], regressions = compare_to_baseline(
+            results, baseline.get("cases", {}), COMPARED_METRICS, args.tolerance
+        )
+        report["regressions"] = regressions
+    
+    generator.cleanup()
+    write_report(report, args.output)
+    
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+"""
+Precision Benchmark
+Compares fp32 and bf16 autocast synthesis speed on this host
+
+Usage (from the repository root):
+    python src/benchmarks/precision.py --device cpu --runs 3 --output precision_report.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.generate import TTSGenerator
+from features.precision import device_supports_bf16
+
+DEFAULT_TEXT = "The quick brown fox jumps over the lazy dog, then takes a short nap in the afternoon sun."
+
+
+def _run_variant(generator, model, args) -> dict:
+    """Synthesize the benchmark text args.runs times at generator.precision (after one warm-up run)"""
+    timings = []
+    wav = None
+    
+    for run in range(args.runs + 1):
+        start = time.perf_counter()
+        wav = generator._synthesize_chunk(
+            model, args.text, args.language, args.voice,
+            exaggeration=0.7, cfg_weight=0.4, temperature=0.9, seed=args.seed
+        )
+        elapsed = time.perf_counter() - start
+        
+        audio_seconds = wav.shape[-1] / model.sr
+        if run == 0:
+            print(f"   warm-up: {elapsed:.2f}s")
+            continue
+        print(f"   run {run}: {elapsed:.2f}s for {audio_seconds:.2f}s of audio (RTF {elapsed / audio_seconds:.3f})")
+        timings.append((elapsed, audio_seconds))
+    
+    seconds = statistics.median(t for t, _ in timings)
+    audio_seconds = statistics.median(a for _, a in timings)
+    return {
+        "median_seconds": round(seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "rtf": round(seconds / audio_seconds, 4) if audio_seconds else None,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark: fp32 vs bf16 autocast synthesis")
+    parser.add_argument("--text", default=DEFAULT_TEXT, help="Text to synthesize")
+    parser.add_argument("--language", default="en", help="Language code (en uses the English model)")
+    parser.add_argument("--voice", default=None, help="Optional reference voice file")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default="cpu", help="Device to benchmark")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per variant (after one warm-up)")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed used for every run")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    generator = TTSGenerator()
+    if not generator.initialize(force_device=args.device):
+        print("❌ Could not load models")
+        return 1
+    
+    model = generator.model if args.language == "en" else generator.multilingual_model
+    results = {}
+    
+    for precision in ("fp32", "bf16"):
+        print(f"\n📏 {precision}")
+        # Precision is read per chunk, so both variants share the loaded weights
+        generator.precision = precision
+        results[precision] = _run_variant(generator, model, args)
+    
+    report = {
+        "text": args.text,
+        "language": args.language,
+        "device": generator.device,
+        "processor": platform.processor() or platform.machine(),
+        "native_bf16": device_supports_bf16(generator.device),
+        "runs": args.runs,
+        "fp32": results["fp32"],
+        "bf16": results["bf16"],
+        "speedup": round(results["fp32"]["median_seconds"] / results["bf16"]["median_seconds"], 2),
+    }
+    
+    print("\n" + json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"📄 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
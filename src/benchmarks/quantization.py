@@ -0,0 +1,135 @@
+"""
+Quantization A/B Benchmark
+Compares fp32 and dynamic int8 CPU inference of the token model
+
+Usage (from the repository root):
+    python src/benchmarks/quantization.py --language en --runs 3 --output quant_report.json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from features.generate import TTSGenerator
+from features.quantization import quantize_token_model, module_size_bytes
+from features.synthesis import generate_speech_tokens, vocode_speech_tokens
+
+DEFAULT_TEXT = "The quick brown fox jumps over the lazy dog, then takes a short nap in the afternoon sun."
+
+
+def _run_variant(generator, model, args) -> dict:
+    """Synthesize the benchmark text args.runs times (after one warm-up run)"""
+    import torch
+    
+    timings = []
+    tokens = None
+    wav = None
+    
+    for run in range(args.runs + 1):
+        torch.manual_seed(args.seed)
+        generator._prepare_voice_conditioning(model, args.voice, 0.7)
+        
+        start = time.perf_counter()
+        tokens = generate_speech_tokens(model, args.text, args.language, 0.7, 0.4, 0.9)
+        wav = vocode_speech_tokens(model, tokens)
+        elapsed = time.perf_counter() - start
+        
+        audio_seconds = wav.shape[-1] / model.sr
+        if run == 0:
+            print(f"   warm-up: {elapsed:.2f}s")
+            continue
+        print(f"   run {run}: {elapsed:.2f}s for {audio_seconds:.2f}s of audio (RTF {elapsed / audio_seconds:.3f})")
+        timings.append((elapsed, audio_seconds))
+    
+    seconds = statistics.median(t for t, _ in timings)
+    audio_seconds = statistics.median(a for _, a in timings)
+    return {
+        "median_seconds": round(seconds, 3),
+        "audio_seconds": round(audio_seconds, 3),
+        "rtf": round(seconds / audio_seconds, 4) if audio_seconds else None,
+        "token_model_mb": round(module_size_bytes(model.t3) / 1024**2, 1),
+        "_tokens": tokens.cpu(),
+        "_wav": wav,
+    }
+
+
+def _output_difference(fp32: dict, int8: dict, sample_rate: int) -> dict:
+    """Compare the last fp32 and int8 outputs (same seed and text)"""
+    import torch
+    import torchaudio
+    
+    tokens_a, tokens_b = fp32["_tokens"], int8["_tokens"]
+    common = min(len(tokens_a), len(tokens_b))
+    agreement = (tokens_a[:common] == tokens_b[:common]).float().mean().item() if common else 0.0
+    
+    mel = torchaudio.transforms.MelSpectrogram(sample_rate=sample_rate, n_fft=1024, hop_length=256, n_mels=80)
+    samples = min(fp32["_wav"].shape[-1], int8["_wav"].shape[-1])
+    mel_a = torch.log(mel(fp32["_wav"][..., :samples].float()) + 1e-5)
+    mel_b = torch.log(mel(int8["_wav"][..., :samples].float()) + 1e-5)
+    
+    return {
+        "speech_token_agreement": round(agreement, 4),
+        "speech_tokens_fp32": len(tokens_a),
+        "speech_tokens_int8": len(tokens_b),
+        "duration_diff_seconds": round(int8["audio_seconds"] - fp32["audio_seconds"], 3),
+        "log_mel_l1": round((mel_a - mel_b).abs().mean().item(), 4),
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="A/B benchmark: fp32 vs dynamic int8 token model on CPU")
+    parser.add_argument("--text", default=DEFAULT_TEXT, help="Text to synthesize")
+    parser.add_argument("--language", default="en", help="Language code (en uses the English model)")
+    parser.add_argument("--voice", default=None, help="Optional reference voice file")
+    parser.add_argument("--runs", type=int, default=3, help="Timed runs per variant (after one warm-up)")
+    parser.add_argument("--seed", type=int, default=1234, help="Random seed used for every run")
+    parser.add_argument("--cache-dir", default=None, help="Quantized checkpoint folder (default: app cache)")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    generator = TTSGenerator()
+    if not generator.initialize(force_device="cpu"):
+        print("❌ Could not load models")
+        return 1
+    
+    model_name = "english" if args.language == "en" else "multilingual"
+    model = generator.model if args.language == "en" else generator.multilingual_model
+    
+    print("\n📏 fp32 baseline")
+    fp32 = _run_variant(generator, model, args)
+    
+    print("\n📏 int8 dynamic quantization")
+    if not quantize_token_model(model, model_name, args.cache_dir):
+        return 1
+    # T3 caches a patched wrapper around the fp32 speech head on its first
+    # inference - rebuild it so the int8 run goes through the quantized layers
+    if hasattr(model.t3, "compiled"):
+        model.t3.compiled = False
+    int8 = _run_variant(generator, model, args)
+    
+    report = {
+        "text": args.text,
+        "language": args.language,
+        "runs": args.runs,
+        "fp32": {k: v for k, v in fp32.items() if not k.startswith("_")},
+        "int8": {k: v for k, v in int8.items() if not k.startswith("_")},
+        "speedup": round(fp32["median_seconds"] / int8["median_seconds"], 2),
+        "difference": _output_difference(fp32, int8, model.sr),
+    }
+    
+    print("\n" + json.dumps(report, indent=2))
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"📄 Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
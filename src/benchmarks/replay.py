@@ -0,0 +1,309 @@
+"""
+Replay Benchmark
+Runs a recorded session (--record-session) or a folder of .cbx projects
+against the current build as a realistic workload
+
+Requests are grouped by text length (short UI lines, paragraphs, long
+narration) so the report reflects the real mix rather than one synthetic
+case. Recordings without text are replayed with filler text of the same
+length; voices that no longer exist fall back to the default voice.
+
+Usage (from the repository root):
+    python src/benchmarks/replay.py session.jsonl --output replay.json
+    python src/benchmarks/replay.py projects/ example.cbx --stub-models --baseline replay.json
+"""
+
+import argparse
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import summarize, compare_to_baseline, load_report, write_report
+from utils.memory import peak_rss_bytes
+from benchmarks.generation import CORPUS
+from features.session_recorder import read_session
+from features.stub_models import configure_stub_models
+from utils.config import PRECISIONS, DEFAULT_PRECISION
+from utils.file_utils import load_project_from_file
+from utils.resource_path import get_reference_voices_dir
+
+# Upper character bounds of the length categories (anything longer is narration)
+CATEGORIES = [("ui_line", 80), ("paragraph", 400), ("narration", None)]
+
+COMPARED_METRICS = ["latency_p50", "latency_p95", "rtf_p50"]
+
+
+def _category(characters: int) -> str:
+    for name, limit in CATEGORIES:
+        if limit is None or characters <= limit:
+            return name
+    return CATEGORIES[-1][0]
+
+
+def filler_text(characters: int, language: str) -> str:
+    """Corpus text repeated and cut (at a word boundary) to about the given length"""
+    corpus = CORPUS.get(language, CORPUS["en"])
+    source = max(corpus.values(), key=len)
+    text = source
+    while len(text) < characters:
+        text += " " + source
+    cut = text[:characters]
+    if len(text) > characters and " " in cut:
+        cut = cut.rsplit(" ", 1)[0]
+    return cut.strip() or source
+
+
+def _resolve_voice(voice: dict, language: str) -> tuple:
+    """Voice config for a recorded voice, and whether it fell back to the default voice"""
+    mode = voice.get("mode")
+    if mode == "custom":
+        path = voice.get("custom_path")
+        if path and Path(path).exists():
+            return {"mode": "custom", "custom_path": Path(path)}, False
+        return {"mode": "predefined", "voice": "Default", "voice_file": None}, bool(path)
+    
+    name = voice.get("voice")
+    candidates = [voice.get("voice_file")]
+    if name:
+        folder = get_reference_voices_dir() / language
+        candidates += [folder / f"{name}.wav", folder / f"{name}.flac"]
+    for candidate in candidates:
+        if candidate and Path(candidate).exists():
+            return {"mode": "predefined", "voice": name, "voice_file": Path(candidate)}, False
+    return {"mode": "predefined", "voice": "Default", "voice_file": None}, bool(name)
+
+
+def _requests_from_session(path: Path) -> list:
+    requests = []
+    for index, record in enumerate(read_session(path)):
+        language = record.get("language", "en")
+        text = record.get("text") or filler_text(record.get("characters", 0), language)
+        requests.append({
+            "source": f"{path.name}#{index + 1}",
+            "text": text,
+            "language": language,
+            "quality": record.get("quality", "final"),
+            "seed": record.get("seed"),
+            "voice": record.get("voice", {}),
+            "expression": record.get("expression", {"mode": "text"}),
+            "offset_seconds": record.get("offset_seconds"),
+            "recorded_seconds": record.get("total_seconds") if record.get("status") == "done" else None,
+        })
+    return requests
+
+
+def _request_from_project(path: Path) -> dict:
+    project = load_project_from_file(path)
+    if not project or not project.get("text_input", "").strip():
+        raise ValueError(f"{path} has no text")
+    
+    mode = project.get("expression_mode", "preset")
+    if mode == "text":
+        expression = {"mode": "text", "text": project.get("expression_text") or "default"}
+    else:
+        expression = {
+            "mode": mode,
+            "preset": project.get("selected_preset"),
+            "energy": project.get("energy", 0.70),
+            "speed": project.get("speed", 0.40),
+            "emphasis": project.get("emphasis", 0.90),
+            "pitch": project.get("pitch", 0),
+        }
+    
+    return {
+        "source": path.name,
+        "text": project["text_input"],
+        "language": project.get("language_code", "en"),
+        "quality": "final",
+        "seed": None,
+        "voice": {
+            "mode": project.get("voice_mode", "predefined"),
+            "voice": project.get("selected_voice"),
+            "custom_path": project.get("custom_audio_path"),
+        },
+        "expression": expression,
+        "offset_seconds": None,
+        "recorded_seconds": None,
+    }
+
+
+def load_workload(paths: list) -> list:
+    """
+    Expand session files, .cbx projects and folders of either into requests
+    
+    Args:
+        paths: Files or folders
+    
+    Returns:
+        list: Request dicts in replay order
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files += sorted(path.glob("*.jsonl")) + sorted(path.glob("*.cbx"))
+        else:
+            files.append(path)
+    
+    requests = []
+    for path in files:
+        try:
+            if path.suffix == ".jsonl":
+                requests += _requests_from_session(path)
+            else:
+                requests.append(_request_from_project(path))
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Skipping {path}: {e}")
+    return requests
+
+
+def replay(generator, requests: list, args, output_dir: Path) -> list:
+    """Run every request in order and return one result per request"""
+    from features.metrics import GenerationMetrics
+    
+    results = []
+    started = time.perf_counter()
+    for index, request in enumerate(requests):
+        # Keep the recorded gaps between requests (scaled by --pace)
+        if args.pace and request["offset_seconds"] is not None:
+            delay = request["offset_seconds"] / args.pace - (time.perf_counter() - started)
+            if delay > 0:
+                time.sleep(delay)
+        
+        voice_config, fell_back = _resolve_voice(request["voice"], request["language"])
+        metrics = GenerationMetrics(f"Replay {request['source']}", auto_log=False, kind="replay")
+        start = time.perf_counter()
+        result = generator.generate_audio(
+            request["text"], voice_config, request["expression"], output_dir / f"replay_{index}.wav",
+            request["language"], quality=request["quality"], seed=request["seed"], metrics=metrics
+        )
+        elapsed = time.perf_counter() - start
+        
+        characters = len(request["text"])
+        results.append({
+            "source": request["source"],
+            "category": _category(characters),
+            "characters": characters,
+            "language": request["language"],
+            "ok": result is not None,
+            "voice_fallback": fell_back,
+            "latency": round(elapsed, 3),
+            "audio_seconds": metrics.audio_seconds,
+            "rtf": round(elapsed / metrics.audio_seconds, 4) if metrics.audio_seconds else None,
+            "recorded_seconds": request["recorded_seconds"],
+        })
+        status = "✅" if result is not None else "❌"
+        print(f"   {status} {request['source']} ({results[-1]['category']}, {characters} chars): {elapsed:.2f}s")
+    return results
+
+
+def _summarize_results(results: list) -> dict:
+    ok = [r for r in results if r["ok"]]
+    summary = {
+        "requests": len(results),
+        "errors": len(results) - len(ok),
+        "characters": sum(r["characters"] for r in results),
+        **summarize([r["latency"] for r in ok], "latency"),
+        **summarize([r["rtf"] for r in ok if r["rtf"] is not None], "rtf", digits=4),
+    }
+    
+    # Same requests as recorded - how does this build compare to the session's own timings?
+    paired = [r for r in ok if r["recorded_seconds"]]
+    if paired:
+        summary["vs_recorded"] = round(sum(r["latency"] for r in paired) / sum(r["recorded_seconds"] for r in paired), 3)
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded sessions or .cbx projects as a benchmark workload")
+    parser.add_argument("paths", nargs="+", help="Session .jsonl files, .cbx projects or folders of them")
+    parser.add_argument("--repeat", type=int, default=1, help="Replay the whole workload this many times")
+    parser.add_argument("--limit", type=int, default=None, help="Only replay the first N requests")
+    parser.add_argument("--pace", type=float, default=0.0,
+                        help="Keep the recorded gaps between requests, sped up by this factor (0 = back to back)")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default=None, help="Device (default: auto-detect)")
+    parser.add_argument("--precision", choices=PRECISIONS, default=DEFAULT_PRECISION, help="Token model precision")
+    parser.add_argument("--stub-models", action="store_true", help="Use the stub models (no model weights)")
+    parser.add_argument("--stub-rtf", type=float, default=0.0, help="Simulated stub compute per second of audio")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a report from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed slowdown vs the baseline (0.1 = 10%%)")
+    args = parser.parse_args(argv)
+    
+    requests = load_workload(args.paths)[:args.limit] * args.repeat
+    if not requests:
+        print("❌ Nothing to replay")
+        return 1
+    
+    from features.generate import TTSGenerator
+    
+    generator = TTSGenerator()
+    if args.stub_models:
+        configure_stub_models(rtf=args.stub_rtf)
+    if not generator.initialize(force_device=args.device, precision=args.precision, stub_models=args.stub_models):
+        print("❌ Could not load models")
+        return 1
+    
+    print(f"\n▶️ Replaying {len(requests)} request(s) on {generator.device_name}")
+    started = time.perf_counter()
+    with tempfile.TemporaryDirectory(prefix="chatterbox_replay_") as temp_dir:
+        results = replay(generator, requests, args, Path(temp_dir))
+    wall_seconds = time.perf_counter() - started
+    
+    cases = {"all": _summarize_results(results)}
+    for name, _ in CATEGORIES:
+        members = [r for r in results if r["category"] == name]
+        if members:
+            cases[name] = _summarize_results(members)
+    
+    peak = peak_rss_bytes()
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "paths": args.paths,
+            "repeat": args.repeat,
+            "pace": args.pace,
+            "device": generator.device,
+            "precision": args.precision,
+            "stub_models": args.stub_models,
+        },
+        "wall_seconds": round(wall_seconds, 2),
+        "audio_seconds": round(sum(r["audio_seconds"] or 0 for r in results), 2),
+        "voice_fallbacks": sum(1 for r in results if r["voice_fallback"]),
+        "peak_rss_mb": round(peak / 1024**2, 1) if peak else None,
+        "cases": cases,
+        "requests": results,
+    }
+    
+    regressions = []
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        report["baseline"] = {"path": args.baseline, "tolerance": args.tolerance}
+        report["comparison"], regressions = compare_to_baseline(
+            cases, baseline.get("cases", {}), COMPARED_METRICS, args.tolerance
+        )
+        report["regressions"] = regressions
+    
+    generator.cleanup()
+    write_report(report, args.output)
+    
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
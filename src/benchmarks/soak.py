@@ -0,0 +1,232 @@
+"""
+Memory Soak Test
+Runs thousands of generations the way the app does (scheduler jobs, preview
+takes in a temp folder, progress callbacks) and fails if memory keeps growing
+
+Every --interval generations it records RSS, the number of live Python
+objects and the tracemalloc allocations that grew most since the baseline.
+The baseline is taken after the first interval, once caches and lazy
+imports have settled.
+
+Usage (from the repository root):
+    python src/benchmarks/soak.py --generations 5000 --output soak.json
+    python src/benchmarks/soak.py --real-models --device cpu --generations 200 --interval 20
+"""
+
+import argparse
+import gc
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import write_report
+from benchmarks.generation import CORPUS
+from features.stub_models import configure_stub_models
+from utils.file_utils import prune_preview_files
+from utils.memory import current_rss_bytes, peak_rss_bytes
+
+EXPRESSION = {"mode": "parameters", "energy": 0.7, "speed": 0.4, "emphasis": 0.9, "pitch": 0}
+
+
+def _run_generation(generator, index: int, args, output_dir: Path) -> bool:
+    """One preview-style generation through the scheduler (like the Generate button)"""
+    from features.scheduler import GenerationJob, generation_scheduler
+    from features.metrics import GenerationMetrics
+    from features.metrics_registry import observe_generation
+    
+    texts = list(CORPUS[args.language].values())
+    text = texts[index % len(texts)]
+    expression = dict(EXPRESSION, pitch=args.pitch if index % 2 else 0)
+    output_path = output_dir / f"chatterbox_preview_{index:06d}.wav"
+    
+    # Not appended to the user's metrics log, but the registry still sees it
+    metrics = GenerationMetrics(f"Soak {index}", auto_log=False, kind="soak")
+    progress = []
+    finished = threading.Event()
+    
+    def run():
+        return generator.iter_generate_audio(
+            text, {"mode": "predefined"}, expression, output_path, args.language,
+            lambda percent, status: progress.append(percent), "final", index, metrics
+        )
+    
+    job = generation_scheduler.submit(GenerationJob(metrics.label, run, lambda job: finished.set(), metrics=metrics))
+    finished.wait()
+    
+    metrics.finish()
+    observe_generation(metrics)
+    prune_preview_files(folder=output_dir)
+    return job.status == "done" and job.result is not None
+
+
+def _sample(index: int, started: float, baseline_snapshot, top: int) -> dict:
+    """Memory figures after a full collection"""
+    gc.collect()
+    sample = {
+        "generations": index,
+        "elapsed_seconds": round(time.perf_counter() - started, 1),
+        "rss_mb": round((current_rss_bytes() or 0) / 1024**2, 1),
+        "objects": len(gc.get_objects()),
+    }
+    
+    if tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        sample["traced_mb"] = round(tracemalloc.get_traced_memory()[0] / 1024**2, 2)
+        if baseline_snapshot is not None:
+            sample["top_growth"] = [
+                {"location": str(stat.traceback), "size_diff_kb": round(stat.size_diff / 1024, 1), "count_diff": stat.count_diff}
+                for stat in snapshot.compare_to(baseline_snapshot, "lineno")[:top]
+                if stat.size_diff > 0
+            ]
+        sample["_snapshot"] = snapshot
+    return sample
+
+
+def _slope_per_thousand(samples: list, key: str) -> float:
+    """Least-squares growth of samples[key] per 1000 generations"""
+    if len(samples) < 2:
+        return 0.0
+    xs = [s["generations"] for s in samples]
+    ys = [s[key] for s in samples]
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if not variance:
+        return 0.0
+    return 1000 * sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Soak test: repeated generations with memory growth checks")
+    parser.add_argument("--generations", type=int, default=2000, help="Number of generations to run")
+    parser.add_argument("--interval", type=int, default=100, help="Generations between memory samples")
+    parser.add_argument("--language", default="en", help=f"Corpus language ({', '.join(CORPUS)})")
+    parser.add_argument("--pitch", type=int, default=3, help="Pitch shift used on every other generation")
+    parser.add_argument("--real-models", action="store_true", help="Use the real models instead of the stub models")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default=None, help="Device for --real-models")
+    parser.add_argument("--isolated", action="store_true", help="Run the models in the synthesis worker process")
+    parser.add_argument("--stub-rtf", type=float, default=0.0, help="Simulated stub compute per second of audio")
+    parser.add_argument("--max-rss-growth-mb", type=float, default=64.0, help="Allowed RSS growth after the baseline")
+    parser.add_argument("--max-object-growth", type=int, default=20000, help="Allowed growth in live Python objects")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="Skip allocation tracking (much faster)")
+    parser.add_argument("--top", type=int, default=10, help="Growing allocation sites listed per sample")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args(argv)
+    
+    if args.language not in CORPUS:
+        print(f"❌ No corpus for language '{args.language}' (available: {', '.join(CORPUS)})")
+        return 1
+    if args.generations <= args.interval:
+        print("❌ --generations must be larger than --interval (the first interval is the baseline)")
+        return 1
+    
+    from features.generate import TTSGenerator
+    
+    generator = TTSGenerator()
+    if args.real_models:
+        loaded = generator.initialize(force_device=args.device, isolate=args.isolated)
+    else:
+        configure_stub_models(rtf=args.stub_rtf)
+        loaded = generator.initialize(force_device="cpu", isolate=args.isolated, stub_models=True)
+    if not loaded:
+        print("❌ Could not load models")
+        return 1
+    
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+    
+    samples = []
+    failures = 0
+    baseline_snapshot = None
+    started = time.perf_counter()
+    print(f"\n🔁 {args.generations} generations on {generator.device_name}, sampling every {args.interval}")
+    
+    with tempfile.TemporaryDirectory(prefix="chatterbox_soak_") as temp_dir:
+        output_dir = Path(temp_dir)
+        for index in range(1, args.generations + 1):
+            if not _run_generation(generator, index, args, output_dir):
+                failures += 1
+            if index % args.interval:
+                continue
+            
+            sample = _sample(index, started, baseline_snapshot, args.top)
+            snapshot = sample.pop("_snapshot", None)
+            if baseline_snapshot is None:
+                baseline_snapshot = snapshot
+            samples.append(sample)
+            print(
+                f"   {index}: RSS {sample['rss_mb']:.1f} MB, {sample['objects']} objects"
+                + (f", traced {sample['traced_mb']:.2f} MB" if "traced_mb" in sample else "")
+            )
+        
+        leftover_takes = len(list(output_dir.glob("*.wav")))
+    
+    generator.cleanup()
+    tracemalloc.stop()
+    
+    baseline, last = samples[0], samples[-1]
+    rss_growth = last["rss_mb"] - baseline["rss_mb"]
+    object_growth = last["objects"] - baseline["objects"]
+    
+    problems = []
+    if rss_growth > args.max_rss_growth_mb:
+        problems.append(f"RSS grew {rss_growth:.1f} MB (limit {args.max_rss_growth_mb:.0f} MB)")
+    if object_growth > args.max_object_growth:
+        problems.append(f"live objects grew by {object_growth} (limit {args.max_object_growth})")
+    if failures:
+        problems.append(f"{failures} generation(s) failed")
+    
+    peak = peak_rss_bytes()
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "generations": args.generations,
+            "interval": args.interval,
+            "language": args.language,
+            "real_models": args.real_models,
+            "device": generator.device,
+            "isolated": args.isolated,
+            "tracemalloc": not args.no_tracemalloc,
+        },
+        "rss_growth_mb": round(rss_growth, 1),
+        "rss_mb_per_1000": round(_slope_per_thousand(samples[1:], "rss_mb"), 2),
+        "object_growth": object_growth,
+        "objects_per_1000": round(_slope_per_thousand(samples[1:], "objects"), 1),
+        "peak_rss_mb": round(peak / 1024**2, 1) if peak else None,
+        "leftover_preview_takes": leftover_takes,
+        "failures": failures,
+        "problems": problems,
+        "samples": samples,
+    }
+    write_report(report, args.output)
+    
+    if problems:
+        print("\n⚠️ Soak test failed:")
+        for line in problems:
+            print(f"   {line}")
+        if last.get("top_growth"):
+            print("   Largest growing allocation sites:")
+            for stat in last["top_growth"][:5]:
+                print(f"      +{stat['size_diff_kb']:.1f} KB  {stat['location']}")
+        return 2
+    print(f"\n✅ No memory growth beyond the limits ({rss_growth:+.1f} MB RSS, {object_growth:+d} objects)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
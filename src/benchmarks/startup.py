@@ -0,0 +1,291 @@
+"""
+Startup Latency Benchmark
+Measures a cold launch end to end in a fresh subprocess: interpreter start,
+imports per top-level package, Tk window creation, model loading per model,
+warm-up and the first generation - with a cold and a warm OS page cache
+
+The cold runs evict the model files, the app and its big dependencies
+(torch, transformers, ...) from the page cache with posix_fadvise, which
+needs no root but is only available on Linux and other POSIX systems with
+that call; elsewhere only warm runs are measured.
+
+Usage (from the repository root):
+    python src/benchmarks/startup.py --runs 3 --output startup.json
+    python src/benchmarks/startup.py --stub-models --cache warm --baseline startup.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Add parent directory to path for imports
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Everything else is imported lazily, so the child's import timings only cover the app
+from utils.startup_profiler import startup_profiler
+
+REPORT_MARKER = "STARTUP_REPORT "
+
+# Packages whose files are evicted for the cold-cache runs (besides the app and model cache)
+COLD_PACKAGES = ["torch", "torchaudio", "transformers", "chatterbox", "librosa", "numpy", "safetensors", "pygame"]
+
+COMPARED_METRICS = ["seconds_p50"]
+
+FIRST_TEXT = "Hello there, welcome back."
+
+
+# ============================================
+# CHILD PROCESS (one launch)
+# ============================================
+
+def _run_child(args) -> int:
+    """Launch the app the way main() does, timing each step, and print the report"""
+    started = time.perf_counter()
+    startup_profiler.start()
+    stages = {}
+    
+    def timed(name, action):
+        start = time.perf_counter()
+        result = action()
+        stages[name] = round(time.perf_counter() - start, 4)
+        return result
+    
+    # Everything main.py imports (components, features, sv_ttk, ...)
+    app_module = timed("imports", lambda: __import__("main"))
+    startup_profiler.stop()
+    
+    if not args.no_gui:
+        import tkinter as tk
+        
+        def build_window():
+            app = app_module.ChatterboxApp(app_module.parse_args(["--no-daemon"]))
+            app.root.update()
+            return app
+        
+        try:
+            app = timed("tk_window", build_window)
+            app.root.destroy()
+        except tk.TclError as e:
+            print(f"⚠️ No display - skipping tk_window ({e})")
+    
+    from features.generate import tts_generator
+    
+    # Time each model's loader (initialize loads them one after another)
+    model_seconds = {}
+    for name, loader in list(tts_generator.residency._loaders.items()):
+        def timed_loader(name=name, loader=loader):
+            start = time.perf_counter()
+            try:
+                return loader()
+            finally:
+                model_seconds[name] = round(time.perf_counter() - start, 4)
+        tts_generator.residency.register(name, timed_loader)
+    
+    loaded = timed("initialize", lambda: tts_generator.initialize(
+        force_device=args.device or "cpu", stub_models=args.stub_models
+    ))
+    if not loaded:
+        print("❌ Could not load models")
+        return 1
+    
+    if not args.no_warmup:
+        timed("warmup", lambda: list(tts_generator._iter_warmup()))
+    
+    import tempfile
+    with tempfile.TemporaryDirectory(prefix="chatterbox_startup_") as temp_dir:
+        result = timed("first_generation", lambda: tts_generator.generate_audio(
+            FIRST_TEXT, {"mode": "predefined"}, {"mode": "text"}, Path(temp_dir) / "first.wav", "en", seed=0
+        ))
+    if result is None:
+        print("❌ First generation failed")
+        return 1
+    
+    # Self time per top-level package (a package's own imports are attributed to it)
+    packages = {}
+    for module_name, self_seconds, _ in startup_profiler.imports:
+        package = module_name.split(".")[0]
+        packages[package] = packages.get(package, 0.0) + self_seconds
+    
+    tts_generator.cleanup()
+    print(REPORT_MARKER + json.dumps({
+        "child_started": started,
+        "stages": stages,
+        "models": model_seconds,
+        "import_modules": len(startup_profiler.imports),
+        "imports_by_package": {name: round(seconds, 4) for name, seconds in packages.items()},
+    }))
+    return 0
+
+
+# ============================================
+# PARENT PROCESS (launches and aggregates)
+# ============================================
+
+def _cold_cache_paths() -> list:
+    """Folders whose files a real cold start reads from disk"""
+    from utils.config import CACHE_DIR
+    
+    folders = [Path(__file__).resolve().parent.parent, CACHE_DIR]
+    for package in COLD_PACKAGES:
+        spec = importlib.util.find_spec(package)
+        if spec and spec.submodule_search_locations:
+            folders.extend(Path(location) for location in spec.submodule_search_locations)
+    return [folder for folder in folders if folder.exists()]
+
+
+def evict_page_cache(folders: list) -> int:
+    """
+    Drop the cached pages of every file under folders (POSIX only)
+    
+    Args:
+        folders: Folders to walk
+    
+    Returns:
+        int: Number of files evicted
+    """
+    evicted = 0
+    for folder in folders:
+        for root, _, files in os.walk(folder):
+            for file_name in files:
+                try:
+                    fd = os.open(os.path.join(root, file_name), os.O_RDONLY)
+                except OSError:
+                    continue
+                try:
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+                    evicted += 1
+                except OSError:
+                    pass
+                finally:
+                    os.close(fd)
+    return evicted
+
+
+def _launch(args) -> dict:
+    """Run one child launch and return its report (plus interpreter and total time)"""
+    command = [sys.executable, os.path.abspath(__file__), "--child"]
+    if args.device:
+        command += ["--device", args.device]
+    for flag in ("stub_models", "no_gui", "no_warmup"):
+        if getattr(args, flag):
+            command.append("--" + flag.replace("_", "-"))
+    
+    spawned = time.perf_counter()
+    process = subprocess.run(command, capture_output=True, text=True, encoding="utf-8", errors="replace", timeout=args.timeout)
+    total = time.perf_counter() - spawned
+    
+    reports = [line[len(REPORT_MARKER):] for line in process.stdout.splitlines() if line.startswith(REPORT_MARKER)]
+    if process.returncode != 0 or not reports:
+        raise RuntimeError(f"launch failed (exit {process.returncode}):\n{process.stdout[-2000:]}\n{process.stderr[-2000:]}")
+    
+    report = json.loads(reports[-1])
+    # perf_counter is system-wide, so the child's start lines up with the spawn time
+    report["stages"] = {"interpreter": round(report.pop("child_started") - spawned, 4), **report["stages"], "process_total": round(total, 4)}
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark cold launch to first generation in fresh processes")
+    parser.add_argument("--runs", type=int, default=3, help="Launches per cache mode")
+    parser.add_argument("--cache", choices=["both", "cold", "warm"], default="both", help="Page cache state(s) to measure")
+    parser.add_argument("--device", choices=["cpu", "cuda"], default=None, help="Device (default: cpu)")
+    parser.add_argument("--stub-models", action="store_true", help="Use the stub models (no model weights)")
+    parser.add_argument("--no-gui", action="store_true", help="Skip the Tk window step (e.g. no display)")
+    parser.add_argument("--no-warmup", action="store_true", help="Skip warm-up, so the first generation runs cold")
+    parser.add_argument("--top-imports", type=int, default=15, help="Slowest top-level packages reported per cache mode")
+    parser.add_argument("--timeout", type=float, default=1800, help="Seconds before a launch counts as hung")
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    parser.add_argument("--baseline", default=None, help="Compare against a report from an earlier run")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown vs the baseline (0.15 = 15%%)")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    
+    if args.child:
+        return _run_child(args)
+    
+    import platform
+    from benchmarks.stats import percentile, summarize, compare_to_baseline, load_report, write_report
+    
+    modes = ["cold", "warm"] if args.cache == "both" else [args.cache]
+    if "cold" in modes and not hasattr(os, "posix_fadvise"):
+        print("⚠️ posix_fadvise is not available here - measuring warm launches only")
+        modes = ["warm"]
+    
+    cases = {}
+    launches = {}
+    for mode in modes:
+        print(f"\n🚀 {args.runs} {mode}-cache launch(es)")
+        if mode == "warm":
+            # One untimed launch fills the page cache
+            _launch(args)
+        
+        runs = []
+        for run in range(args.runs):
+            if mode == "cold":
+                evicted = evict_page_cache(_cold_cache_paths())
+                print(f"   Evicted {evicted} files from the page cache")
+            report = _launch(args)
+            runs.append(report)
+            stages = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in report["stages"].items())
+            print(f"   run {run + 1}: {stages}")
+        launches[mode] = runs
+        
+        stage_names = list(runs[0]["stages"])
+        for name in stage_names:
+            cases[f"{mode}/{name}"] = summarize([r["stages"][name] for r in runs if name in r["stages"]], "seconds")
+        for name in runs[0]["models"]:
+            cases[f"{mode}/load_{name}"] = summarize([r["models"][name] for r in runs if name in r["models"]], "seconds")
+        
+        packages = {}
+        for r in runs:
+            for package, seconds in r["imports_by_package"].items():
+                packages.setdefault(package, []).append(seconds)
+        slowest = sorted(packages.items(), key=lambda item: -percentile(item[1], 50))[:args.top_imports]
+        for package, values in slowest:
+            cases[f"{mode}/import_{package}"] = summarize(values, "seconds", digits=4)
+    
+    report = {
+        "host": {
+            "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine(),
+            "cpu_count": os.cpu_count(),
+            "python": platform.python_version(),
+        },
+        "settings": {
+            "runs": args.runs,
+            "cache_modes": modes,
+            "device": args.device or "cpu",
+            "stub_models": args.stub_models,
+            "gui": not args.no_gui,
+            "warmup": not args.no_warmup,
+        },
+        "cases": cases,
+        "launches": launches,
+    }
+    
+    regressions = []
+    if args.baseline:
+        baseline = load_report(args.baseline)
+        report["baseline"] = {"path": args.baseline, "tolerance": args.tolerance}
+        report["comparison"], regressions = compare_to_baseline(
+            cases, baseline.get("cases", {}), COMPARED_METRICS, args.tolerance
+        )
+        report["regressions"] = regressions
+    
+    write_report(report, args.output)
+    
+    if regressions:
+        print(f"\n⚠️ {len(regressions)} regression(s) against the baseline:")
+        for line in regressions:
+            print(f"   {line}")
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
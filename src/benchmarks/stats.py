@@ -0,0 +1,115 @@
+"""
+Benchmark Statistics
+Shared helpers for benchmark reports: percentiles and comparison
+against a saved baseline
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+
+def percentile(values: Sequence[float], pct: float) -> Optional[float]:
+    """
+    Percentile with linear interpolation between the closest ranks
+    
+    Args:
+        values: Samples
+        pct: Percentile between 0 and 100
+    
+    Returns:
+        Optional[float]: The percentile, or None for an empty sample
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    position = (len(ordered) - 1) * pct / 100
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def summarize(values: Sequence[float], prefix: str, digits: int = 3) -> Dict[str, Optional[float]]:
+    """
+    p50/p90/p95/max of a sample as report fields
+    
+    Args:
+        values: Samples
+        prefix: Field name prefix (e.g. "latency" -> "latency_p50", ...)
+        digits: Rounding
+    
+    Returns:
+        dict: {prefix_p50, prefix_p90, prefix_p95, prefix_max}
+    """
+    def rounded(value):
+        return None if value is None else round(value, digits)
+    
+    return {
+        f"{prefix}_p50": rounded(percentile(values, 50)),
+        f"{prefix}_p90": rounded(percentile(values, 90)),
+        f"{prefix}_p95": rounded(percentile(values, 95)),
+        f"{prefix}_max": rounded(max(values) if values else None),
+    }
+
+
+def compare_to_baseline(
+    current: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    metrics: List[str],
+    tolerance: float
+) -> Tuple[Dict[str, Dict[str, Any]], List[str]]:
+    """
+    Compare per-case metrics against a baseline report (lower is better)
+    
+    Args:
+        current: Case id -> metrics of this run
+        baseline: Case id -> metrics of the baseline run
+        metrics: Metric names to compare
+        tolerance: Allowed relative slowdown (0.1 = 10%) before a change
+            counts as a regression
+    
+    Returns:
+        tuple: (case id -> metric -> {baseline, current, change_pct},
+            list of "case: metric +x%" regression descriptions)
+    """
+    comparison = {}
+    regressions = []
+    
+    for case_id, values in current.items():
+        reference = baseline.get(case_id)
+        if not reference:
+            continue
+        
+        case_comparison = {}
+        for metric in metrics:
+            before, after = reference.get(metric), values.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            case_comparison[metric] = {
+                "baseline": before,
+                "current": after,
+                "change_pct": round(change * 100, 1),
+            }
+            if change > tolerance:
+                regressions.append(f"{case_id}: {metric} {change * 100:+.1f}%")
+        
+        if case_comparison:
+            comparison[case_id] = case_comparison
+    
+    return comparison, regressions
+
+
+def load_report(path: str) -> Dict[str, Any]:
+    """Read a JSON report written by write_report"""
+    return json.loads(Path(path).read_text(encoding="utf-8"))
+
+
+def write_report(report: Dict[str, Any], path: Optional[str] = None):
+    """Print a JSON report and optionally write it to a file"""
+    text = json.dumps(report, indent=2)
+    print("\n" + text)
+    if path:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        Path(path).write_text(text, encoding="utf-8")
+        print(f"📄 Report written to {path}")
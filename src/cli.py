@@ -0,0 +1,366 @@
+"""
+Command Line Options
+Startup flags for the desktop app and headless (no window) rendering
+
+Usage:
+    python src/main.py --device cpu --precision bf16
+    python src/main.py --device cpu --precision bf16 --text "Hello there" --output hello.wav
+    python src/main.py --calibrate-threads
+    python src/main.py --daemon --device cpu
+    python src/main.py --daemon --metrics-port 9464
+    python src/main.py --check-updates
+    python src/main.py --profile-startup
+    python src/main.py --stub-models --no-daemon
+    python src/main.py --trace trace.json
+    python src/main.py --record-session session.jsonl
+    python src/main.py --profile --text "Hello there" --output hello.wav
+"""
+
+import argparse
+import atexit
+from contextlib import nullcontext
+from pathlib import Path
+
+from utils.config import (
+    PRECISIONS, DEFAULT_PRECISION, DEFAULT_LANGUAGE, DAEMON_METRICS_PORT, DAEMON_BATCH_WINDOW_MS
+)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser for main.py"""
+    parser = argparse.ArgumentParser(description="Chatterbox TTS desktop app")
+    parser.add_argument(
+        "--device", choices=["cpu", "cuda"], default=None,
+        help="Processing device (skips the device selection dialog)"
+    )
+    parser.add_argument(
+        "--precision", choices=PRECISIONS, default=None,
+        help=f"Token model precision (default: {DEFAULT_PRECISION})"
+    )
+    parser.add_argument(
+        "--quantize", action="store_true",
+        help="Dynamic int8 quantized token models (CPU only)"
+    )
+    parser.add_argument(
+        "--ram-budget-gb", type=float, default=None,
+        help="RAM budget for loaded models, least recently used models are unloaded (0 = unlimited)"
+    )
+    parser.add_argument(
+        "--idle-unload-minutes", type=float, default=None,
+        help="Unload models after this many idle minutes (0 = never)"
+    )
+    parser.add_argument(
+        "--online", action="store_true",
+        help="Resolve models on the hub this launch, even if they are recorded in the manifest"
+    )
+    parser.add_argument(
+        "--check-updates", action="store_true",
+        help="Check the hub for newer model revisions and exit"
+    )
+    parser.add_argument(
+        "--isolated-synthesis", action="store_true",
+        help="Run the models in a child process so the window stays responsive during renders"
+    )
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="Run as a resident background daemon that keeps the models loaded"
+    )
+    parser.add_argument(
+        "--metrics-port", type=int, default=DAEMON_METRICS_PORT,
+        help=f"Port of the daemon's OpenMetrics endpoint at /metrics (default: {DAEMON_METRICS_PORT}, 0 = off)"
+    )
+    parser.add_argument(
+        "--batch-window-ms", type=int, default=DAEMON_BATCH_WINDOW_MS,
+        help="Hold daemon requests this long and queue them grouped by language and voice (default: off)"
+    )
+    parser.add_argument(
+        "--daemon-info", metavar="FILE", default=None,
+        help="Daemon info file to write (--daemon) or connect through (default: in the cache folder) - "
+             "separate files let several daemons run side by side"
+    )
+    parser.add_argument(
+        "--stop-daemon", action="store_true",
+        help="Stop the running daemon and exit"
+    )
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Always load the models in-process, even if a daemon is running"
+    )
+    parser.add_argument(
+        "--no-warmup", action="store_true",
+        help="Skip the background warm-up synthesis after the models load"
+    )
+    parser.add_argument(
+        "--profile-startup", action="store_true",
+        help="Print import timings and startup milestones (like python -X importtime)"
+    )
+    parser.add_argument(
+        "--calibrate-threads", action="store_true",
+        help="Benchmark CPU thread counts, save the best profile for this host and exit"
+    )
+    parser.add_argument(
+        "--stub-models", action="store_true",
+        help="Use stub models that return synthetic audio (no model weights, for testing and benchmarks)"
+    )
+    parser.add_argument(
+        "--profile", action="store_true",
+        help="Profile the first generation (cProfile .pstats + collapsed stacks for flame graphs, saved next to the output)"
+    )
+    parser.add_argument(
+        "--record-session", metavar="FILE", default=None,
+        help="Append every generation request (settings and timings) to this JSONL file for benchmarks/replay.py "
+             "(record in the process running the models - with a daemon, pass it to --daemon)"
+    )
+    parser.add_argument(
+        "--record-text", action="store_true",
+        help="Also store the generated text in the session recording (default: only its length)"
+    )
+    parser.add_argument(
+        "--trace", metavar="FILE", default=None,
+        help="Record a timeline of models, jobs, stages and UI callbacks and write it as Chrome trace JSON on exit"
+    )
+    
+    headless = parser.add_argument_group("headless rendering")
+    headless.add_argument("--text", default=None, help="Render this text without opening the window")
+    headless.add_argument("--output", default="output.wav", help="Output .wav file for --text")
+    headless.add_argument("--language", default=DEFAULT_LANGUAGE, help="Language code for --text")
+    headless.add_argument("--voice", default=None, help="Reference voice file for --text")
+    headless.add_argument("--seed", type=int, default=None, help="Random seed for --text")
+    return parser
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parse command line options
+    
+    Args:
+        argv: Argument list (defaults to sys.argv[1:])
+    
+    Returns:
+        argparse.Namespace: Parsed options
+    """
+    return build_parser().parse_args(argv)
+
+
+def configure_residency(args: argparse.Namespace):
+    """
+    Apply the model residency options to the global generator
+    
+    Args:
+        args: Options from parse_args
+    """
+    from features.generate import tts_generator
+    
+    tts_generator.residency.configure(
+        budget_bytes=None if args.ram_budget_gb is None else int(args.ram_budget_gb * 1024**3),
+        idle_unload_seconds=None if args.idle_unload_minutes is None else args.idle_unload_minutes * 60
+    )
+
+
+def configure_tracing(args: argparse.Namespace):
+    """
+    Start the timeline tracer if --trace was given (written on exit)
+    
+    Args:
+        args: Options from parse_args
+    """
+    if not args.trace:
+        return
+    
+    from features.tracing import tracer
+    
+    tracer.start()
+    atexit.register(tracer.export, args.trace)
+    print(f"🧵 Tracing enabled - timeline will be written to {args.trace}")
+
+
+def configure_session_recording(args: argparse.Namespace):
+    """
+    Start the session recorder if --record-session was given
+    
+    Args:
+        args: Options from parse_args
+    """
+    if not args.record_session:
+        return
+    
+    from features.session_recorder import session_recorder
+    
+    session_recorder.start(Path(args.record_session), include_text=args.record_text)
+    print(f"📼 Recording generation requests to {args.record_session}" + (" (with text)" if args.record_text else ""))
+
+
+def run_headless(args: argparse.Namespace) -> int:
+    """
+    Render args.text to args.output without the GUI
+    
+    Args:
+        args: Options from parse_args
+    
+    Returns:
+        int: Process exit code
+    """
+    from features.generate import tts_generator
+    from features.daemon import DaemonClient
+    from features.metrics import GenerationMetrics
+    from features.profiling import GenerationProfiler
+    
+    # A daemon serves real models - stub and profiled runs always stay in-process
+    generator = None if args.no_daemon or args.stub_models or args.profile else DaemonClient.connect(args.daemon_info)
+    if generator:
+        print(f"🛰️ Using daemon ({generator.device_name})")
+    elif tts_generator.initialize(
+        force_device=args.device or "cpu",
+        quantize=args.quantize,
+        precision=args.precision or DEFAULT_PRECISION,
+        online=args.online,
+        stub_models=args.stub_models
+    ):
+        generator = tts_generator
+    else:
+        print("❌ Could not load models")
+        return 1
+    
+    voice_config = {"mode": "custom", "custom_path": args.voice} if args.voice else {"mode": "default"}
+    expression_config = {"mode": "parameters", "energy": 0.70, "speed": 0.40, "emphasis": 0.90, "pitch": 0}
+    
+    output_path = Path(args.output)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    metrics = GenerationMetrics("Generate")
+    profiler = None
+    if args.profile:
+        profiler = metrics.profiler = GenerationProfiler()
+        profiler.start()
+    
+    with profiler.thread_scope() if profiler else nullcontext():
+        result = generator.generate_audio(
+            args.text,
+            voice_config,
+            expression_config,
+            output_path,
+            language_code=args.language,
+            seed=args.seed,
+            metrics=metrics
+        )
+    
+    if profiler:
+        profiler.stop()
+        pstats_path, collapsed_path = profiler.save(output_path.with_suffix(""))
+        print(f"🔬 Profile saved ({profiler.summary()}): {pstats_path}, {collapsed_path}")
+    
+    if result is None:
+        print("❌ Generation failed")
+        return 1
+    print(f"✅ Saved: {result}")
+    return 0
+
+
+def run_calibration(args: argparse.Namespace) -> int:
+    """
+    Calibrate CPU thread counts without the GUI
+    
+    Args:
+        args: Options from parse_args
+    
+    Returns:
+        int: Process exit code
+    """
+    from features.generate import tts_generator
+    from features.thread_tuner import calibrate_threads
+    
+    if not tts_generator.initialize(
+        force_device=args.device or "cpu",
+        quantize=args.quantize,
+        precision=args.precision or DEFAULT_PRECISION,
+        online=args.online,
+        stub_models=args.stub_models
+    ):
+        print("❌ Could not load models")
+        return 1
+    
+    profile = calibrate_threads(tts_generator)
+    print(f"✅ Using {profile['intra_op_threads']} threads on this machine from now on")
+    return 0
+
+
+def run_update_check(args: argparse.Namespace) -> int:
+    """
+    Report newer model revisions on the hub
+    
+    Args:
+        args: Options from parse_args
+    
+    Returns:
+        int: 0 if up to date, 2 if updates are available, 1 on error
+    """
+    from features.model_manifest import check_for_model_updates
+    
+    try:
+        results = check_for_model_updates()
+    except Exception as e:
+        print(f"❌ Update check failed: {e}")
+        return 1
+    
+    if not results:
+        print("ℹ️ No models recorded yet - start the app once to record them")
+        return 0
+    
+    for name, info in results.items():
+        if info["update_available"]:
+            print(f"⬆️ {name}: {info['local_revision'][:8]} → {info['remote_revision'][:8]} (start with --online to update)")
+        else:
+            print(f"✅ {name}: up to date ({info['local_revision'][:8]})")
+    return 2 if any(info["update_available"] for info in results.values()) else 0
+
+
+def run_daemon_process(args: argparse.Namespace) -> int:
+    """
+    Load the models and serve requests as a resident daemon
+    
+    Args:
+        args: Options from parse_args
+    
+    Returns:
+        int: Process exit code
+    """
+    from features.generate import tts_generator
+    from features.daemon import DaemonClient, run_daemon
+    
+    if DaemonClient.connect(args.daemon_info):
+        print("⚠️ A daemon is already running")
+        return 1
+    
+    # All daemon generation goes through the scheduler, so warm-up is safe here
+    if not tts_generator.initialize(
+        force_device=args.device,
+        quantize=args.quantize,
+        precision=args.precision or DEFAULT_PRECISION,
+        online=args.online,
+        warmup=not args.no_warmup,
+        stub_models=args.stub_models
+    ):
+        print("❌ Could not load models")
+        return 1
+    return run_daemon(tts_generator, args.metrics_port, args.daemon_info, args.batch_window_ms)
+
+
+def run_stop_daemon(args: argparse.Namespace) -> int:
+    """
+    Stop the running daemon
+    
+    Args:
+        args: Options from parse_args
+    
+    Returns:
+        int: Process exit code
+    """
+    from features.daemon import DaemonClient
+    
+    client = DaemonClient.connect(args.daemon_info)
+    if client is None:
+        print("ℹ️ No daemon is running")
+        return 1
+    client.shutdown()
+    print("✅ Daemon stopped")
+    return 0
@@ -6,6 +6,7 @@ Built-in audio player with playback controls
 import tkinter as tk
 from tkinter import ttk
 from pathlib import Path
+import importlib.util
 import threading
 import time
 
@@ -26,15 +27,9 @@ class AudioPlayerComponent:
         self.current_position = 0  # in seconds
         self.is_dragging_scrubber = False
         
-        # Try to import pygame for audio playback
-        try:
-            import pygame
-            pygame.mixer.init()
-            self.pygame = pygame
-            self.audio_available = True
-        except ImportError:
-            self.pygame = None
-            self.audio_available = False
+        # pygame is imported on first playback (keeps it off the startup path)
+        self.pygame = None
+        self.audio_available = importlib.util.find_spec("pygame") is not None
         
         self._setup_ui()
     
@@ -114,6 +109,24 @@ class AudioPlayerComponent:
         if not self.audio_available:
             self.status_var.set("⚠️ pygame not installed - audio preview unavailable")
     
+    def _ensure_mixer(self) -> bool:
+        """Import pygame and start the mixer on first use"""
+        if self.pygame is not None:
+            return True
+        if not self.audio_available:
+            return False
+        
+        try:
+            import pygame
+            pygame.mixer.init()
+            self.pygame = pygame
+            return True
+        except Exception as e:
+            print(f"⚠️ Could not start audio playback: {e}")
+            self.audio_available = False
+            self.status_var.set("⚠️ pygame not available - audio preview unavailable")
+            return False
+    
     def load_audio(self, audio_path: Path):
         """
         Load an audio file for playback
@@ -121,7 +134,7 @@ class AudioPlayerComponent:
         Args:
             audio_path: Path to the audio file
         """
-        if not self.audio_available:
+        if not self._ensure_mixer():
             return
         
         try:
@@ -203,7 +216,7 @@ class AudioPlayerComponent:
     
     def _on_scrubber_release(self, event):
         """Handle scrubber release - seek to position"""
-        if not self.audio_available or not self.audio_path:
+        if self.pygame is None or not self.audio_path:
             return
         
         self.is_dragging_scrubber = False
@@ -258,7 +271,7 @@ class AudioPlayerComponent:
     
     def _play_audio(self):
         """Play or resume audio"""
-        if not self.audio_available or not self.audio_path:
+        if self.pygame is None or not self.audio_path:
             return
         
         try:
@@ -290,7 +303,7 @@ class AudioPlayerComponent:
     
     def _pause_audio(self):
         """Pause audio playback"""
-        if not self.audio_available:
+        if self.pygame is None:
             return
         
         try:
@@ -306,7 +319,7 @@ class AudioPlayerComponent:
     
     def _stop_audio(self):
         """Stop audio playback"""
-        if not self.audio_available:
+        if self.pygame is None:
             return
         
         try:
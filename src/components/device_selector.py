@@ -1,12 +1,18 @@
 import tkinter as tk
 from tkinter import ttk
-import torch
+import threading
 from utils.resource_path import get_resource_path
+from utils.config import PRECISIONS, DEFAULT_PRECISION
+from features.precision import device_supports_bf16
+from features.thread_tuner import load_thread_profile
 
 class DeviceSelector:
     def __init__(self, parent):
         self.parent = parent
         self.selected_device = None
+        self.quantize = False  # Int8 quantized CPU mode
+        self.precision = DEFAULT_PRECISION  # "fp32" or "bf16"
+        self.calibrate_threads = False  # Run the CPU thread calibration after loading
         self.dialog = None
         
     def show(self):
@@ -60,10 +66,6 @@ class DeviceSelector:
         )
         desc_label.pack(pady=(0, 20))
         
-        # Check GPU availability
-        gpu_available = torch.cuda.is_available()
-        gpu_name = torch.cuda.get_device_name(0) if gpu_available else "No GPU detected"
-        
         # CPU Option (First choice - Recommended)
         cpu_frame = tk.LabelFrame(
             main_frame, 
@@ -86,6 +88,49 @@ class DeviceSelector:
         )
         cpu_info.pack(anchor=tk.W, pady=(0, 10))
         
+        # Optional int8 quantized mode (CPU only)
+        self.quantize_var = tk.BooleanVar(value=False)
+        quantize_check = tk.Checkbutton(
+            cpu_frame,
+            text="⚡ Int8 quantized mode (faster, less memory)",
+            variable=self.quantize_var,
+            font=("Segoe UI", 9),
+            bg=dark_bg,
+            fg=dark_fg,
+            selectcolor=dark_bg,
+            activebackground=dark_bg,
+            activeforeground=dark_fg
+        )
+        quantize_check.pack(anchor=tk.W)
+        
+        # CPU thread calibration (profile is stored per host and applied on every launch)
+        thread_profile = load_thread_profile()
+        self.calibrate_var = tk.BooleanVar(value=False)
+        calibrate_check = tk.Checkbutton(
+            cpu_frame,
+            text="🧵 Calibrate CPU threads after loading (about a minute)",
+            variable=self.calibrate_var,
+            font=("Segoe UI", 9),
+            bg=dark_bg,
+            fg=dark_fg,
+            selectcolor=dark_bg,
+            activebackground=dark_bg,
+            activeforeground=dark_fg
+        )
+        calibrate_check.pack(anchor=tk.W)
+        
+        profile_label = tk.Label(
+            cpu_frame,
+            text=(
+                f"Current profile: {thread_profile['intra_op_threads']} threads (RTF {thread_profile['rtf']:.2f})"
+                if thread_profile else "Not calibrated on this machine (PyTorch defaults)"
+            ),
+            font=("Segoe UI", 8),
+            fg="#858585",
+            bg=dark_bg
+        )
+        profile_label.pack(anchor=tk.W, pady=(0, 10))
+        
         cpu_button = tk.Button(
             cpu_frame,
             text="Use CPU",
@@ -113,42 +158,82 @@ class DeviceSelector:
         )
         gpu_frame.pack(fill=tk.X, pady=(0, 10))
         
-        gpu_info = tk.Label(
+        # GPU details are filled in by _detect_hardware (importing torch takes seconds)
+        self.gpu_info = tk.Label(
             gpu_frame,
-            text=f"🚀 {gpu_name}\n{'✓ Fast generation (2-10 seconds)' if gpu_available else '✗ Not available on this system'}",
+            text="🔍 Detecting GPU...\n",
             font=("Segoe UI", 9),
-            fg="#4ec9b0" if gpu_available else "#858585",
+            fg="#858585",
             bg=dark_bg,
             justify=tk.LEFT
         )
-        gpu_info.pack(anchor=tk.W, pady=(0, 10))
+        self.gpu_info.pack(anchor=tk.W, pady=(0, 10))
         
-        gpu_button = tk.Button(
+        self.gpu_button = tk.Button(
             gpu_frame,
-            text="Use GPU" if gpu_available else "GPU Not Available",
+            text="Detecting...",
             command=lambda: self._select_device("cuda"),
-            state=tk.NORMAL if gpu_available else tk.DISABLED,
+            state=tk.DISABLED,
             width=20,
-            bg="#0e639c" if gpu_available else "#3c3c3c",
-            fg="white" if gpu_available else "#858585",
+            bg="#3c3c3c",
+            fg="#858585",
             font=("Segoe UI", 10),
             relief=tk.FLAT,
-            cursor="hand2" if gpu_available else "arrow",
-            activebackground="#1177bb" if gpu_available else "#3c3c3c",
-            activeforeground="white" if gpu_available else "#858585"
+            cursor="arrow",
+            activebackground="#3c3c3c",
+            activeforeground="#858585"
         )
-        gpu_button.pack()
+        self.gpu_button.pack()
         
-        # Auto-select GPU if available (for convenience)
-        if gpu_available:
-            note_label = tk.Label(
-                main_frame,
-                text="💡 Tip: CPU is more stable, but GPU is faster if you need quick results",
-                font=("Segoe UI", 8),
-                fg="#858585",
-                bg=dark_bg
-            )
-            note_label.pack(pady=(10, 0))
+        # Precision (applies to either device)
+        precision_frame = tk.LabelFrame(
+            main_frame,
+            text="Precision",
+            bg=dark_bg,
+            fg=dark_fg,
+            font=("Segoe UI", 10, "bold"),
+            padx=15,
+            pady=10
+        )
+        precision_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        self.precision_var = tk.StringVar(value=DEFAULT_PRECISION)
+        precision_labels = {
+            "fp32": "FP32 (default, highest fidelity)",
+            "bf16": "BF16 (faster on CPUs with AVX-512 BF16/AMX and recent GPUs)",
+        }
+        for precision in PRECISIONS:
+            tk.Radiobutton(
+                precision_frame,
+                text=precision_labels.get(precision, precision),
+                variable=self.precision_var,
+                value=precision,
+                font=("Segoe UI", 9),
+                bg=dark_bg,
+                fg=dark_fg,
+                selectcolor=dark_bg,
+                activebackground=dark_bg,
+                activeforeground=dark_fg
+            ).pack(anchor=tk.W)
+        
+        self.bf16_label = tk.Label(
+            precision_frame,
+            text="🔍 Checking bf16 support...",
+            font=("Segoe UI", 8),
+            fg="#858585",
+            bg=dark_bg
+        )
+        self.bf16_label.pack(anchor=tk.W, pady=(5, 0))
+        
+        # Tip (shown once a GPU is detected)
+        self.note_label = tk.Label(
+            main_frame,
+            text="",
+            font=("Segoe UI", 8),
+            fg="#858585",
+            bg=dark_bg
+        )
+        self.note_label.pack(pady=(10, 0))
         
         # Update window to calculate required size
         self.dialog.update_idletasks()
@@ -162,14 +247,62 @@ class DeviceSelector:
         y = (self.dialog.winfo_screenheight() // 2) - (required_height // 2)
         self.dialog.geometry(f"{required_width}x{required_height}+{x}+{y}")
         
+        # Probe the hardware without blocking the dialog
+        threading.Thread(target=self._detect_hardware, daemon=True).start()
+        
         # Wait for the dialog to close
         self.parent.wait_window(self.dialog)
         
         return self.selected_device
     
+    def _detect_hardware(self):
+        """Import torch and check the GPU/bf16 support (background thread)"""
+        try:
+            import torch
+            gpu_available = torch.cuda.is_available()
+            gpu_name = torch.cuda.get_device_name(0) if gpu_available else "No GPU detected"
+        except Exception as e:
+            print(f"⚠️ Could not check GPU availability: {e}")
+            gpu_available, gpu_name = False, "No GPU detected"
+        bf16_native = device_supports_bf16("cpu")
+        
+        try:
+            self.dialog.after(0, lambda: self._on_hardware_detected(gpu_available, gpu_name, bf16_native))
+        except (RuntimeError, tk.TclError):
+            # Dialog already closed
+            pass
+    
+    def _on_hardware_detected(self, gpu_available: bool, gpu_name: str, bf16_native: bool):
+        """Update the GPU and precision widgets with the detection result"""
+        if not self.dialog.winfo_exists():
+            return
+        
+        self.gpu_info.config(
+            text=f"🚀 {gpu_name}\n{'✓ Fast generation (2-10 seconds)' if gpu_available else '✗ Not available on this system'}",
+            fg="#4ec9b0" if gpu_available else "#858585"
+        )
+        self.gpu_button.config(
+            text="Use GPU" if gpu_available else "GPU Not Available",
+            state=tk.NORMAL if gpu_available else tk.DISABLED,
+            bg="#0e639c" if gpu_available else "#3c3c3c",
+            fg="white" if gpu_available else "#858585",
+            cursor="hand2" if gpu_available else "arrow",
+            activebackground="#1177bb" if gpu_available else "#3c3c3c",
+            activeforeground="white" if gpu_available else "#858585"
+        )
+        self.bf16_label.config(
+            text="✓ This CPU has native bf16 support" if bf16_native else "✗ No native bf16 on this CPU (bf16 may be slower)",
+            fg="#4ec9b0" if bf16_native else "#858585"
+        )
+        if gpu_available:
+            self.note_label.config(text="💡 Tip: CPU is more stable, but GPU is faster if you need quick results")
+    
     def _select_device(self, device):
         """Handle device selection"""
         self.selected_device = device
+        self.quantize = device == "cpu" and self.quantize_var.get()
+        self.precision = self.precision_var.get()
+        self.calibrate_threads = self.calibrate_var.get()
         self.dialog.destroy()
     
     def _close_dialog(self):
@@ -0,0 +1,197 @@
+"""
+Performance Panel Component
+Live view of the metrics registry: jobs, queue, RTF, caches, models and memory
+"""
+
+import threading
+import tkinter as tk
+from tkinter import ttk
+from typing import Callable, Dict, Any, Optional
+
+from features.metrics_registry import histogram_quantile
+from utils.config import PERFORMANCE_PANEL_REFRESH_MS
+
+
+def _samples(snapshot: Dict[str, Any], name: str):
+    return snapshot.get(name, {}).get("samples", [])
+
+
+def _total(snapshot: Dict[str, Any], name: str, **match) -> float:
+    """Sum a counter or gauge over the samples whose labels match"""
+    return sum(
+        sample["value"] for sample in _samples(snapshot, name)
+        if all(sample["labels"].get(key) == value for key, value in match.items())
+    )
+
+
+def _merged_histogram(snapshot: Dict[str, Any], name: str) -> Optional[Dict[str, Any]]:
+    """Combine every label set of a histogram into one sample"""
+    samples = _samples(snapshot, name)
+    if not samples:
+        return None
+    buckets = [[bound, 0] for bound, _ in samples[0]["buckets"]]
+    for sample in samples:
+        for index, (_, count) in enumerate(sample["buckets"]):
+            buckets[index][1] += count
+    return {"count": sum(s["count"] for s in samples), "sum": sum(s["sum"] for s in samples), "buckets": buckets}
+
+
+def _hit_ratio(snapshot: Dict[str, Any], name: str) -> str:
+    hits = _total(snapshot, name, result="hit")
+    lookups = hits + _total(snapshot, name, result="miss")
+    return f"{hits / lookups:.0%} of {lookups:.0f}" if lookups else "-"
+
+
+def _format_seconds(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+class PerformancePanel:
+    """
+    Metrics overview refreshed on a timer (dockable in the main window)
+    """
+    
+    def __init__(
+        self,
+        parent,
+        snapshot_source: Callable[[], Dict[str, Any]],
+        on_dock_toggle: Optional[Callable] = None,
+        docked: bool = True
+    ):
+        """
+        Args:
+            parent: Parent tkinter widget (right column or a Toplevel)
+            snapshot_source: Callable returning a MetricsRegistry.snapshot().
+                Called on a background thread - it may block on a daemon round trip.
+            on_dock_toggle: Optional callback() for the Dock/Undock button
+            docked: Whether the panel sits in the main window
+        """
+        self.parent = parent
+        self.snapshot_source = snapshot_source
+        self.on_dock_toggle = on_dock_toggle
+        self.docked = docked
+        self._after_id = None
+        self._destroyed = False
+        
+        self._setup_ui()
+        self.refresh()
+    
+    def _setup_ui(self):
+        """Setup the panel UI"""
+        self.frame = ttk.LabelFrame(self.parent, text="📈 Performance", padding="10")
+        
+        summary_frame = ttk.Frame(self.frame)
+        summary_frame.pack(fill=tk.X)
+        summary_frame.columnconfigure(1, weight=1)
+        
+        self.value_vars = {}
+        rows = [
+            ("jobs", "Jobs done / failed:"),
+            ("queue", "Queue depth:"),
+            ("rtf", "RTF p50 / p95:"),
+            ("voice_cache", "Voice cache hits:"),
+            ("model_cache", "Model cache hits:"),
+            ("models", "Resident models:"),
+            ("memory", "RSS / peak:"),
+        ]
+        for row, (key, label) in enumerate(rows):
+            ttk.Label(summary_frame, text=label, font=("Segoe UI", 9)).grid(row=row, column=0, sticky=tk.W, pady=1)
+            var = tk.StringVar(value="-")
+            self.value_vars[key] = var
+            ttk.Label(summary_frame, textvariable=var, font=("Segoe UI", 9)).grid(row=row, column=1, sticky=tk.E, pady=1)
+        
+        # Per-stage latency
+        self.stage_tree = ttk.Treeview(
+            self.frame, columns=("count", "p50", "p95"), show="tree headings", height=6
+        )
+        self.stage_tree.heading("#0", text="Stage")
+        self.stage_tree.column("#0", width=110)
+        for column, title in (("count", "Runs"), ("p50", "p50"), ("p95", "p95")):
+            self.stage_tree.heading(column, text=title)
+            self.stage_tree.column(column, width=50, anchor=tk.E)
+        self.stage_tree.pack(fill=tk.BOTH, expand=True, pady=(10, 0))
+        
+        self.status_var = tk.StringVar(value="")
+        ttk.Label(self.frame, textvariable=self.status_var, font=("Segoe UI", 8), foreground="gray").pack(
+            side=tk.LEFT, pady=(5, 0)
+        )
+        if self.on_dock_toggle:
+            ttk.Button(
+                self.frame, text="Undock" if self.docked else "Dock", command=self.on_dock_toggle
+            ).pack(side=tk.RIGHT, pady=(5, 0))
+    
+    def refresh(self):
+        """Collect a fresh snapshot off the Tk thread (the next refresh is scheduled once it arrives)"""
+        self._after_id = None
+        threading.Thread(target=self._collect, daemon=True).start()
+    
+    def _collect(self):
+        """Background thread: read the snapshot and hand it to the Tk thread"""
+        try:
+            snapshot, error = self.snapshot_source(), None
+        except Exception as e:
+            snapshot, error = None, str(e)
+        
+        if self._destroyed:
+            return
+        try:
+            self.frame.after(0, lambda: self._on_snapshot(snapshot, error))
+        except (tk.TclError, RuntimeError):
+            pass  # Panel closed while collecting
+    
+    def _on_snapshot(self, snapshot: Optional[Dict[str, Any]], error: Optional[str]):
+        """Show a collected snapshot and schedule the next refresh"""
+        if self._destroyed:
+            return
+        if error is not None:
+            self.status_var.set(f"⚠️ Metrics unavailable: {error}")
+        else:
+            self._show(snapshot)
+            self.status_var.set("")
+        self._after_id = self.frame.after(PERFORMANCE_PANEL_REFRESH_MS, self.refresh)
+    
+    def _show(self, snapshot: Dict[str, Any]):
+        """Update the labels and stage table from a snapshot"""
+        self.value_vars["jobs"].set(
+            f"{_total(snapshot, 'chatterbox_jobs', status='done'):.0f} / "
+            f"{_total(snapshot, 'chatterbox_jobs', status='failed'):.0f}"
+        )
+        self.value_vars["queue"].set(f"{_total(snapshot, 'chatterbox_queue_depth'):.0f}")
+        
+        rtf = _merged_histogram(snapshot, "chatterbox_rtf")
+        if rtf and rtf["count"]:
+            self.value_vars["rtf"].set(
+                f"{histogram_quantile(rtf, 0.5):.2f} / {histogram_quantile(rtf, 0.95):.2f}"
+            )
+        
+        self.value_vars["voice_cache"].set(_hit_ratio(snapshot, "chatterbox_voice_cache"))
+        self.value_vars["model_cache"].set(_hit_ratio(snapshot, "chatterbox_model_cache"))
+        self.value_vars["models"].set(
+            f"{_total(snapshot, 'chatterbox_resident_models'):.0f} "
+            f"({_total(snapshot, 'chatterbox_resident_model_bytes') / 1024**3:.1f} GB)"
+        )
+        self.value_vars["memory"].set(
+            f"{_total(snapshot, 'chatterbox_process_resident_memory_bytes') / 1024**3:.2f} / "
+            f"{_total(snapshot, 'chatterbox_process_peak_resident_memory_bytes') / 1024**3:.2f} GB"
+        )
+        
+        stages = {sample["labels"].get("stage"): sample for sample in _samples(snapshot, "chatterbox_stage_seconds")}
+        existing = set(self.stage_tree.get_children())
+        for stage, sample in stages.items():
+            values = (
+                sample["count"],
+                _format_seconds(histogram_quantile(sample, 0.5)),
+                _format_seconds(histogram_quantile(sample, 0.95)),
+            )
+            if stage in existing:
+                self.stage_tree.item(stage, values=values)
+            else:
+                self.stage_tree.insert("", tk.END, iid=stage, text=stage, values=values)
+    
+    def destroy(self):
+        """Stop refreshing and remove the panel"""
+        self._destroyed = True
+        if self._after_id is not None:
+            self.frame.after_cancel(self._after_id)
+            self._after_id = None
+        self.frame.destroy()
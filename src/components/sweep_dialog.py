@@ -0,0 +1,176 @@
+"""
+Sweep Dialog Component
+Pick expression presets or a parameter grid for a sweep render
+"""
+
+import tkinter as tk
+from tkinter import ttk, messagebox
+from typing import Dict, Any, List, Optional
+
+from features.sweep import build_preset_variants, build_grid_variants
+from utils.resource_path import get_resource_path
+
+
+class SweepDialog:
+    """
+    Modal dialog returning the list of sweep variants to render
+    """
+    
+    def __init__(self, parent, presets: Dict[str, Dict[str, Any]], current_config: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            parent: Parent tkinter widget
+            presets: Expression preset table (name -> parameters)
+            current_config: Current expression config, used to prefill the grid
+        """
+        self.parent = parent
+        self.presets = presets
+        self.current_config = current_config or {}
+        self.variants = None
+        self.dialog = None
+    
+    def show(self) -> Optional[List[Dict[str, Any]]]:
+        """Show the dialog and return the chosen variants (None if cancelled)"""
+        self.dialog = tk.Toplevel(self.parent)
+        self.dialog.title("Expression Sweep")
+        self.dialog.resizable(False, False)
+        self.dialog.transient(self.parent)
+        
+        try:
+            icon_path = get_resource_path("icon/logo.ico")
+            if icon_path.exists():
+                self.dialog.iconbitmap(str(icon_path))
+        except Exception as e:
+            print(f"⚠️ Could not load icon for sweep dialog: {e}")
+        
+        main_frame = ttk.Frame(self.dialog, padding="15")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        ttk.Label(
+            main_frame,
+            text="Render the current line once per expression:",
+            font=("Segoe UI", 10)
+        ).pack(anchor=tk.W, pady=(0, 10))
+        
+        # Mode selection
+        self.mode_var = tk.StringVar(value="presets")
+        mode_frame = ttk.Frame(main_frame)
+        mode_frame.pack(fill=tk.X, pady=(0, 10))
+        ttk.Radiobutton(mode_frame, text="Presets", variable=self.mode_var, value="presets",
+                        command=self._on_mode_change).pack(side=tk.LEFT, padx=(0, 20))
+        ttk.Radiobutton(mode_frame, text="Parameter Grid", variable=self.mode_var, value="grid",
+                        command=self._on_mode_change).pack(side=tk.LEFT)
+        
+        # Presets (two columns of checkboxes)
+        self.presets_frame = ttk.Frame(main_frame)
+        self.preset_vars = {}
+        checks_frame = ttk.Frame(self.presets_frame)
+        checks_frame.pack(fill=tk.X)
+        for index, name in enumerate(self.presets.keys()):
+            var = tk.BooleanVar(value=True)
+            var.trace_add("write", lambda *args: self._update_count())
+            self.preset_vars[name] = var
+            ttk.Checkbutton(checks_frame, text=name, variable=var).grid(
+                row=index // 2, column=index % 2, sticky=tk.W, padx=(0, 15), pady=1
+            )
+        
+        select_frame = ttk.Frame(self.presets_frame)
+        select_frame.pack(fill=tk.X, pady=(5, 0))
+        ttk.Button(select_frame, text="Select All", command=lambda: self._select_all(True)).pack(side=tk.LEFT, padx=(0, 5))
+        ttk.Button(select_frame, text="Select None", command=lambda: self._select_all(False)).pack(side=tk.LEFT)
+        
+        # Parameter grid (comma separated values per parameter)
+        self.grid_frame = ttk.Frame(main_frame)
+        ttk.Label(
+            self.grid_frame,
+            text="Comma separated values - every combination is rendered",
+            font=("Segoe UI", 8),
+            foreground="gray"
+        ).grid(row=0, column=0, columnspan=2, sticky=tk.W, pady=(0, 5))
+        
+        self.grid_vars = {}
+        grid_fields = [
+            ("energy", "Energy (0.25-2.0):", "{:.2f}", 0.70),
+            ("speed", "Speed (0.01-1.0):", "{:.2f}", 0.40),
+            ("emphasis", "Emphasis (0.05-5.0):", "{:.2f}", 0.90),
+            ("pitch", "Pitch (-12 to 12):", "{:.0f}", 0),
+        ]
+        for row, (key, label, fmt, default) in enumerate(grid_fields, start=1):
+            ttk.Label(self.grid_frame, text=label, width=20).grid(row=row, column=0, sticky=tk.W, pady=2)
+            var = tk.StringVar(value=fmt.format(self.current_config.get(key, default)))
+            var.trace_add("write", lambda *args: self._update_count())
+            self.grid_vars[key] = var
+            ttk.Entry(self.grid_frame, textvariable=var, width=30).grid(row=row, column=1, sticky=tk.EW, pady=2)
+        
+        # Take count + buttons
+        self.count_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.count_var, font=("Segoe UI", 9)).pack(side=tk.BOTTOM, anchor=tk.W, pady=(10, 0))
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(side=tk.BOTTOM, fill=tk.X, pady=(10, 0))
+        ttk.Button(button_frame, text="Cancel", command=self._cancel).pack(side=tk.RIGHT)
+        ttk.Button(button_frame, text="🎛️ Render Sweep", command=self._confirm).pack(side=tk.RIGHT, padx=(0, 5))
+        
+        self._on_mode_change()
+        
+        self.dialog.protocol("WM_DELETE_WINDOW", self._cancel)
+        self.dialog.grab_set()
+        self.parent.wait_window(self.dialog)
+        
+        return self.variants
+    
+    def _on_mode_change(self):
+        """Swap between preset and grid panels"""
+        if self.mode_var.get() == "presets":
+            self.grid_frame.pack_forget()
+            self.presets_frame.pack(fill=tk.X)
+        else:
+            self.presets_frame.pack_forget()
+            self.grid_frame.pack(fill=tk.X)
+        self._update_count()
+    
+    def _select_all(self, selected: bool):
+        for var in self.preset_vars.values():
+            var.set(selected)
+    
+    def _parse_values(self, key: str, cast) -> List:
+        """Parse a comma separated grid entry"""
+        raw = self.grid_vars[key].get()
+        return [cast(float(part)) for part in raw.split(",") if part.strip()]
+    
+    def _build_variants(self) -> List[Dict[str, Any]]:
+        """Build variants from the current dialog state (raises ValueError on bad input)"""
+        if self.mode_var.get() == "presets":
+            names = [name for name, var in self.preset_vars.items() if var.get()]
+            return build_preset_variants(self.presets, names)
+        
+        energy = [max(0.25, min(2.0, v)) for v in self._parse_values("energy", float)]
+        speed = [max(0.01, min(1.0, v)) for v in self._parse_values("speed", float)]
+        emphasis = [max(0.05, min(5.0, v)) for v in self._parse_values("emphasis", float)]
+        pitch = [max(-12, min(12, v)) for v in self._parse_values("pitch", round)]
+        return build_grid_variants(energy, speed, emphasis, pitch)
+    
+    def _update_count(self):
+        try:
+            count = len(self._build_variants())
+            self.count_var.set(f"{count} take(s) will be rendered")
+        except ValueError:
+            self.count_var.set("⚠️ Invalid grid values")
+    
+    def _confirm(self):
+        try:
+            variants = self._build_variants()
+        except ValueError:
+            messagebox.showwarning("Invalid Values", "Grid values must be numbers separated by commas.", parent=self.dialog)
+            return
+        
+        if not variants:
+            messagebox.showwarning("Nothing to Render", "Select at least one preset or value.", parent=self.dialog)
+            return
+        
+        self.variants = variants
+        self.dialog.destroy()
+    
+    def _cancel(self):
+        self.variants = None
+        self.dialog.destroy()
@@ -0,0 +1,506 @@
+"""
+Daemon Feature
+Resident background process that keeps the models loaded between app launches
+
+The daemon listens on localhost. Clients authenticate with a random key
+stored next to the daemon info file in the cache folder (readable only
+by the current user: mode 0600 on POSIX, an ACL granting only this user
+on Windows). Requests are small dicts with absolute paths; audio is
+written by the daemon to the output path given by the client and
+returned as a path.
+
+Metrics are also served as OpenMetrics text on http://127.0.0.1:<port>/metrics
+(read-only, no key needed) for scrapers such as Prometheus.
+"""
+
+import getpass
+import json
+import os
+import socket
+import subprocess
+import threading
+import traceback
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from utils.config import CACHE_DIR, PRIORITY_NORMAL, DAEMON_METRICS_PORT, DAEMON_BATCH_WINDOW_MS
+from features.scheduler import GenerationJob, generation_scheduler
+from features.metrics import GenerationMetrics, append_metrics
+from features.metrics_registry import metrics_registry, observe_generation
+
+DAEMON_INFO_PATH = CACHE_DIR / "daemon.json"
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+
+def _key_path(info_path: Path) -> Path:
+    """The key file lives next to its info file (daemon.json -> daemon.key)"""
+    return info_path.with_suffix(".key")
+
+
+def _write_private(path: Path, data: bytes):
+    """
+    Write a file readable only by the current user
+    
+    Windows ignores the file mode, so there the inherited permissions are
+    replaced with a single full-control entry for this user before the
+    data is written.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        if os.name == "nt":
+            try:
+                subprocess.run(
+                    ["icacls", str(path), "/inheritance:r", "/grant:r", f"{getpass.getuser()}:F"],
+                    check=True, capture_output=True
+                )
+            except (OSError, subprocess.CalledProcessError) as e:
+                print(f"⚠️ Could not restrict access to {path.name}: {e}")
+        f.write(data)
+
+
+def _absolute_voice_config(voice_config: Dict[str, Any]) -> Dict[str, Any]:
+    """Copy of a voice config with its reference paths made absolute (the daemon has another working folder)"""
+    voice_config = dict(voice_config)
+    for key in ("custom_path", "voice_file"):
+        if voice_config.get(key):
+            voice_config[key] = str(Path(voice_config[key]).resolve())
+    return voice_config
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serves the metrics registry on GET /metrics"""
+    
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = metrics_registry.render_openmetrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", OPENMETRICS_CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+    
+    def log_message(self, format, *args):
+        # Scrapers poll every few seconds - keep the console quiet
+        pass
+
+
+class DaemonServer:
+    """
+    Serves generation requests from an initialized TTSGenerator
+    
+    Every request runs as a scheduler job with the priority sent by the
+    client, so an interactive preview from the GUI preempts a batch render
+    submitted by another client.
+    
+    With a batch window, requests arriving close together are held briefly
+    and queued grouped by language and voice: the scheduler still runs one
+    job at a time, but fewer model and voice conditioning switches happen.
+    """
+    
+    def __init__(
+        self,
+        generator,
+        metrics_port: int = DAEMON_METRICS_PORT,
+        info_path: Optional[Path] = None,
+        batch_window_ms: int = DAEMON_BATCH_WINDOW_MS
+    ):
+        """
+        Args:
+            generator: Initialized TTSGenerator
+            metrics_port: Port of the /metrics endpoint (0 = disabled)
+            info_path: Daemon info file (default: DAEMON_INFO_PATH) - separate
+                files let several daemons run side by side
+            batch_window_ms: Request grouping window (0 = disabled)
+        """
+        self.generator = generator
+        self.metrics_port = metrics_port
+        self.info_path = Path(info_path or DAEMON_INFO_PATH)
+        self.batch_window_ms = batch_window_ms
+        self.listener: Optional[Listener] = None
+        self.metrics_server: Optional[ThreadingHTTPServer] = None
+        self._stopping = False
+        self._window = []  # (priority, group key, arrival, job) waiting for the batch window
+        self._window_lock = threading.Lock()
+    
+    def _start_metrics_server(self) -> Optional[int]:
+        """Serve /metrics on a background thread (returns the port, None if unavailable)"""
+        if not self.metrics_port:
+            return None
+        try:
+            self.metrics_server = ThreadingHTTPServer(("127.0.0.1", self.metrics_port), _MetricsHandler)
+        except OSError as e:
+            print(f"⚠️ Metrics endpoint unavailable on port {self.metrics_port}: {e}")
+            return None
+        self.metrics_server.daemon_threads = True
+        threading.Thread(target=self.metrics_server.serve_forever, daemon=True).start()
+        port = self.metrics_server.server_address[1]
+        print(f"📈 Metrics at http://127.0.0.1:{port}/metrics")
+        return port
+    
+    def serve_forever(self):
+        """Accept connections until stop() is called or Ctrl+C"""
+        authkey = os.urandom(32)
+        _write_private(_key_path(self.info_path), authkey)
+        
+        self.listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        host, port = self.listener.address
+        metrics_port = self._start_metrics_server()
+        self.info_path.write_text(json.dumps({
+            "host": host,
+            "port": port,
+            "metrics_port": metrics_port,
+            "pid": os.getpid(),
+            "device_name": self.generator.device_name,
+            "batch_window_ms": self.batch_window_ms,
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+        }, indent=2), encoding="utf-8")
+        print(f"🛰️ Chatterbox daemon listening on {host}:{port} (pid {os.getpid()})")
+        
+        try:
+            while not self._stopping:
+                try:
+                    conn = self.listener.accept()
+                except (OSError, EOFError, AuthenticationError):
+                    # Client failed authentication, or the wake-up connection from stop()
+                    continue
+                threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+        except KeyboardInterrupt:
+            print("\n⚠️ Daemon interrupted")
+        finally:
+            self._cleanup()
+    
+    def stop(self):
+        """Stop accepting connections"""
+        self._stopping = True
+        if self.listener:
+            # accept() does not return when the socket is closed - wake it with a dummy connection
+            try:
+                socket.create_connection(self.listener.address, timeout=1).close()
+            except OSError:
+                pass
+    
+    def _cleanup(self):
+        if self.listener:
+            self.listener.close()
+        if self.metrics_server:
+            self.metrics_server.shutdown()
+            self.metrics_server.server_close()
+        for path in (self.info_path, _key_path(self.info_path)):
+            try:
+                path.unlink()
+            except OSError:
+                pass
+        print("👋 Chatterbox daemon stopped")
+    
+    def _serve_connection(self, conn):
+        """Handle one request on its own connection"""
+        send_lock = threading.Lock()
+        
+        def send(message: Dict[str, Any]):
+            with send_lock:
+                try:
+                    conn.send(message)
+                except (OSError, EOFError):
+                    # Client went away - the job is cancelled by _handle_generate
+                    pass
+        
+        try:
+            request = conn.recv()
+            command = request.get("cmd")
+            
+            if command == "ping":
+                send({
+                    "type": "pong",
+                    "device_name": self.generator.device_name,
+                    "resident_models": self.generator.residency.resident_names,
+                    "pending_jobs": generation_scheduler.pending_count,
+                })
+            elif command == "generate":
+                self._handle_generate(conn, send, request)
+            elif command == "metrics":
+                send({"type": "metrics", "metrics": metrics_registry.snapshot()})
+            elif command == "shutdown":
+                send({"type": "bye"})
+                self.stop()
+            else:
+                send({"type": "error", "error": f"Unknown command: {command}"})
+        except EOFError:
+            pass
+        except Exception as e:
+            print(f"❌ Daemon request failed: {e}")
+            traceback.print_exc()
+            send({"type": "error", "error": str(e)})
+        finally:
+            conn.close()
+    
+    def _handle_generate(self, conn, send, request: Dict[str, Any]):
+        """Run a generate request as a scheduler job and stream its progress"""
+        finished = threading.Event()
+        
+        def progress_callback(percentage, status):
+            send({"type": "progress", "percent": percentage, "status": status})
+        
+        # Clients that collect metrics log them themselves (with their own stages added)
+        metrics = GenerationMetrics(
+            request.get("label", "Daemon request"), auto_log=not request.get("return_metrics")
+        )
+        
+        def run():
+            steps = self.generator.iter_generate_audio(
+                request["text"],
+                request["voice_config"],
+                request["expression_config"],
+                Path(request["output_path"]),
+                request.get("language_code", "en"),
+                progress_callback,
+                request.get("quality", "final"),
+                request.get("seed"),
+                metrics
+            )
+            return _forward_chunks(steps, send)
+        
+        job = GenerationJob(
+            request.get("label", "Daemon request"),
+            run,
+            on_complete=lambda job: finished.set(),
+            priority=request.get("priority", PRIORITY_NORMAL),
+            metrics=metrics
+        )
+        voice = request["voice_config"]
+        self._submit(job, (
+            request.get("language_code", "en"),
+            str(voice.get("voice_file") or voice.get("custom_path") or "")
+        ))
+        
+        # Watch for a cancel message (or a closed connection) while the job runs
+        while not finished.wait(0.25):
+            try:
+                if conn.poll() and conn.recv().get("cmd") == "cancel":
+                    job.cancel()
+            except (EOFError, OSError):
+                job.cancel()
+                finished.wait()
+                return
+        
+        if request.get("return_metrics") and metrics.status:
+            # Not logged here, but the daemon's own registry still counts it
+            observe_generation(metrics)
+        
+        send({
+            "type": "result",
+            "status": job.status,
+            "output_path": str(job.result) if job.result else None,
+            "error": str(job.error) if job.error else None,
+            "metrics": {
+                "status": metrics.status,
+                "audio_seconds": metrics.audio_seconds,
+                "stages": dict(metrics.stages),
+                "context": metrics.context,
+            } if request.get("return_metrics") else None,
+        })
+
+
+    def _submit(self, job: GenerationJob, group: tuple):
+        """Queue a job now, or hold it for the batch window"""
+        if not self.batch_window_ms:
+            generation_scheduler.submit(job)
+            return
+        
+        with self._window_lock:
+            self._window.append((job.priority, group, len(self._window), job))
+            first = len(self._window) == 1
+        if first:
+            timer = threading.Timer(self.batch_window_ms / 1000, self._flush_window)
+            timer.daemon = True
+            timer.start()
+    
+    def _flush_window(self):
+        """Queue the held jobs grouped by language and voice (priority first, then arrival)"""
+        with self._window_lock:
+            held, self._window = self._window, []
+        
+        # Groups run in order of their first request
+        first_arrival = {}
+        for _, group, arrival, _ in held:
+            first_arrival.setdefault(group, arrival)
+        held.sort(key=lambda item: (item[0], first_arrival[item[1]], item[2]))
+        
+        for _, _, _, job in held:
+            generation_scheduler.submit(job)
+
+
+def _forward_chunks(steps, send):
+    """Re-yield a generation's chunk boundaries and report each one to the client"""
+    while True:
+        try:
+            done = next(steps)
+        except StopIteration as stop:
+            return stop.value
+        send({"type": "chunk", "done": done})
+        yield done
+
+
+class DaemonClient:
+    """
+    Client side of the daemon - same generation interface as TTSGenerator
+    """
+    
+    def __init__(self, address, authkey: bytes, info: Dict[str, Any]):
+        self.address = address
+        self.authkey = authkey
+        self.info = info
+        self.device_name = f"{info.get('device_name', 'daemon')} via daemon"
+    
+    @classmethod
+    def connect(cls, info_path: Optional[Path] = None) -> Optional["DaemonClient"]:
+        """
+        Connect to a running daemon
+        
+        Args:
+            info_path: Daemon info file (default: DAEMON_INFO_PATH)
+        
+        Returns:
+            DaemonClient, or None if no daemon is running (fall back to in-process)
+        """
+        info_path = Path(info_path or DAEMON_INFO_PATH)
+        try:
+            info = json.loads(info_path.read_text(encoding="utf-8"))
+            authkey = _key_path(info_path).read_bytes()
+        except (OSError, ValueError):
+            return None
+        
+        client = cls((info["host"], info["port"]), authkey, info)
+        try:
+            client.ping()
+        except Exception as e:
+            print(f"ℹ️ Daemon not reachable ({e}) - loading models in-process")
+            return None
+        return client
+    
+    def _open(self):
+        return Client(self.address, authkey=self.authkey)
+    
+    def ping(self) -> Dict[str, Any]:
+        """Check the daemon is alive and get its status"""
+        with self._open() as conn:
+            conn.send({"cmd": "ping"})
+            return conn.recv()
+    
+    def metrics_snapshot(self) -> Dict[str, Any]:
+        """The daemon's metrics registry (see MetricsRegistry.snapshot)"""
+        with self._open() as conn:
+            conn.send({"cmd": "metrics"})
+            return conn.recv().get("metrics", {})
+    
+    def shutdown(self):
+        """Ask the daemon to exit"""
+        with self._open() as conn:
+            conn.send({"cmd": "shutdown"})
+            conn.recv()
+    
+    def generate_audio(self, *args, **kwargs) -> Optional[Path]:
+        """Blocking version of iter_generate_audio"""
+        steps = self.iter_generate_audio(*args, **kwargs)
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                return stop.value
+    
+    def iter_generate_audio(
+        self,
+        text: str,
+        voice_config: Dict[str, Any],
+        expression_config: Dict[str, Any],
+        output_path: Path,
+        language_code: str = "en",
+        progress_callback=None,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None,
+        priority: int = PRIORITY_NORMAL
+    ):
+        """
+        Generate audio in the daemon
+        
+        Same arguments and chunk-wise yields as TTSGenerator.iter_generate_audio.
+        Closing the generator early cancels the request in the daemon. When
+        metrics is given, the daemon's stage timings are copied into it and
+        the daemon leaves logging the record to this side.
+        """
+        with self._open() as conn:
+            conn.send({
+                "cmd": "generate",
+                "label": text[:30],
+                "text": text,
+                "voice_config": _absolute_voice_config(voice_config),
+                "expression_config": expression_config,
+                "output_path": str(Path(output_path).resolve()),
+                "language_code": language_code,
+                "quality": quality,
+                "seed": seed,
+                "priority": priority,
+                "return_metrics": metrics is not None,
+            })
+            
+            completed = False
+            try:
+                while True:
+                    message = conn.recv()
+                    kind = message.get("type")
+                    if kind == "progress":
+                        if progress_callback:
+                            progress_callback(message["percent"], message["status"])
+                    elif kind == "chunk":
+                        yield message["done"]
+                    elif kind == "result":
+                        completed = True
+                        if metrics is not None and message.get("metrics"):
+                            remote = message["metrics"]
+                            metrics.merge(remote.get("stages", {}))
+                            metrics.context.update(remote.get("context", {}), via="daemon")
+                            metrics.finish(remote.get("status"), message.get("output_path"), remote.get("audio_seconds"))
+                            if metrics.auto_log:
+                                append_metrics(metrics)
+                        if message.get("error"):
+                            print(f"❌ Daemon generation failed: {message['error']}")
+                        return Path(message["output_path"]) if message.get("output_path") else None
+                    elif kind == "error":
+                        completed = True
+                        print(f"❌ Daemon error: {message.get('error')}")
+                        return None
+            finally:
+                if not completed:
+                    try:
+                        conn.send({"cmd": "cancel"})
+                    except (OSError, EOFError):
+                        pass
+
+
+def run_daemon(
+    generator,
+    metrics_port: int = DAEMON_METRICS_PORT,
+    info_path: Optional[Path] = None,
+    batch_window_ms: int = DAEMON_BATCH_WINDOW_MS
+) -> int:
+    """
+    Serve requests until stopped (generator must already be initialized)
+    
+    Args:
+        generator: Initialized TTSGenerator
+        metrics_port: Port of the OpenMetrics endpoint (0 = disabled)
+        info_path: Daemon info file (default: DAEMON_INFO_PATH)
+        batch_window_ms: Request grouping window (0 = disabled)
+    
+    Returns:
+        int: Process exit code
+    """
+    DaemonServer(generator, metrics_port, info_path, batch_window_ms).serve_forever()
+    return 0
@@ -9,6 +9,29 @@ from tkinter import messagebox
 import shutil
 
 
+def copy_export(source_audio: Path, destination: Path, format: str = "wav") -> Path:
+    """
+    Write the exported file (no dialogs)
+    
+    Args:
+        source_audio: Path to source audio file
+        destination: Destination path
+        format: Audio format (wav, mp3)
+        
+    Returns:
+        Path: Path of the written file (extension matches the format)
+    """
+    # Ensure destination has correct extension
+    dest_path = Path(destination)
+    if dest_path.suffix.lower() != f".{format}":
+        dest_path = dest_path.with_suffix(f".{format}")
+    
+    # For now, just copy the WAV file with the requested extension
+    # MP3 conversion will be added later
+    shutil.copy2(source_audio, dest_path)
+    return dest_path
+
+
 def export_audio(
     source_audio: Path,
     destination: Path,
@@ -30,14 +53,7 @@ def export_audio(
             messagebox.showerror("Error", "Source audio file not found")
             return False
         
-        # Ensure destination has correct extension
-        dest_path = Path(destination)
-        if dest_path.suffix.lower() != f".{format}":
-            dest_path = dest_path.with_suffix(f".{format}")
-        
-        # For now, just copy the WAV file with the requested extension
-        # MP3 conversion will be added later
-        shutil.copy2(source_audio, dest_path)
+        dest_path = copy_export(source_audio, destination, format)
         print(f"✅ Audio exported: {dest_path}")
         messagebox.showinfo("Success", f"Audio exported successfully!\n{dest_path.name}")
         return True
@@ -5,10 +5,35 @@ Handles audio generation using chatterbox-tts
 
 from pathlib import Path
 from typing import Optional, Dict, Any
+from concurrent.futures import Future, ThreadPoolExecutor
 import traceback
-import torchaudio as ta
 from tkinter import messagebox
 
+from utils.config import (
+    CACHE_DIR, MAX_CHUNK_CHARS, DRAFT_FLOW_STEPS, MAX_NEW_TOKENS,
+    PITCH_TIERS, DEFAULT_PRECISION, MODEL_RAM_BUDGET_GB, MODEL_IDLE_UNLOAD_MINUTES,
+    WARMUP_TEXT, PRIORITY_BACKGROUND
+)
+from utils.text_utils import split_text_into_chunks
+from features.quantization import quantize_token_model
+from features.precision import device_supports_bf16, precision_autocast
+from features.thread_tuner import apply_thread_profile
+from features.weight_loading import mapped_weight_loading
+from features.model_residency import ModelResidencyManager
+from features.model_manifest import (
+    DEFAULT_REPO_ID, manifest_covers, enable_offline_mode,
+    resolve_local_snapshot, record_model_snapshot
+)
+from features.synthesis import (
+    supports_staged_synthesis, generate_speech_tokens, vocode_speech_tokens, seeded_sampling
+)
+from features.scheduler import GenerationJob, generation_scheduler
+from features.synthesis_worker import SynthesisWorker
+from features.metrics import GenerationMetrics, append_metrics
+from features.tracing import tracer
+from features.metrics_registry import metrics_registry
+from features.session_recorder import session_recorder
+
 
 class TTSGenerator:
     """
@@ -16,14 +41,126 @@ class TTSGenerator:
     """
     
     def __init__(self):
-        self.model = None
-        self.multilingual_model = None
         self._initialized = False
         self.loading_screen = None
         self.device = "cpu"  # Default to CPU
         self.device_name = "CPU"
+        self.quantize = False  # Int8 token models (CPU only)
+        self.precision = DEFAULT_PRECISION  # "fp32" or "bf16" (token model autocast)
+        
+        # Voice conditioning cache (per model) so repeated renders with the
+        # same reference audio skip re-encoding the prompt
+        self._conds_keys = {}
+        self._default_conds = {}
+        
+        # Loaded models live in an LRU with a RAM budget (see model_residency)
+        self.residency = ModelResidencyManager(
+            budget_bytes=int(MODEL_RAM_BUDGET_GB * 1024**3),
+            idle_unload_seconds=MODEL_IDLE_UNLOAD_MINUTES * 60
+        )
+        self.residency.register("english", self._load_english_model)
+        self.residency.register("multilingual", self._load_multilingual_model)
+        self.residency.on_unload = self._on_model_unloaded
+        self.sample_rate = None  # Set when the first model loads
+        self.offline = False  # Models resolved from the local manifest (no network)
+        self.online = False  # Force hub resolution (e.g. after "check for updates")
+        self.warmup_times: Dict[str, float] = {}  # Model name -> warm-up seconds
+        self.worker: Optional[SynthesisWorker] = None  # Set when synthesis runs in a child process
+        self.stub_models = False  # Synthetic-audio stand-ins instead of the real models (benchmarks)
+        
+        # Pitch shift / save run here so the model stage can start the next job
+        self._postprocessor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="postprocess")
+        
+        # S3Gen vocoding runs here so T3 can generate the next chunk's tokens meanwhile
+        self._vocoder = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vocoder")
+    
+    @property
+    def model(self):
+        """English model (loaded on demand)"""
+        return self.residency.get("english")
+    
+    @property
+    def multilingual_model(self):
+        """Multilingual model (loaded on demand)"""
+        return self.residency.get("multilingual")
+    
+    @staticmethod
+    def model_name_for(language_code: str) -> str:
+        """Residency name of the model used for a language"""
+        return "english" if language_code == "en" else "multilingual"
+    
+    def _load_english_model(self):
+        """Residency loader for the English model"""
+        if self.stub_models:
+            from features.stub_models import StubChatterboxTTS
+            return self._load_stub_model("english", StubChatterboxTTS)
+        
+        import chatterbox.tts as tts_module
+        return self._load_model("english", tts_module.ChatterboxTTS, getattr(tts_module, "REPO_ID", DEFAULT_REPO_ID))
+    
+    def _load_multilingual_model(self):
+        """Residency loader for the multilingual model"""
+        if self.stub_models:
+            from features.stub_models import StubChatterboxMultilingualTTS
+            return self._load_stub_model("multilingual", StubChatterboxMultilingualTTS)
+        
+        import chatterbox.mtl_tts as mtl_module
+        return self._load_model(
+            "multilingual", mtl_module.ChatterboxMultilingualTTS, getattr(mtl_module, "REPO_ID", DEFAULT_REPO_ID)
+        )
+    
+    def _load_model(self, model_name: str, model_class, repo_id: str):
+        """
+        Load a model from the manifest snapshot, or from the hub on first use
+        
+        Args:
+            model_name: Residency name ("english", "multilingual")
+            model_class: ChatterboxTTS or ChatterboxMultilingualTTS
+            repo_id: Hugging Face repo id (recorded in the manifest)
+        """
+        snapshot_dir = None if self.online else resolve_local_snapshot(model_name)
+        
+        def load_weights():
+            with mapped_weight_loading(self.device):
+                if snapshot_dir:
+                    print(f"   📂 Loading {model_name} model from {snapshot_dir}")
+                    return model_class.from_local(snapshot_dir, self.device)
+                return model_class.from_pretrained(device=self.device)
+        
+        model = load_weights()
+        if snapshot_dir is None:
+            record_model_snapshot(model_name, repo_id)
+        if self.quantize and not quantize_token_model(model, model_name):
+            # A failed conversion can leave uninitialized int8 layers behind
+            print(f"⚠️ Reloading the {model_name} model without quantization")
+            del model
+            model = load_weights()
+        self.sample_rate = model.sr
+        return model
     
-    def initialize(self, loading_screen=None, force_device=None) -> bool:
+    def _load_stub_model(self, model_name: str, model_class):
+        """Create a stub model (no weights, no manifest, no quantization)"""
+        print(f"   🧪 Using stub {model_name} model (synthetic audio)")
+        model = model_class.from_pretrained(device=self.device)
+        self.sample_rate = model.sr
+        return model
+    
+    def _on_model_unloaded(self, name: str, model):
+        """Drop per-model voice conditioning caches when a model is unloaded"""
+        self._conds_keys.pop(id(model), None)
+        self._default_conds.pop(id(model), None)
+    
+    def initialize(
+        self,
+        loading_screen=None,
+        force_device=None,
+        quantize: bool = False,
+        precision: str = DEFAULT_PRECISION,
+        online: bool = False,
+        warmup: bool = False,
+        isolate: bool = False,
+        stub_models: bool = False
+    ) -> bool:
         """
         Initialize the TTS model
         This is done lazily on first use
@@ -31,6 +168,14 @@ class TTSGenerator:
         Args:
             loading_screen: Optional LoadingScreen instance for progress updates
             force_device: Optional device selection ("cpu" or "cuda"). If None, auto-detect.
+            quantize: Apply dynamic int8 quantization to the token models (CPU only)
+            precision: "fp32" or "bf16" - bf16 runs the token models under autocast
+            online: Resolve models on the hub even if the manifest covers them
+            warmup: Schedule a background warm-up synthesis per loaded model.
+                Only use this when all generation goes through generation_scheduler.
+            isolate: Load the models in a synthesis child process (see synthesis_worker)
+            stub_models: Use the synthetic-audio stub models (see stub_models) -
+                for benchmarking the app without model weights
             
         Returns:
             bool: Success status
@@ -53,12 +198,21 @@ class TTSGenerator:
             
             # Set cache directory to user's home folder (works in both dev and frozen exe)
             import os
-            cache_dir = Path.home() / ".cache" / "chatterbox_tts"
+            cache_dir = CACHE_DIR
             cache_dir.mkdir(parents=True, exist_ok=True)
             os.environ['HF_HOME'] = str(cache_dir)
             os.environ['TRANSFORMERS_CACHE'] = str(cache_dir / "transformers")
             print(f"📁 Cache directory: {cache_dir}")
             
+            # Offline-first: once every model we may load resolves from disk, never probe the hub.
+            # Deferred models count too - offline mode cannot be lifted after the hub libraries load.
+            self.stub_models = stub_models
+            self.online = online
+            self.offline = not online and manifest_covers(self.residency.registered_names)
+            if self.offline:
+                enable_offline_mode()
+                print("📴 Offline mode: models resolved from the local manifest")
+            
             # Import chatterbox-tts
             print("📦 Attempting to import chatterbox modules...")
             try:
@@ -66,13 +220,18 @@ class TTSGenerator:
                 import torch
                 print(f"  ✅ Torch version: {torch.__version__}")
                 
-                print("  - Importing ChatterboxTTS...")
-                from chatterbox.tts import ChatterboxTTS
-                print("  ✅ ChatterboxTTS imported")
-                
-                print("  - Importing ChatterboxMultilingualTTS...")
-                from chatterbox.mtl_tts import ChatterboxMultilingualTTS
-                print("  ✅ ChatterboxMultilingualTTS imported")
+                if stub_models:
+                    print("  🧪 Stub models requested - skipping the chatterbox imports")
+                else:
+                    # Availability check only - the loaders import the model classes
+                    import importlib
+                    print("  - Importing ChatterboxTTS...")
+                    importlib.import_module("chatterbox.tts")
+                    print("  ✅ ChatterboxTTS imported")
+                    
+                    print("  - Importing ChatterboxMultilingualTTS...")
+                    importlib.import_module("chatterbox.mtl_tts")
+                    print("  ✅ ChatterboxMultilingualTTS imported")
                 
             except ImportError as ie:
                 error_msg = f"Failed to import chatterbox_tts library: {ie}"
@@ -110,6 +269,27 @@ class TTSGenerator:
                     self.device_name = "CPU"
                     print("⚠️ No GPU detected, using CPU (slower)")
             
+            # Dynamic int8 kernels are CPU only
+            self.quantize = quantize and self.device == "cpu"
+            if quantize and not self.quantize:
+                print("⚠️ Int8 quantized mode is only available on CPU - using full precision")
+            if self.quantize:
+                self.device_name = "CPU (int8)"
+            
+            # Calibrated CPU thread counts for this host (must run before any model work)
+            apply_thread_profile()
+            
+            # bf16 autocast (int8 dynamic kernels expect fp32 activations, so int8 wins)
+            self.precision = precision
+            if precision == "bf16":
+                if self.quantize:
+                    print("⚠️ bf16 cannot be combined with int8 quantized mode - using fp32 activations")
+                    self.precision = "fp32"
+                else:
+                    if not device_supports_bf16(self.device):
+                        print("⚠️ No native bf16 support detected - bf16 may be slower than fp32 on this device")
+                    self.device_name = f"{self.device_name} (bf16)"
+            
             if loading_screen:
                 loading_screen.update_progress(10, f"📦 Using {self.device_name}...")
             
@@ -118,17 +298,21 @@ class TTSGenerator:
                 print("⚠️ Loading cancelled by user")
                 return False
             
-            # Monkey-patch torch.load to force CPU mapping for chatterbox models
-            original_torch_load = torch.load
-            def patched_torch_load(f, *args, **kwargs):
-                # Force map_location to CPU if not specified
-                if 'map_location' not in kwargs:
-                    kwargs['map_location'] = torch.device('cpu')
-                return original_torch_load(f, *args, **kwargs)
-            
-            torch.load = patched_torch_load
-            
-            try:
+            if isolate:
+                # Models live in a child process - synthesis never holds this process's GIL
+                if loading_screen:
+                    loading_screen.update_progress(20, "🧩 Starting synthesis worker process...")
+                self.worker = SynthesisWorker(dict(
+                    force_device=self.device,
+                    quantize=quantize,
+                    precision=precision,
+                    online=online,
+                    stub_models=stub_models
+                ))
+                self.worker.start()
+                self.sample_rate = self.worker.sample_rate
+                self.device_name = f"{self.worker.device_name} (worker process)"
+            else:
                 if loading_screen:
                     loading_screen.update_progress(20, "🔊 Loading English TTS model...")
                 
@@ -138,7 +322,7 @@ class TTSGenerator:
                     return False
                 
                 # Initialize English model
-                print("📥 Calling ChatterboxTTS.from_pretrained()...")
+                print("📥 Loading English model...")
                 print(f"   Device: {self.device}")
                 print(f"   Cache dir: {cache_dir}")
                 print(f"   Cache dir exists: {cache_dir.exists()}")
@@ -146,7 +330,7 @@ class TTSGenerator:
                     print(f"   Cache dir contents: {list(cache_dir.iterdir())[:5]}")  # First 5 items
                 
                 try:
-                    self.model = ChatterboxTTS.from_pretrained(device=self.device)
+                    self.residency.get("english")
                     print("✅ English model loaded successfully")
                 except Exception as model_error:
                     print(f"❌ Failed to load English model: {model_error}")
@@ -162,22 +346,22 @@ class TTSGenerator:
                     print("⚠️ Loading cancelled by user")
                     return False
                 
-                # Initialize multilingual model
-                print("📥 Calling ChatterboxMultilingualTTS.from_pretrained()...")
+                # Initialize multilingual model (with a RAM budget it loads on first use instead)
+                print("📥 Loading Multilingual model...")
                 try:
-                    self.multilingual_model = ChatterboxMultilingualTTS.from_pretrained(device=self.device)
-                    print("✅ Multilingual model loaded successfully")
+                    if self.residency.budget_bytes:
+                        print("   Deferred - RAM budget set, loads on first non-English generation")
+                    else:
+                        self.residency.get("multilingual")
+                        print("✅ Multilingual model loaded successfully")
                 except Exception as model_error:
                     print(f"❌ Failed to load Multilingual model: {model_error}")
                     print(f"   Error type: {type(model_error).__name__}")
                     traceback.print_exc()
                     raise  # Re-raise to be caught by outer except
-                
-                if loading_screen:
-                    loading_screen.update_progress(90, "✨ Finalizing setup...")
-            finally:
-                # Restore original torch.load
-                torch.load = original_torch_load
+            
+            if loading_screen:
+                loading_screen.update_progress(90, "✨ Finalizing setup...")
             
             if loading_screen:
                 loading_screen.update_progress(100, "✅ Models loaded successfully!")
@@ -185,6 +369,8 @@ class TTSGenerator:
             print("✅ Chatterbox TTS models loaded successfully!")
             
             self._initialized = True
+            if warmup:
+                self.schedule_warmup()
             return True
         except Exception as e:
             if loading_screen:
@@ -193,6 +379,42 @@ class TTSGenerator:
             traceback.print_exc()
             return False
     
+    def schedule_warmup(self) -> GenerationJob:
+        """
+        Queue a low priority job that runs a tiny synthesis on each loaded model
+        
+        Returns:
+            GenerationJob: The warm-up job (result: warm-up seconds per model)
+        """
+        return generation_scheduler.submit(GenerationJob(
+            "Warm-up",
+            self._iter_warmup,
+            priority=PRIORITY_BACKGROUND
+        ))
+    
+    def _iter_warmup(self):
+        """Warm up one model per step (interactive jobs can run in between)"""
+        import time
+        
+        model_names = self.worker.resident_models if self.worker else self.residency.resident_names
+        for index, model_name in enumerate(model_names):
+            # Skip models unloaded while this job was waiting
+            if not self.worker and not self.residency.is_resident(model_name):
+                continue
+            
+            metrics = GenerationMetrics(f"Warm-up ({model_name})", kind="warmup", device=self.device)
+            start_time = time.perf_counter()
+            self.synthesize_model_chunk(model_name, WARMUP_TEXT, "en", None, 0.5, 0.5, 0.8, seed=0, metrics=metrics)
+            self.warmup_times[model_name] = time.perf_counter() - start_time
+            metrics.finish("done")
+            append_metrics(metrics)
+            print(f"🔥 {model_name.capitalize()} model warmed up in {self.warmup_times[model_name]:.1f}s")
+            
+            if index < len(model_names) - 1:
+                yield model_name
+        
+        return dict(self.warmup_times)
+    
     def generate_audio(
         self,
         text: str,
@@ -200,7 +422,10 @@ class TTSGenerator:
         expression_config: Dict[str, Any],
         output_path: Path,
         language_code: str = "en",
-        progress_callback=None
+        progress_callback=None,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None
     ) -> Optional[Path]:
         """
         Generate audio from text
@@ -212,10 +437,56 @@ class TTSGenerator:
             output_path: Path where audio will be saved
             language_code: Language code (e.g., "en", "ja", "zh")
             progress_callback: Optional callback function(percentage, status) for progress updates
+            quality: "final" (full quality) or "draft" (fewer vocoder flow steps and
+                the fast pitch tier; the token model runs unchanged - see
+                benchmarks/generation.py --qualities final,draft for the speedup)
+            seed: Optional random seed; re-running a draft take with the same seed
+                at "final" quality renders the same take at full quality
+            metrics: Optional GenerationMetrics to record per-stage timings into
+                (one is created and logged automatically if not given)
             
         Returns:
             Optional[Path]: Path to generated audio or None if failed
         """
+        steps = self.iter_generate_audio(
+            text, voice_config, expression_config, output_path, language_code, progress_callback, quality, seed,
+            metrics
+        )
+        while True:
+            try:
+                next(steps)
+            except StopIteration as stop:
+                result = stop.value
+                return result.result() if isinstance(result, Future) else result
+    
+    def iter_generate_audio(
+        self,
+        text: str,
+        voice_config: Dict[str, Any],
+        expression_config: Dict[str, Any],
+        output_path: Path,
+        language_code: str = "en",
+        progress_callback=None,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None
+    ):
+        """
+        Generate audio chunk by chunk
+        
+        Generator version of generate_audio used by the scheduler. Long text is
+        split into sentence chunks; the generator yields after every chunk but
+        the last, which is a safe point to pause and run a higher priority job.
+        
+        Once the model stage is done, post-processing (pitch shift, save) is
+        handed to a separate worker so the model can start on the next job.
+        The return value (StopIteration.value) is therefore a Future resolving
+        to the output path or None (plain None if nothing was synthesized).
+        The scheduler resolves it before reporting the job as done.
+        
+        Args:
+            Same as generate_audio
+        """
         if not self.initialize():
             return None
         
@@ -223,6 +494,9 @@ class TTSGenerator:
             print("❌ Cannot generate audio: Text is empty")
             return None
         
+        # Session recording (--record-session) - None when not recording
+        recorded = session_recorder.request(text, voice_config, expression_config, language_code, quality, seed)
+        
         try:
             if progress_callback:
                 progress_callback(10, "Preparing generation...")
@@ -232,6 +506,7 @@ class TTSGenerator:
             print(f"   Text: {text[:50]}..." if len(text) > 50 else f"   Text: {text}")
             print(f"   Voice Mode: {voice_config.get('mode', 'Default')}")
             print(f"   Language: {language_code}")
+            print(f"   Quality: {quality}" + (f" (seed {seed})" if seed is not None else ""))
             
             # Get audio prompt path from voice configuration
             # Both predefined and custom voices provide audio files for voice cloning
@@ -273,26 +548,41 @@ class TTSGenerator:
                 status_msg = f"Synthesizing speech on {self.device_name}, please wait..."
                 progress_callback(30, status_msg)
             
+            # Split long text into sentence chunks (each chunk is a preemption point)
+            chunks = split_text_into_chunks(text, MAX_CHUNK_CHARS)
+            if len(chunks) > 1:
+                print(f"   Split into {len(chunks)} chunks (max {MAX_CHUNK_CHARS} characters)")
+            
+            if metrics is None:
+                metrics = GenerationMetrics()
+            metrics.context.update(
+                language=language_code, quality=quality, seed=seed, device=self.device,
+                characters=len(text), chunks=len(chunks), pitch=pitch_shift
+            )
+            
             # Track generation time for helpful messages
             import time
             import threading
             start_time = time.time()
             long_generation_warned = False
-            generation_complete = False
+            generation_complete = threading.Event()
+            
+            # Set while a chunk is being synthesized - the progress animation
+            # pauses while this job is preempted by another one
+            synthesizing = threading.Event()
             
             # Smooth progress bar animation
             current_progress = 30
-            target_progress = 50  # First target
+            target_progress = 50 if len(chunks) == 1 else 30 + 55 / len(chunks)  # First target
             
             def update_progress_smoothly():
                 """Smoothly update progress bar using exponential approach"""
-                nonlocal current_progress, target_progress, long_generation_warned, generation_complete
+                nonlocal current_progress, target_progress, long_generation_warned
                 
-                while not generation_complete:
-                    time.sleep(1)  # Update every 1 second
-                    
-                    if generation_complete:
-                        break
+                # Update every 1 second; wakes immediately when generation completes
+                while not generation_complete.wait(1):
+                    if not synthesizing.is_set():
+                        continue
                     
                     # Calculate new progress using formula:
                     # remaining = target - current
@@ -308,7 +598,7 @@ class TTSGenerator:
                     
                     # Check if we've been running for 30 seconds
                     elapsed = time.time() - start_time
-                    if elapsed >= 30 and not long_generation_warned:
+                    if elapsed >= 30 and not long_generation_warned and len(chunks) == 1:
                         long_generation_warned = True
                         target_progress = 85  # Move target to 85
                         if progress_callback:
@@ -334,182 +624,562 @@ class TTSGenerator:
             if language_code == "en":
                 # Use English-only model for better quality
                 print(f"   Using English model (exaggeration={exaggeration:.2f}, cfg_weight={cfg_weight:.2f}, temperature={temperature:.2f})")
-                wav = self.model.generate(
-                    text,
-                    audio_prompt_path=audio_prompt_path,
-                    exaggeration=exaggeration,
-                    cfg_weight=cfg_weight,
-                    temperature=temperature
-                )
             else:
                 # Use multilingual model
                 print(f"   Using multilingual model (language={language_code}, exaggeration={exaggeration:.2f}, cfg_weight={cfg_weight:.2f}, temperature={temperature:.2f})")
-                wav = self.multilingual_model.generate(
-                    text,
-                    language_id=language_code,
-                    audio_prompt_path=audio_prompt_path,
-                    exaggeration=exaggeration,
-                    cfg_weight=cfg_weight,
-                    temperature=temperature
-                )
             
-            # Mark that generation completed (stop the progress animation)
-            generation_complete = True
-            generation_time = time.time() - start_time
-            print(f"   ✅ Generation completed in {generation_time:.1f} seconds")
-            
-            # Apply pitch shifting if needed (post-processing using Parselmouth/Praat)
-            if pitch_shift != 0:
-                if progress_callback:
-                    progress_callback(85, f"Applying pitch shift ({pitch_shift:+d} semitones)...")
-                
-                # Warn about extreme pitch shifts
-                if abs(pitch_shift) > 6:
-                    print(f"   ⚠️ Warning: Large pitch shift ({pitch_shift:+d} semitones) may affect quality")
-                    print(f"   💡 Tip: For best results, keep pitch shifts within ±6 semitones")
-                
-                print(f"   Applying pitch shift: {pitch_shift:+d} semitones with Praat (formant preservation)")
-                
-                try:
-                    import parselmouth
-                    from parselmouth.praat import call
-                    import numpy as np
-                    
-                    # Convert tensor to numpy if needed
-                    if hasattr(wav, 'cpu'):
-                        wav_np = wav.cpu().numpy()
-                    else:
-                        wav_np = wav
+            # Two-stage pipeline: while chunk N is vocoded on the vocoder thread,
+            # T3 generates chunk N+1's tokens here. At most one chunk is in
+            # flight, so the vocoder never falls more than one chunk behind.
+            wav_chunks = []
+            pending = None
+            model_name = self.model_name_for(language_code)
+            try:
+                for index, chunk in enumerate(chunks):
+                    synthesizing.set()
+                    future = self.submit_model_chunk(
+                        model_name, chunk, language_code, audio_prompt_path, exaggeration, cfg_weight, temperature,
+                        quality, None if seed is None else seed + index, metrics
+                    )
+                    if pending is not None:
+                        wav_chunks.append(pending.result())
+                    pending = future
+                    synthesizing.clear()
                     
-                    # Parselmouth expects shape (samples,) or (channels, samples)
-                    # Handle multi-channel audio
-                    if wav_np.ndim > 1:
-                        # Process each channel separately to preserve quality
-                        shifted_channels = []
-                        for channel in wav_np:
-                            # Create Parselmouth Sound object
-                            sound = parselmouth.Sound(channel, sampling_frequency=self.model.sr)
-                            
-                            # Calculate pitch multiplication factor from semitones
-                            # factor = 2^(semitones/12)
-                            pitch_factor = 2 ** (pitch_shift / 12.0)
-                            
-                            # Use Praat's Manipulation to change pitch while preserving formants
-                            manipulation = call(sound, "To Manipulation", 0.01, 75, 600)
-                            pitch_tier = call(manipulation, "Extract pitch tier")
-                            call(pitch_tier, "Multiply frequencies", sound.xmin, sound.xmax, pitch_factor)
-                            call([pitch_tier, manipulation], "Replace pitch tier")
-                            sound_shifted = call(manipulation, "Get resynthesis (overlap-add)")
-                            
-                            # Get numpy array from result and flatten if needed
-                            shifted_audio = sound_shifted.values
-                            if shifted_audio.ndim > 1:
-                                shifted_audio = shifted_audio.flatten()
-                            shifted_channels.append(shifted_audio)
-                        
-                        wav_np = np.stack(shifted_channels)
-                    else:
-                        # Single channel processing
-                        sound = parselmouth.Sound(wav_np, sampling_frequency=self.model.sr)
-                        
-                        # Calculate pitch multiplication factor
-                        pitch_factor = 2 ** (pitch_shift / 12.0)
-                        
-                        # Apply pitch manipulation with formant preservation
-                        manipulation = call(sound, "To Manipulation", 0.01, 75, 600)
-                        pitch_tier = call(manipulation, "Extract pitch tier")
-                        call(pitch_tier, "Multiply frequencies", sound.xmin, sound.xmax, pitch_factor)
-                        call([pitch_tier, manipulation], "Replace pitch tier")
-                        sound_shifted = call(manipulation, "Get resynthesis (overlap-add)")
+                    if index < len(chunks) - 1:
+                        done = index + 1
+                        current_progress = max(current_progress, 30 + 55 * done / len(chunks))
+                        target_progress = 30 + 55 * (done + 1) / len(chunks)
+                        if progress_callback:
+                            progress_callback(int(current_progress), f"Synthesized chunk {done}/{len(chunks)} on {self.device_name}...")
                         
-                        # Get numpy array and flatten if needed
-                        wav_np = sound_shifted.values
-                        if wav_np.ndim > 1:
-                            wav_np = wav_np.flatten()
-                    
-                    # Convert back to tensor if original was tensor
-                    if hasattr(wav, 'cpu'):
-                        import torch
-                        wav = torch.from_numpy(wav_np).to(wav.device)
-                    else:
-                        wav = wav_np
-                    
-                    print(f"   ✅ Pitch shift applied with formant preservation (Praat)")
-                    
-                except ImportError:
-                    print("   ⚠️ Parselmouth not installed. Falling back to librosa...")
-                    print("   Install with: pip install praat-parselmouth")
-                    
-                    # Fallback to librosa
-                    import librosa
-                    import numpy as np
-                    
-                    if hasattr(wav, 'cpu'):
-                        wav_np = wav.cpu().numpy()
-                    else:
-                        wav_np = wav
-                    
-                    if wav_np.ndim > 1:
-                        shifted_channels = []
-                        for channel in wav_np:
-                            shifted = librosa.effects.pitch_shift(
-                                channel, sr=self.model.sr, n_steps=pitch_shift, res_type='soxr_hq'
-                            )
-                            shifted_channels.append(shifted)
-                        wav_np = np.stack(shifted_channels)
-                    else:
-                        wav_np = librosa.effects.pitch_shift(
-                            wav_np, sr=self.model.sr, n_steps=pitch_shift, res_type='soxr_hq'
-                        )
-                    
-                    if hasattr(wav, 'cpu'):
-                        import torch
-                        wav = torch.from_numpy(wav_np).to(wav.device)
-                    else:
-                        wav = wav_np
-                    
-                    print(f"   ✅ Pitch shift applied (librosa fallback)")
-                    
-                except Exception as e:
-                    print(f"   ❌ Pitch shift failed: {str(e)}")
-                    print(f"   Continuing with original audio...")
+                        # Chunk boundary - the scheduler may pause this job here
+                        yield done
+            finally:
+                # Stop the progress animation and wait for it, so it neither reports
+                # after completion nor keeps this generation's closures alive
+                generation_complete.set()
+                synthesizing.clear()
+                progress_thread.join()
+            
+            # The last chunk may still be vocoding - the post-processing stage waits for it
+            return self._postprocessor.submit(
+                self._finish_audio, wav_chunks, pending, start_time, output_path, pitch_shift, quality,
+                progress_callback, metrics, recorded
+            )
+            
+        except Exception as e:
+            print(f"❌ Error generating audio: {e}")
+            traceback.print_exc()
+            if metrics is not None:
+                metrics.finish("failed")
+                if metrics.auto_log:
+                    append_metrics(metrics)
+                if recorded is not None:
+                    session_recorder.record(recorded, metrics)
+            return None
+    
+    def _finish_audio(
+        self,
+        wav_chunks,
+        last_chunk: Future,
+        start_time: float,
+        output_path: Path,
+        pitch_shift: int,
+        quality: str,
+        progress_callback=None,
+        metrics: Optional[GenerationMetrics] = None,
+        recorded: Optional[Dict[str, Any]] = None
+    ) -> Optional[Path]:
+        """
+        Post-processing stage: join chunks, pitch shift and save (runs on the post-processing worker)
+        
+        Args:
+            wav_chunks: Waveforms of all chunks but the last
+            last_chunk: Future of the last chunk's waveform
+            start_time: time.time() when the generation started
+            recorded: Session record from session_recorder.request(), if recording
+            Others: Same as generate_audio
+        
+        Returns:
+            Optional[Path]: Output path, or None if synthesis or saving failed
+        """
+        import time
+        
+        metrics = metrics or GenerationMetrics()
+        try:
+            with tracer.span("wait for last chunk", "stage", job=metrics.label):
+                wav_chunks = wav_chunks + [last_chunk.result()]
+            print(f"   ✅ Generation completed in {time.time() - start_time:.1f} seconds")
+            
+            with metrics.stage("post_processing"):
+                if len(wav_chunks) == 1:
+                    wav = wav_chunks[0]
+                else:
+                    import torch
+                    wav = torch.cat(wav_chunks, dim=-1)
+                wav = self._post_process(wav, pitch_shift, quality, progress_callback)
             
             if progress_callback:
                 progress_callback(90, "Saving audio file...")
             
             # Save audio
-            output_path.parent.mkdir(parents=True, exist_ok=True)
-            ta.save(str(output_path), wav, self.model.sr)
+            with metrics.stage("file_write"):
+                import torchaudio as ta
+                output_path.parent.mkdir(parents=True, exist_ok=True)
+                ta.save(str(output_path), wav, self.sample_rate)
             
             if progress_callback:
                 progress_callback(100, "Audio generated successfully!")
             
+            metrics.finish("done", output_path, wav.shape[-1] / self.sample_rate)
             print(f"✅ Audio generated successfully: {output_path}")
+            print(f"   ⏱️ {metrics.summary()}")
             
-            # Clear GPU cache if using CUDA
-            if self.device == "cuda":
+            # Clear GPU cache if using CUDA (not while the next job is allocating)
+            if self.device == "cuda" and generation_scheduler.current_job is None:
                 import torch
                 torch.cuda.empty_cache()
             
             return output_path
             
         except Exception as e:
-            print(f"❌ Error generating audio: {e}")
+            print(f"❌ Error finishing audio: {e}")
             traceback.print_exc()
+            metrics.finish("failed")
             return None
+        finally:
+            if metrics.auto_log:
+                append_metrics(metrics)
+            if recorded is not None:
+                session_recorder.record(recorded, metrics)
+    
+    def _post_process(self, wav, pitch_shift: int, quality: str, progress_callback=None):
+        """Apply the post-processing effects (currently pitch shift) to a joined waveform"""
+        # Apply pitch shifting if needed (post-processing using Parselmouth/Praat)
+        if pitch_shift != 0:
+            if progress_callback:
+                progress_callback(85, f"Applying pitch shift ({pitch_shift:+d} semitones)...")
+            
+            # Warn about extreme pitch shifts
+            if abs(pitch_shift) > 6:
+                print(f"   ⚠️ Warning: Large pitch shift ({pitch_shift:+d} semitones) may affect quality")
+                print(f"   💡 Tip: For best results, keep pitch shifts within ±6 semitones")
+            
+            wav = self._apply_pitch_shift(wav, pitch_shift, PITCH_TIERS["fast" if quality == "draft" else "quality"])
+        
+        return wav
+    
+    def _apply_pitch_shift(self, wav, pitch_shift: int, tier: Dict[str, Any]):
+        """
+        Shift pitch by a number of semitones (post-processing)
+        
+        Uses Praat overlap-add resynthesis to preserve formants, falling back
+        to librosa when Parselmouth is not installed.
+        
+        Args:
+            wav: Waveform tensor or numpy array
+            pitch_shift: Semitones (-12 to +12)
+            tier: Entry of PITCH_TIERS - analysis settings ("fast" trades accuracy for speed)
+            
+        Returns:
+            Shifted waveform of the same type (original audio if shifting fails)
+        """
+        sample_rate = self.sample_rate
+        
+        print(f"   Applying pitch shift: {pitch_shift:+d} semitones with Praat (formant preservation, {tier['name']} tier)")
+        
+        try:
+            import parselmouth
+            from parselmouth.praat import call
+            import numpy as np
+            
+            # Convert tensor to numpy if needed
+            if hasattr(wav, 'cpu'):
+                wav_np = wav.cpu().numpy()
+            else:
+                wav_np = wav
+            
+            # Parselmouth expects shape (samples,) or (channels, samples)
+            # Handle multi-channel audio
+            if wav_np.ndim > 1:
+                # Process each channel separately to preserve quality
+                shifted_channels = []
+                for channel in wav_np:
+                    # Create Parselmouth Sound object
+                    sound = parselmouth.Sound(channel, sampling_frequency=sample_rate)
+                    
+                    # Calculate pitch multiplication factor from semitones
+                    # factor = 2^(semitones/12)
+                    pitch_factor = 2 ** (pitch_shift / 12.0)
+                    
+                    # Use Praat's Manipulation to change pitch while preserving formants
+                    manipulation = call(sound, "To Manipulation", tier["time_step"], tier["pitch_floor"], tier["pitch_ceiling"])
+                    pitch_tier = call(manipulation, "Extract pitch tier")
+                    call(pitch_tier, "Multiply frequencies", sound.xmin, sound.xmax, pitch_factor)
+                    call([pitch_tier, manipulation], "Replace pitch tier")
+                    sound_shifted = call(manipulation, "Get resynthesis (overlap-add)")
+                    
+                    # Get numpy array from result and flatten if needed
+                    shifted_audio = sound_shifted.values
+                    if shifted_audio.ndim > 1:
+                        shifted_audio = shifted_audio.flatten()
+                    shifted_channels.append(shifted_audio)
+                
+                wav_np = np.stack(shifted_channels)
+            else:
+                # Single channel processing
+                sound = parselmouth.Sound(wav_np, sampling_frequency=sample_rate)
+                
+                # Calculate pitch multiplication factor
+                pitch_factor = 2 ** (pitch_shift / 12.0)
+                
+                # Apply pitch manipulation with formant preservation
+                manipulation = call(sound, "To Manipulation", tier["time_step"], tier["pitch_floor"], tier["pitch_ceiling"])
+                pitch_tier = call(manipulation, "Extract pitch tier")
+                call(pitch_tier, "Multiply frequencies", sound.xmin, sound.xmax, pitch_factor)
+                call([pitch_tier, manipulation], "Replace pitch tier")
+                sound_shifted = call(manipulation, "Get resynthesis (overlap-add)")
+                
+                # Get numpy array and flatten if needed
+                wav_np = sound_shifted.values
+                if wav_np.ndim > 1:
+                    wav_np = wav_np.flatten()
+            
+            # Convert back to tensor if original was tensor
+            if hasattr(wav, 'cpu'):
+                import torch
+                wav = torch.from_numpy(wav_np).to(wav.device)
+            else:
+                wav = wav_np
+            
+            print(f"   ✅ Pitch shift applied with formant preservation (Praat)")
+            
+        except ImportError:
+            print("   ⚠️ Parselmouth not installed. Falling back to librosa...")
+            print("   Install with: pip install praat-parselmouth")
+            
+            # Fallback to librosa
+            import librosa
+            import numpy as np
+            
+            if hasattr(wav, 'cpu'):
+                wav_np = wav.cpu().numpy()
+            else:
+                wav_np = wav
+            
+            if wav_np.ndim > 1:
+                shifted_channels = []
+                for channel in wav_np:
+                    shifted = librosa.effects.pitch_shift(
+                        channel, sr=sample_rate, n_steps=pitch_shift, res_type=tier["res_type"]
+                    )
+                    shifted_channels.append(shifted)
+                wav_np = np.stack(shifted_channels)
+            else:
+                wav_np = librosa.effects.pitch_shift(
+                    wav_np, sr=sample_rate, n_steps=pitch_shift, res_type=tier["res_type"]
+                )
+            
+            if hasattr(wav, 'cpu'):
+                import torch
+                wav = torch.from_numpy(wav_np).to(wav.device)
+            else:
+                wav = wav_np
+            
+            print(f"   ✅ Pitch shift applied (librosa fallback)")
+            
+        except Exception as e:
+            print(f"   ❌ Pitch shift failed: {str(e)}")
+            print(f"   Continuing with original audio...")
+        
+        return wav
+    
+    def synthesize_model_chunk(
+        self,
+        model_name: str,
+        text: str,
+        language_code: str,
+        audio_prompt_path: Optional[str],
+        exaggeration: float,
+        cfg_weight: float,
+        temperature: float,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None
+    ):
+        """
+        Synthesize one chunk with a model chosen by name (blocking)
+        
+        Args:
+            model_name: Residency name ("english", "multilingual")
+            Others: Same as _synthesize_chunk
+        
+        Returns:
+            Waveform tensor of shape (1, samples)
+        """
+        return self.submit_model_chunk(
+            model_name, text, language_code, audio_prompt_path, exaggeration, cfg_weight, temperature, quality, seed,
+            metrics
+        ).result()
+    
+    def submit_model_chunk(
+        self,
+        model_name: str,
+        text: str,
+        language_code: str,
+        audio_prompt_path: Optional[str],
+        exaggeration: float,
+        cfg_weight: float,
+        temperature: float,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None
+    ) -> Future:
+        """
+        Start synthesizing one chunk with a model chosen by name
+        
+        The token stage runs on the calling thread; vocoding continues on the
+        vocoder thread. The model stays pinned in the residency manager until
+        the waveform is ready (so a paused job does not keep an evicted model
+        alive). In the synthesis worker process both stages run in the child
+        and the returned future is already resolved.
+        
+        Args:
+            model_name: Residency name ("english", "multilingual")
+            metrics: Optional GenerationMetrics to add the stage timings to
+            Others: Same as _synthesize_chunk
+        
+        Returns:
+            Future: Resolves to a waveform tensor of shape (1, samples)
+        """
+        if self.worker:
+            future = Future()
+            future.set_result(self.worker.synthesize(
+                model_name,
+                text=text,
+                language_code=language_code,
+                audio_prompt_path=audio_prompt_path,
+                exaggeration=exaggeration,
+                cfg_weight=cfg_weight,
+                temperature=temperature,
+                quality=quality,
+                seed=seed,
+                metrics=metrics
+            ))
+            return future
+        
+        pin = self.residency.use(model_name)
+        model = pin.__enter__()
+        try:
+            future = self._submit_chunk(
+                model, text, language_code, audio_prompt_path, exaggeration, cfg_weight, temperature, quality, seed,
+                metrics
+            )
+        except BaseException:
+            pin.__exit__(None, None, None)
+            raise
+        future.add_done_callback(lambda _: pin.__exit__(None, None, None))
+        return future
+    
+    def _synthesize_chunk(
+        self,
+        model,
+        text: str,
+        language_code: str,
+        audio_prompt_path: Optional[str],
+        exaggeration: float,
+        cfg_weight: float,
+        temperature: float,
+        quality: str = "final",
+        seed: Optional[int] = None
+    ):
+        """
+        Synthesize one chunk of text with the given model (model stage only)
+        
+        Returns:
+            Waveform tensor of shape (1, samples)
+        """
+        return self._submit_chunk(
+            model, text, language_code, audio_prompt_path, exaggeration, cfg_weight, temperature, quality, seed
+        ).result()
+    
+    def _submit_chunk(
+        self,
+        model,
+        text: str,
+        language_code: str,
+        audio_prompt_path: Optional[str],
+        exaggeration: float,
+        cfg_weight: float,
+        temperature: float,
+        quality: str = "final",
+        seed: Optional[int] = None,
+        metrics: Optional[GenerationMetrics] = None
+    ) -> Future:
+        """
+        Generate one chunk's speech tokens and queue them for vocoding
+        
+        Conditioning is prepared per chunk because another job may have used
+        a different voice on the same model while this job was preempted.
+        The seed is also applied per chunk for the same reason: T3 samples
+        from its own seeded generator and the vocoder thread reseeds the
+        global RNG, so the output does not depend on how the stages overlap.
+        
+        Returns:
+            Future: Resolves to a waveform tensor of shape (1, samples)
+        """
+        stage = metrics.stage if metrics else (lambda name: tracer.span(name, "stage"))
+        
+        with stage("conditioning"):
+            prompt_path = self._prepare_voice_conditioning(model, audio_prompt_path, exaggeration)
+        
+        if supports_staged_synthesis(model):
+            # Draft: fewer flow-matching steps in the vocoder (same tokens as final).
+            # bf16: only the token model runs under autocast - the vocoder's
+            # STFT/iSTFT and the voice encoder stay in fp32.
+            draft = quality == "draft"
+            with stage("token_generation"), precision_autocast(self.device, self.precision), seeded_sampling(seed):
+                speech_tokens = generate_speech_tokens(
+                    model, text, language_code, exaggeration, cfg_weight, temperature,
+                    max_new_tokens=MAX_NEW_TOKENS
+                )
+            
+            # Capture the voice now - another job may swap model.conds before this runs
+            ref_dict = model.conds.gen
+            
+            def vocode():
+                if seed is not None:
+                    import torch
+                    torch.manual_seed(seed)
+                with stage("vocoding"):
+                    return vocode_speech_tokens(
+                        model, speech_tokens, flow_steps=DRAFT_FLOW_STEPS if draft else None, ref_dict=ref_dict
+                    )
+            
+            return self._vocoder.submit(vocode)
+        
+        # Models without the staged internals: both stages in one blocking call
+        if seed is not None:
+            import torch
+            torch.manual_seed(seed)
+        
+        future = Future()
+        try:
+            with stage("synthesis"):
+                wav = self._generate_whole(
+                    model, prompt_path, text, language_code, exaggeration, cfg_weight, temperature
+                )
+            future.set_result(wav)
+        except Exception as e:
+            future.set_exception(e)
+        return future
+    
+    def _generate_whole(
+        self,
+        model,
+        prompt_path: Optional[str],
+        text: str,
+        language_code: str,
+        exaggeration: float,
+        cfg_weight: float,
+        temperature: float
+    ):
+        """Synthesize a chunk with model.generate (token and vocoder stages back to back)"""
+        if language_code == "en":
+            return model.generate(
+                text,
+                audio_prompt_path=prompt_path,
+                exaggeration=exaggeration,
+                cfg_weight=cfg_weight,
+                temperature=temperature
+            )
+        
+        return model.generate(
+            text,
+            language_id=language_code,
+            audio_prompt_path=prompt_path,
+            exaggeration=exaggeration,
+            cfg_weight=cfg_weight,
+            temperature=temperature
+        )
+    
+    def _prepare_voice_conditioning(self, model, audio_prompt_path: Optional[str], exaggeration: float) -> Optional[str]:
+        """
+        Prepare (or reuse) the voice conditioning for a model
+        
+        Encoding the reference audio is a fixed cost per generation. When the
+        same reference file is used again (e.g. a preset sweep), the cached
+        conditionals are left on the model and nothing is encoded. The
+        exaggeration is not touched here - model.generate (or
+        _update_exaggeration in staged synthesis) applies it afterwards.
+        
+        Args:
+            model: Loaded Chatterbox model
+            audio_prompt_path: Reference audio path, or None for the default voice
+            exaggeration: Exaggeration used when encoding the prompt
+            
+        Returns:
+            Optional[str]: Prompt path to pass to model.generate (None when the
+            conditionals are already prepared on the model)
+        
+        Raises:
+            FileNotFoundError: If the reference audio cannot be read - staged
+                synthesis would otherwise render with whatever voice is loaded
+        """
+        if not hasattr(model, "prepare_conditionals") or not hasattr(model, "conds"):
+            return audio_prompt_path
+        
+        model_key = id(model)
+        
+        # Remember the built-in voice so "default voice" still works after a custom prompt
+        if model_key not in self._default_conds:
+            self._default_conds[model_key] = model.conds
+        
+        if not audio_prompt_path:
+            if self._conds_keys.get(model_key) is not None:
+                model.conds = self._default_conds[model_key]
+                self._conds_keys[model_key] = None
+            return None
+        
+        try:
+            prompt_key = (str(Path(audio_prompt_path).resolve()), Path(audio_prompt_path).stat().st_mtime)
+        except OSError as e:
+            raise FileNotFoundError(f"Voice reference file not found: {audio_prompt_path}") from e
+        
+        voice_cache = metrics_registry.counter("chatterbox_voice_cache", "Voice conditioning reused (hit) or encoded (miss)")
+        if self._conds_keys.get(model_key) == prompt_key:
+            print("   ♻️ Reusing cached voice conditioning")
+            voice_cache.inc(result="hit")
+            return None
+        
+        voice_cache.inc(result="miss")
+        model.prepare_conditionals(audio_prompt_path, exaggeration=exaggeration)
+        self._conds_keys[model_key] = prompt_key
+        return None
     
     def cleanup(self):
         """Cleanup resources"""
-        if self.model:
-            # Clear GPU memory if using CUDA
-            if self.device == "cuda":
-                import torch
-                self.model = None
-                self.multilingual_model = None
-                torch.cuda.empty_cache()
-                print("🧹 GPU memory cleared")
+        # Let pending vocoding and saves finish (both workers run tasks in order)
+        self._vocoder.submit(lambda: None).result()
+        self._postprocessor.submit(lambda: None).result()
+        
+        # Unloading also clears the GPU cache when using CUDA
+        self.residency.unload_all()
+        if self.worker:
+            self.worker.stop()
+            self.worker = None
+        self._conds_keys = {}
+        self._default_conds = {}
         self._initialized = False
 
 
 # Global instance
 tts_generator = TTSGenerator()
+
+metrics_registry.gauge(
+    "chatterbox_resident_models", "Models currently loaded", lambda: tts_generator.residency.resident_count
+)
+metrics_registry.gauge(
+    "chatterbox_resident_model_bytes", "Weight size of the loaded models", lambda: tts_generator.residency.resident_weight_bytes
+)
@@ -0,0 +1,202 @@
+"""
+Generation Metrics Feature
+Per-stage timings of a generation and the rolling JSONL log they go to
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+from utils.config import CACHE_DIR, METRICS_LOG_MAX_BYTES
+from features.tracing import tracer
+from features.metrics_registry import observe_generation
+
+METRICS_LOG_PATH = CACHE_DIR / "generation_metrics.jsonl"
+
+# Stage names in pipeline order. With the two-stage pipeline, token
+# generation of one chunk overlaps vocoding of the previous one, so stage
+# totals can add up to more than the wall-clock time.
+STAGES = [
+    "queue_wait",        # Waiting in the scheduler (including while preempted)
+    "conditioning",      # Loading/encoding the reference voice
+    "token_generation",  # T3: text -> speech tokens
+    "vocoding",          # S3Gen: speech tokens -> waveform
+    "synthesis",         # Both model stages in one call (models without staged synthesis)
+    "post_processing",   # Joining chunks and pitch shifting
+    "file_write",        # Writing the WAV file
+    "player_load",       # Loading the result into the built-in player
+]
+
+_log_lock = threading.Lock()
+
+
+class GenerationMetrics:
+    """
+    Timings of one generation
+    
+    Stages may be timed from several threads (the vocoder and
+    post-processing stages run on their own workers), so updates are
+    locked. Repeated stages (one per chunk) accumulate.
+    
+    The generator logs the record once the file is written. Callers that
+    time later stages themselves (e.g. player_load) pass auto_log=False
+    and call finish() + append_metrics() when they are done.
+    """
+    
+    def __init__(self, label: str = "Generate", auto_log: bool = True, **context):
+        """
+        Args:
+            label: What was generated (e.g. "Generate", a sweep take label)
+            auto_log: Let the generator append the record to the log
+            **context: Extra fields for the log (language, quality, ...)
+        """
+        self.label = label
+        self.auto_log = auto_log
+        self.context = dict(context)
+        self.stages: Dict[str, float] = {}
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.status: Optional[str] = None
+        self.output_path: Optional[str] = None
+        self.audio_seconds: Optional[float] = None
+        self.profiler = None  # GenerationProfiler when this generation is being profiled
+        self._lock = threading.Lock()
+    
+    def add(self, stage: str, seconds: float):
+        """Add time to a stage"""
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+    
+    def merge(self, stages: Dict[str, float]):
+        """Add the stage times measured elsewhere (e.g. in the synthesis worker process)"""
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+    
+    @contextmanager
+    def stage(self, name: str):
+        """Time the body of a with-block as a stage (also a trace span when tracing, profiled when profiling)"""
+        start = time.perf_counter()
+        try:
+            with tracer.span(name, "stage", job=self.label), self.profiler.thread_scope() if self.profiler else nullcontext():
+                yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+    
+    def finish(self, status: Optional[str] = None, output_path=None, audio_seconds: Optional[float] = None):
+        """
+        Record the outcome and stop the wall clock
+        
+        Can be called again to extend the total (e.g. after loading the
+        result into the player); omitted fields keep their values.
+        
+        Args:
+            status: "done", "failed" or "cancelled"
+            output_path: Written file, if any
+            audio_seconds: Duration of the generated audio
+        """
+        self.finished_at = time.time()
+        if status is not None:
+            self.status = status
+        if output_path is not None:
+            self.output_path = str(output_path)
+        if audio_seconds is not None:
+            self.audio_seconds = audio_seconds
+    
+    @property
+    def total_seconds(self) -> float:
+        """Wall-clock time from creation until finish() (or now)"""
+        return (self.finished_at or time.time()) - self.created_at
+    
+    @property
+    def rtf(self) -> Optional[float]:
+        """Real-time factor (wall-clock seconds per second of audio)"""
+        if not self.audio_seconds:
+            return None
+        return self.total_seconds / self.audio_seconds
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serializable record"""
+        with self._lock:
+            stages = {name: round(seconds, 4) for name, seconds in self.stages.items()}
+        return {
+            "label": self.label,
+            "created_at": round(self.created_at, 3),
+            "status": self.status,
+            "total_seconds": round(self.total_seconds, 4),
+            "audio_seconds": None if self.audio_seconds is None else round(self.audio_seconds, 3),
+            "rtf": None if self.rtf is None else round(self.rtf, 4),
+            "stages": stages,
+            "output_path": self.output_path,
+            **self.context,
+        }
+    
+    def summary(self) -> str:
+        """One-line console summary of the slowest stages"""
+        with self._lock:
+            ordered = sorted(self.stages.items(), key=lambda item: item[1], reverse=True)
+        parts = ", ".join(f"{name} {seconds:.2f}s" for name, seconds in ordered[:4])
+        return f"{self.total_seconds:.2f}s total ({parts})"
+
+
+def append_metrics(metrics: GenerationMetrics, path: Optional[Path] = None):
+    """
+    Append a generation's record to the rolling JSONL log
+    
+    Also feeds the in-process metrics registry (Performance panel, daemon
+    /metrics endpoint).
+    
+    Once the log grows past METRICS_LOG_MAX_BYTES the oldest half of the
+    records is dropped.
+    
+    Args:
+        metrics: Finished metrics
+        path: Log file (default: METRICS_LOG_PATH)
+    """
+    observe_generation(metrics)
+    
+    path = Path(path or METRICS_LOG_PATH)
+    line = json.dumps(metrics.to_dict(), ensure_ascii=False) + "\n"
+    
+    try:
+        with _log_lock:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a", encoding="utf-8") as log_file:
+                log_file.write(line)
+            
+            if path.stat().st_size > METRICS_LOG_MAX_BYTES:
+                lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+                temp_path = path.with_suffix(".tmp")
+                temp_path.write_text("".join(lines[len(lines) // 2:]), encoding="utf-8")
+                os.replace(temp_path, path)
+    except OSError as e:
+        print(f"⚠️ Could not write generation metrics: {e}")
+
+
+def read_metrics_log(limit: Optional[int] = None, path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    """
+    Read records from the metrics log (oldest first)
+    
+    Args:
+        limit: Only return the most recent records
+        path: Log file (default: METRICS_LOG_PATH)
+    
+    Returns:
+        list: Records (unreadable lines are skipped)
+    """
+    path = Path(path or METRICS_LOG_PATH)
+    if not path.exists():
+        return []
+    
+    records = []
+    with _log_lock:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    for line in lines[-limit:] if limit else lines:
+        try:
+            records.append(json.loads(line))
+        except json.JSONDecodeError:
+            continue
+    return records
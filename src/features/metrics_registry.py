@@ -0,0 +1,274 @@
+"""
+Metrics Registry Feature
+Counters, gauges and histograms describing the running app, rendered as
+OpenMetrics text (daemon endpoint) or a JSON snapshot (Performance panel)
+"""
+
+import math
+import threading
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+from utils.memory import current_rss_bytes, peak_rss_bytes
+
+# Seconds - from sub-second stages up to long renders
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0)
+# Real-time factor - below 1.0 is faster than real time
+RTF_BUCKETS = (0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 3.0, 5.0, 10.0)
+
+
+def _label_key(labels: Dict[str, Any]) -> Tuple[Tuple[str, str], ...]:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: Tuple[Tuple[str, str], ...], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(key) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """Base for a metric family with optional labels"""
+    
+    kind = "unknown"
+    
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help = help_text
+        self._values: Dict[Tuple[Tuple[str, str], ...], Any] = {}
+        self._lock = threading.Lock()
+    
+    def _header(self) -> List[str]:
+        return [f"# TYPE {self.name} {self.kind}", f"# HELP {self.name} {self.help}"]
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (exposed with a _total suffix)"""
+    
+    kind = "counter"
+    
+    def inc(self, amount: float = 1, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+    
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+    
+    def render(self) -> List[str]:
+        lines = self._header()
+        for sample in self.samples():
+            lines.append(f"{self.name}_total{_format_labels(_label_key(sample['labels']))} {_format_value(sample['value'])}")
+        return lines
+
+
+class Gauge(_Metric):
+    """Current value - set explicitly or read from a function at collection time"""
+    
+    kind = "gauge"
+    
+    def __init__(self, name: str, help_text: str, function: Optional[Callable[[], Optional[float]]] = None):
+        super().__init__(name, help_text)
+        self.function = function
+    
+    def set(self, value: float, **labels):
+        with self._lock:
+            self._values[_label_key(labels)] = value
+    
+    def set_function(self, function: Callable[[], Optional[float]]):
+        """Read the (unlabelled) value from function() whenever the registry is collected"""
+        self.function = function
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        if self.function is not None:
+            try:
+                value = self.function()
+            except Exception:
+                value = None
+            return [] if value is None else [{"labels": {}, "value": value}]
+        with self._lock:
+            return [{"labels": dict(key), "value": value} for key, value in self._values.items()]
+    
+    def render(self) -> List[str]:
+        lines = self._header()
+        for sample in self.samples():
+            lines.append(f"{self.name}{_format_labels(_label_key(sample['labels']))} {_format_value(sample['value'])}")
+        return lines
+
+
+class Histogram(_Metric):
+    """Distribution of observed values in cumulative buckets"""
+    
+    kind = "histogram"
+    
+    def __init__(self, name: str, help_text: str, buckets=LATENCY_BUCKETS):
+        super().__init__(name, help_text)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+    
+    def observe(self, value: float, **labels):
+        key = _label_key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state["counts"][index] += 1
+            state["sum"] += value
+            state["count"] += 1
+    
+    def samples(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {
+                    "labels": dict(key),
+                    "count": state["count"],
+                    "sum": state["sum"],
+                    "buckets": [[bound, count] for bound, count in zip(self.buckets, state["counts"])],
+                }
+                for key, state in self._values.items()
+            ]
+    
+    def render(self) -> List[str]:
+        lines = self._header()
+        for sample in self.samples():
+            key = _label_key(sample["labels"])
+            for bound, count in sample["buckets"]:
+                lines.append(f"{self.name}_bucket{_format_labels(key, ('le', _format_value(bound)))} {count}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {sample['count']}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(sample['sum'])}")
+        return lines
+
+
+def histogram_quantile(sample: Dict[str, Any], quantile: float) -> Optional[float]:
+    """
+    Estimate a quantile from a histogram sample (linear within the bucket)
+    
+    Args:
+        sample: Entry of Histogram.samples() / a snapshot
+        quantile: Between 0 and 1
+    
+    Returns:
+        Optional[float]: Estimate, or None without observations
+    """
+    total = sample["count"]
+    if not total:
+        return None
+    
+    rank = quantile * total
+    lower_bound, lower_count = 0.0, 0
+    for bound, count in sample["buckets"]:
+        bound = float(bound)
+        if count >= rank:
+            if bound == math.inf:
+                return lower_bound
+            if count == lower_count:
+                return bound
+            return lower_bound + (bound - lower_bound) * (rank - lower_count) / (count - lower_count)
+        lower_bound, lower_count = bound, count
+    return lower_bound
+
+
+class MetricsRegistry:
+    """
+    Named metric families (get-or-create, safe from any thread)
+    """
+    
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+    
+    def _get_or_create(self, name: str, factory):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = factory()
+            return metric
+    
+    def counter(self, name: str, help_text: str = "") -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, help_text))
+    
+    def gauge(self, name: str, help_text: str = "", function: Optional[Callable] = None) -> Gauge:
+        gauge = self._get_or_create(name, lambda: Gauge(name, help_text))
+        if function is not None:
+            gauge.set_function(function)
+        return gauge
+    
+    def histogram(self, name: str, help_text: str = "", buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, help_text, buckets))
+    
+    def render_openmetrics(self) -> str:
+        """All metrics in the OpenMetrics text format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """JSON-serializable view of every metric (used by the Performance panel)"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return {
+            metric.name: {"type": metric.kind, "help": metric.help, "samples": metric.samples()}
+            for metric in metrics
+        }
+
+
+# Global instance
+metrics_registry = MetricsRegistry()
+
+metrics_registry.gauge(
+    "chatterbox_process_resident_memory_bytes", "Resident memory of this process", current_rss_bytes
+)
+metrics_registry.gauge(
+    "chatterbox_process_peak_resident_memory_bytes", "Peak resident memory of this process",
+    # The peak is sampled by the OS less often than the current value - never report it below that
+    lambda: max(peak_rss_bytes() or 0, current_rss_bytes() or 0) or None
+)
+
+
+def observe_generation(metrics):
+    """
+    Count a finished generation and its stage timings
+    
+    Args:
+        metrics: Finished GenerationMetrics
+    """
+    kind = metrics.context.get("kind", "generate")
+    metrics_registry.counter("chatterbox_generations", "Finished generations").inc(
+        status=metrics.status or "unknown", kind=kind
+    )
+    if metrics.status != "done":
+        return
+    
+    metrics_registry.histogram("chatterbox_generation_seconds", "Wall-clock time per generation").observe(
+        metrics.total_seconds, kind=kind
+    )
+    stage_histogram = metrics_registry.histogram("chatterbox_stage_seconds", "Time per generation stage")
+    for stage, seconds in dict(metrics.stages).items():
+        stage_histogram.observe(seconds, stage=stage)
+    
+    if metrics.audio_seconds:
+        metrics_registry.counter("chatterbox_audio_seconds", "Seconds of audio generated").inc(metrics.audio_seconds)
+    if metrics.rtf is not None:
+        metrics_registry.histogram(
+            "chatterbox_rtf", "Real-time factor per generation (below 1 is faster than real time)", RTF_BUCKETS
+        ).observe(metrics.rtf, kind=kind)
@@ -0,0 +1,216 @@
+"""
+Model Manifest Feature
+Records where the model files live so later startups never touch the network
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from utils.config import CACHE_DIR
+
+MODEL_MANIFEST_PATH = CACHE_DIR / "model_manifest.json"
+DEFAULT_REPO_ID = "ResembleAI/chatterbox"
+
+
+def _hub_cache_dir() -> Path:
+    """Hugging Face hub cache folder (HF_HOME is set to CACHE_DIR in initialize)"""
+    return Path(os.environ.get("HF_HOME", str(CACHE_DIR))) / "hub"
+
+
+def _sha256(path: Path) -> str:
+    """Hash a file in 8 MB blocks"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(8 * 1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest() -> Dict[str, Any]:
+    """Load the manifest (empty if missing or unreadable)"""
+    try:
+        with open(MODEL_MANIFEST_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"⚠️ Could not read model manifest: {e}")
+        return {}
+
+
+def _save_manifest(manifest: Dict[str, Any]):
+    MODEL_MANIFEST_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = MODEL_MANIFEST_PATH.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(temp_path, MODEL_MANIFEST_PATH)
+
+
+def find_cached_snapshot(repo_id: str = DEFAULT_REPO_ID) -> Optional[Path]:
+    """
+    Locate the snapshot folder the hub cache currently resolves for a repo
+    
+    Args:
+        repo_id: Hugging Face repo id
+    
+    Returns:
+        Path: snapshots/<revision> folder, or None if not downloaded
+    """
+    repo_dir = _hub_cache_dir() / f"models--{repo_id.replace('/', '--')}"
+    ref_file = repo_dir / "refs" / "main"
+    if not ref_file.exists():
+        return None
+    snapshot_dir = repo_dir / "snapshots" / ref_file.read_text().strip()
+    return snapshot_dir if snapshot_dir.is_dir() else None
+
+
+def record_model_snapshot(model_name: str, repo_id: str = DEFAULT_REPO_ID) -> bool:
+    """
+    Record the snapshot a model was just loaded from (after a successful load)
+    
+    Args:
+        model_name: Residency name ("english", "multilingual")
+        repo_id: Hugging Face repo id the model came from
+    
+    Returns:
+        bool: True if the manifest was written
+    """
+    snapshot_dir = find_cached_snapshot(repo_id)
+    if snapshot_dir is None:
+        print(f"⚠️ Could not locate the {model_name} model snapshot - manifest not written")
+        return False
+    
+    manifest = load_manifest()
+    
+    # Models from the same snapshot share files - reuse hashes already recorded
+    known_hashes = {}
+    for entry in manifest.get("models", {}).values():
+        if entry.get("snapshot_dir") == str(snapshot_dir):
+            for name, info in entry["files"].items():
+                known_hashes[(name, info["size"])] = info["sha256"]
+    
+    print(f"📝 Recording {model_name} model manifest (hashing files)...")
+    files = {}
+    for path in sorted(snapshot_dir.iterdir()):
+        if path.is_file():
+            size = path.stat().st_size
+            sha256 = known_hashes.get((path.name, size)) or _sha256(path)
+            files[path.name] = {"size": size, "sha256": sha256}
+    
+    manifest.setdefault("models", {})[model_name] = {
+        "repo_id": repo_id,
+        "revision": snapshot_dir.name,
+        "snapshot_dir": str(snapshot_dir),
+        "recorded_at": datetime.now().isoformat(timespec="seconds"),
+        "files": files,
+    }
+    _save_manifest(manifest)
+    print(f"💾 Model manifest saved: {MODEL_MANIFEST_PATH}")
+    return True
+
+
+def resolve_local_snapshot(model_name: str, verify_hashes: bool = False) -> Optional[Path]:
+    """
+    Resolve a model's files from disk using the manifest
+    
+    The default check is cheap (every recorded file exists with the
+    recorded size); verify_hashes re-hashes every file.
+    
+    Args:
+        model_name: Residency name ("english", "multilingual")
+        verify_hashes: Also compare sha256 hashes
+    
+    Returns:
+        Path: Snapshot folder to load from, or None if it must be resolved online
+    """
+    entry = load_manifest().get("models", {}).get(model_name)
+    if not entry:
+        return None
+    
+    snapshot_dir = Path(entry["snapshot_dir"])
+    for name, info in entry["files"].items():
+        path = snapshot_dir / name
+        try:
+            if path.stat().st_size != info["size"]:
+                print(f"⚠️ Manifest mismatch for {model_name}: {name} changed size")
+                return None
+        except OSError:
+            print(f"⚠️ Manifest mismatch for {model_name}: {name} is missing")
+            return None
+        if verify_hashes and _sha256(path) != info["sha256"]:
+            print(f"⚠️ Manifest mismatch for {model_name}: {name} hash differs")
+            return None
+    
+    return snapshot_dir
+
+
+def manifest_covers(model_names) -> bool:
+    """Check that every model can be resolved from disk"""
+    return all(resolve_local_snapshot(name) is not None for name in model_names)
+
+
+def enable_offline_mode():
+    """
+    Stop Hugging Face libraries from making network requests
+    
+    Must run before huggingface_hub/transformers are imported - they read
+    these variables at import time.
+    """
+    os.environ["HF_HUB_OFFLINE"] = "1"
+    os.environ["TRANSFORMERS_OFFLINE"] = "1"
+
+
+def check_for_model_updates() -> Dict[str, Any]:
+    """
+    Compare the recorded revisions with the latest revision on the hub
+    
+    This is the only place that goes online on purpose.
+    
+    Returns:
+        dict: model name -> {"repo_id", "local_revision", "remote_revision", "update_available"}
+    
+    Raises:
+        Exception: If the hub cannot be reached
+    """
+    from huggingface_hub import HfApi, constants
+    from huggingface_hub.utils import reset_sessions
+    
+    # Offline mode is read at import time - lift it for this one request
+    was_offline = constants.HF_HUB_OFFLINE
+    constants.HF_HUB_OFFLINE = False
+    reset_sessions()
+    
+    try:
+        api = HfApi()
+        models = load_manifest().get("models", {})
+        remote_revisions = {}
+        results = {}
+        
+        for model_name, entry in models.items():
+            repo_id = entry["repo_id"]
+            if repo_id not in remote_revisions:
+                remote_revisions[repo_id] = api.model_info(repo_id, revision="main").sha
+            results[model_name] = {
+                "repo_id": repo_id,
+                "local_revision": entry["revision"],
+                "remote_revision": remote_revisions[repo_id],
+                "update_available": remote_revisions[repo_id] != entry["revision"],
+            }
+        return results
+    finally:
+        constants.HF_HUB_OFFLINE = was_offline
+        reset_sessions()
+
+
+def forget_model_snapshots():
+    """
+    Clear the manifest so the next startup resolves (and downloads) online
+    """
+    manifest = load_manifest()
+    manifest["models"] = {}
+    _save_manifest(manifest)
+    print("🔄 Model manifest cleared - models will be resolved online on next start")
@@ -0,0 +1,267 @@
+"""
+Model Residency Feature
+Keeps loaded models within a RAM budget and unloads idle ones
+"""
+
+import gc
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Callable, Dict, Optional, List
+
+from features.tracing import tracer
+from features.metrics_registry import metrics_registry
+
+
+def model_size_bytes(model) -> int:
+    """
+    Approximate weight size of a Chatterbox model
+    
+    Sums every torch module attribute (t3, s3gen, ve, ...).
+    
+    Args:
+        model: Loaded model (or any torch.nn.Module)
+    
+    Returns:
+        int: Size in bytes
+    """
+    from torch import nn
+    from features.quantization import module_size_bytes
+    
+    if isinstance(model, nn.Module):
+        return module_size_bytes(model)
+    return sum(module_size_bytes(value) for value in vars(model).values() if isinstance(value, nn.Module))
+
+
+class ModelResidencyManager:
+    """
+    LRU cache of loaded models with a memory budget and idle unloading
+    
+    Models are loaded on first use through their registered loader. When
+    loading a model would exceed the budget, the least recently used models
+    are unloaded first. Models in use (see use()) are never unloaded; an
+    evicted model that a caller still references is freed once released.
+    Weights are memory-mapped, so reloading an unloaded model is mostly
+    served from the OS page cache.
+    """
+    
+    def __init__(self, budget_bytes: int = 0, idle_unload_seconds: float = 0):
+        """
+        Args:
+            budget_bytes: RAM budget for all resident models (0 = unlimited)
+            idle_unload_seconds: Unload models unused for this long (0 = never)
+        """
+        self.budget_bytes = budget_bytes
+        self.idle_unload_seconds = idle_unload_seconds
+        self.on_unload: Optional[Callable[[str, object], None]] = None
+        
+        self._loaders: Dict[str, Callable[[], object]] = {}
+        self._models = OrderedDict()  # name -> model, least recently used first
+        self._sizes: Dict[str, int] = {}
+        self._last_used: Dict[str, float] = {}
+        self._pins: Dict[str, int] = {}
+        self._lock = threading.RLock()
+        self._idle_thread: Optional[threading.Thread] = None
+        
+        # Copies kept for readers that must never wait on a model load (metrics gauges)
+        self.resident_count = 0
+        self.resident_weight_bytes = 0
+    
+    def configure(self, budget_bytes: Optional[int] = None, idle_unload_seconds: Optional[float] = None):
+        """
+        Change the budget or idle timeout
+        
+        Args:
+            budget_bytes: New RAM budget (0 = unlimited, None = unchanged)
+            idle_unload_seconds: New idle timeout (0 = never, None = unchanged)
+        """
+        with self._lock:
+            if budget_bytes is not None:
+                self.budget_bytes = budget_bytes
+            if idle_unload_seconds is not None:
+                self.idle_unload_seconds = idle_unload_seconds
+            self._ensure_idle_thread()
+    
+    def register(self, name: str, loader: Callable[[], object]):
+        """
+        Register how to load a model
+        
+        Args:
+            name: Model name (e.g. "english", "multilingual")
+            loader: Callable returning the loaded model
+        """
+        with self._lock:
+            self._loaders[name] = loader
+    
+    @property
+    def registered_names(self) -> List[str]:
+        """Names of every model with a loader, resident or not"""
+        with self._lock:
+            return list(self._loaders)
+    
+    @property
+    def resident_names(self) -> List[str]:
+        """Resident model names, least recently used first"""
+        with self._lock:
+            return list(self._models)
+    
+    @property
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(self._sizes.values())
+    
+    def is_resident(self, name: str) -> bool:
+        with self._lock:
+            return name in self._models
+    
+    def peek(self, name: str):
+        """Return the model if it is resident (never loads)"""
+        with self._lock:
+            return self._models.get(name)
+    
+    def get(self, name: str):
+        """
+        Return a model, loading it if needed
+        
+        Args:
+            name: Registered model name
+        
+        Returns:
+            Loaded model
+        """
+        with self._lock:
+            model = self._models.get(name)
+            metrics_registry.counter("chatterbox_model_cache", "Model lookups served resident (hit) or loaded (miss)").inc(
+                result="miss" if model is None else "hit", model=name
+            )
+            if model is None:
+                model = self._load(name)
+            self._models.move_to_end(name)
+            self._last_used[name] = time.time()
+            return model
+    
+    @contextmanager
+    def use(self, name: str):
+        """
+        Pin a model while it is in use
+        
+        Args:
+            name: Registered model name
+        """
+        with self._lock:
+            model = self.get(name)
+            self._pins[name] = self._pins.get(name, 0) + 1
+        try:
+            yield model
+        finally:
+            with self._lock:
+                self._pins[name] -= 1
+                self._last_used[name] = time.time()
+                # Catch up on evictions skipped while models were pinned (keep the most recent)
+                if self._models:
+                    self._evict_for(next(reversed(self._models)), 0)
+    
+    def unload(self, name: str) -> bool:
+        """
+        Unload a model (no-op if it is in use or not resident)
+        
+        Returns:
+            bool: True if the model was unloaded
+        """
+        with self._lock:
+            if name not in self._models or self._pins.get(name, 0):
+                return False
+            model = self._models.pop(name)
+            size = self._sizes.pop(name, 0)
+            self._last_used.pop(name, None)
+            self._update_counts()
+        
+        if self.on_unload:
+            try:
+                self.on_unload(name, model)
+            except Exception as e:
+                print(f"⚠️ Model unload callback error: {e}")
+        
+        del model
+        gc.collect()
+        try:
+            import torch
+            if torch.cuda.is_available():
+                torch.cuda.empty_cache()
+        except ImportError:
+            pass
+        
+        metrics_registry.counter("chatterbox_model_unloads", "Models unloaded (budget, idle or explicit)").inc(model=name)
+        print(f"📤 Unloaded {name} model ({size / 1024**3:.1f} GB)")
+        return True
+    
+    def unload_all(self):
+        """Unload every model that is not in use"""
+        for name in self.resident_names:
+            self.unload(name)
+    
+    def _load(self, name: str):
+        """Load a model and make room for it (caller holds the lock)"""
+        if name not in self._loaders:
+            raise KeyError(f"No loader registered for model '{name}'")
+        
+        # Known size from an earlier load lets us evict before loading
+        self._evict_for(name, self._sizes.get(name, 0))
+        
+        start_time = time.time()
+        with tracer.span(f"load {name}", "model"):
+            model = self._loaders[name]()
+        size = model_size_bytes(model)
+        
+        self._models[name] = model
+        self._sizes[name] = size
+        self._update_counts()
+        print(f"📥 {name.capitalize()} model resident ({size / 1024**3:.1f} GB, {time.time() - start_time:.1f}s)")
+        
+        self._evict_for(name, 0)
+        self._ensure_idle_thread()
+        return model
+    
+    def _update_counts(self):
+        """Refresh the lock-free resident counts (caller holds the lock)"""
+        self.resident_count = len(self._models)
+        self.resident_weight_bytes = sum(self._sizes.values())
+    
+    def _evict_for(self, name: str, incoming_bytes: int):
+        """Unload LRU models until the budget fits (caller holds the lock)"""
+        if not self.budget_bytes:
+            return
+        
+        for candidate in list(self._models):
+            if self.resident_bytes + incoming_bytes <= self.budget_bytes:
+                return
+            if candidate != name:
+                self.unload(candidate)
+        
+        if self.resident_bytes + incoming_bytes > self.budget_bytes:
+            print(f"⚠️ Model budget exceeded ({(self.resident_bytes + incoming_bytes) / 1024**3:.1f} GB in use)")
+    
+    def _ensure_idle_thread(self):
+        """Start the idle watcher when an idle timeout is set"""
+        if not self.idle_unload_seconds:
+            return
+        if self._idle_thread is None or not self._idle_thread.is_alive():
+            self._idle_thread = threading.Thread(target=self._watch_idle, daemon=True)
+            self._idle_thread.start()
+    
+    def _watch_idle(self):
+        """Unload models that have been idle longer than the timeout"""
+        while self.idle_unload_seconds:
+            time.sleep(min(30.0, self.idle_unload_seconds / 2))
+            
+            now = time.time()
+            with self._lock:
+                idle = [
+                    name for name in self._models
+                    if not self._pins.get(name, 0)
+                    and now - self._last_used.get(name, now) >= self.idle_unload_seconds
+                ]
+            for name in idle:
+                print(f"💤 {name.capitalize()} model idle for {self.idle_unload_seconds / 60:.0f} min")
+                self.unload(name)
@@ -0,0 +1,75 @@
+"""
+Precision Feature
+Reduced-precision (bfloat16) execution helpers
+"""
+
+import contextlib
+import platform
+from pathlib import Path
+
+
+def cpu_supports_bf16() -> bool:
+    """
+    Check whether the CPU has native bfloat16 matrix instructions
+    
+    AVX-512 BF16 and AMX run bf16 matmuls much faster than fp32; without
+    them PyTorch emulates bf16 and is usually slower than fp32.
+    
+    Returns:
+        bool: True if native bf16 support was detected
+    """
+    try:
+        import torch
+        # oneDNN's own capability check (covers AVX512-BF16/AMX and Arm BF16)
+        return bool(torch.ops.mkldnn._is_mkldnn_bf16_supported())
+    except Exception:
+        pass
+    
+    if platform.system() == "Linux":
+        try:
+            flags = Path("/proc/cpuinfo").read_text()
+            return "avx512_bf16" in flags or "amx_bf16" in flags
+        except OSError:
+            return False
+    
+    return False
+
+
+def device_supports_bf16(device: str) -> bool:
+    """
+    Check bf16 support for a device
+    
+    Args:
+        device: "cpu" or "cuda"
+    
+    Returns:
+        bool: True if bf16 autocast is worthwhile on this device
+    """
+    if device == "cuda":
+        try:
+            import torch
+            return torch.cuda.is_available() and torch.cuda.is_bf16_supported()
+        except Exception:
+            return False
+    return cpu_supports_bf16()
+
+
+def precision_autocast(device: str, precision: str):
+    """
+    Autocast context for the given precision
+    
+    Only wrap stages that tolerate bf16 (the T3 token model). Voice
+    conditioning and the S3Gen vocoder (STFT/iSTFT) must stay in fp32.
+    
+    Args:
+        device: "cpu" or "cuda"
+        precision: "fp32" or "bf16"
+    
+    Returns:
+        Context manager (no-op for fp32)
+    """
+    if precision != "bf16":
+        return contextlib.nullcontext()
+    
+    import torch
+    return torch.autocast(device_type=device, dtype=torch.bfloat16)
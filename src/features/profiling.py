@@ -0,0 +1,156 @@
+"""
+Profiling Feature
+Captures one generation with cProfile and a stack sampler, saved as a
+.pstats file (snakeviz, python -m pstats) and a collapsed-stack file
+(flamegraph.pl, speedscope)
+"""
+
+import cProfile
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from utils.config import PROFILE_SAMPLE_INTERVAL
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class GenerationProfiler:
+    """
+    Profiles a generation across the threads it runs on
+    
+    cProfile only sees the thread that enabled it, so every thread taking
+    part (scheduler, vocoder, post-processing) gets its own profile while
+    inside thread_scope() - GenerationMetrics.stage() enters it for each
+    stage. The profiles are combined on save. The sampler records the
+    stacks of all threads, including time spent waiting between stages.
+    """
+    
+    def __init__(self, sample_interval: float = PROFILE_SAMPLE_INTERVAL):
+        """
+        Args:
+            sample_interval: Seconds between stack samples
+        """
+        self.sample_interval = sample_interval
+        self.samples: Counter = Counter()
+        self.sample_count = 0
+        self.started_at: Optional[float] = None
+        self.stopped_at: Optional[float] = None
+        self._profiles: Dict[int, cProfile.Profile] = {}
+        self._depths: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+    
+    def start(self):
+        """Start the stack sampler"""
+        self.started_at = time.perf_counter()
+        self._sampler = threading.Thread(target=self._sample_stacks, name="profiler-sampler", daemon=True)
+        self._sampler.start()
+    
+    def stop(self):
+        """Stop the stack sampler (thread scopes entered afterwards are not profiled)"""
+        self._stop.set()
+        if self._sampler:
+            self._sampler.join()
+        self.stopped_at = time.perf_counter()
+    
+    @contextmanager
+    def thread_scope(self):
+        """Profile the calling thread for the body of the with-block (re-entrant)"""
+        thread_id = threading.get_ident()
+        with self._lock:
+            profile = self._profiles.get(thread_id)
+            if profile is None:
+                profile = self._profiles[thread_id] = cProfile.Profile()
+            depth = self._depths.get(thread_id, 0)
+            self._depths[thread_id] = depth + 1
+        
+        enabled = False
+        if depth == 0 and not self._stop.is_set():
+            try:
+                profile.enable()
+                enabled = True
+            except ValueError:
+                # Python 3.12+ allows one active cProfile per process - the sampler still covers this thread
+                pass
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._depths[thread_id] -= 1
+            if enabled:
+                profile.disable()
+    
+    def wrap_steps(self, steps):
+        """
+        Profile a step-wise job (e.g. iter_generate_audio) one step at a time
+        
+        Only this job's steps are profiled, not other jobs the scheduler
+        runs while it is preempted.
+        """
+        while True:
+            with self.thread_scope():
+                try:
+                    done = next(steps)
+                except StopIteration as stop:
+                    return stop.value
+            yield done
+    
+    def _sample_stacks(self):
+        """Record the stack of every other thread until stopped"""
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.sample_interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+            self.sample_count += 1
+    
+    def save(self, base_path: Path) -> Tuple[Optional[Path], Path]:
+        """
+        Write <base>.pstats and <base>.collapsed.txt
+        
+        Args:
+            base_path: Output path without suffix
+        
+        Returns:
+            Tuple of the .pstats path (None if no stage was profiled) and the collapsed-stack path
+        """
+        base_path = Path(base_path)
+        base_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        pstats_path = None
+        profiles = [profile for profile in self._profiles.values() if profile.getstats()]
+        if profiles:
+            stats = pstats.Stats(profiles[0])
+            for profile in profiles[1:]:
+                stats.add(profile)
+            pstats_path = base_path.with_name(base_path.name + ".pstats")
+            stats.dump_stats(str(pstats_path))
+        
+        collapsed_path = base_path.with_name(base_path.name + ".collapsed.txt")
+        with open(collapsed_path, "w", encoding="utf-8") as collapsed_file:
+            for stack, count in self.samples.most_common():
+                collapsed_file.write(f"{stack} {count}\n")
+        return pstats_path, collapsed_path
+    
+    def summary(self) -> str:
+        """One-line description for status messages"""
+        seconds = (self.stopped_at or time.perf_counter()) - (self.started_at or time.perf_counter())
+        return f"{seconds:.1f}s profiled, {self.sample_count} stack samples across {len(self._profiles)} thread(s)"
@@ -0,0 +1,173 @@
+"""
+Quantization Feature
+Dynamic int8 quantization of the T3 token model for faster CPU inference
+"""
+
+import hashlib
+import os
+from pathlib import Path
+from typing import Optional
+
+from utils.config import CACHE_DIR
+
+QUANTIZED_CACHE_DIR = CACHE_DIR / "quantized"
+
+
+def module_size_bytes(module) -> int:
+    """
+    Approximate in-memory size of a module's weights
+    
+    Dynamically quantized linear layers keep their weights in packed
+    params, so those are counted from the unpacked int8 tensors.
+    
+    Args:
+        module: torch.nn.Module
+    
+    Returns:
+        int: Size in bytes
+    """
+    import torch
+    
+    total = 0
+    for value in module.state_dict().values():
+        if isinstance(value, torch.Tensor):
+            total += value.numel() * value.element_size()
+        elif isinstance(value, tuple):
+            # (weight, bias) from a packed dynamic quantized Linear
+            total += sum(t.numel() * t.element_size() for t in value if isinstance(t, torch.Tensor))
+    return total
+
+
+def _fingerprint(module) -> str:
+    """
+    Identify the fp32 weights a quantized checkpoint was made from
+    
+    Hashes the torch version, the parameter layout and a sample of every
+    Linear weight, so a model update or torch upgrade invalidates the cache.
+    """
+    import torch
+    
+    digest = hashlib.sha256(torch.__version__.encode())
+    digest.update(torch.backends.quantized.engine.encode())
+    for name, param in module.named_parameters():
+        digest.update(f"{name}:{tuple(param.shape)}".encode())
+        if param.dim() == 2:
+            sample = param.detach().flatten()[:256].to(torch.float32).cpu().numpy().tobytes()
+            digest.update(sample)
+    return digest.hexdigest()[:16]
+
+
+def _swap_linear_for_dynamic(module):
+    """
+    Replace every nn.Linear with an empty dynamic int8 Linear (in place)
+    
+    Builds the same module structure quantize_dynamic produces, so a cached
+    quantized state dict can be loaded without re-quantizing the weights.
+    """
+    import torch
+    from torch import nn
+    from torch.ao.nn.quantized import dynamic as nnqd
+    
+    for name, child in module.named_children():
+        if type(child) is nn.Linear:
+            setattr(module, name, nnqd.Linear(
+                child.in_features,
+                child.out_features,
+                bias_=child.bias is not None,
+                dtype=torch.qint8
+            ))
+        else:
+            _swap_linear_for_dynamic(child)
+
+
+def _checkpoint_matches(module, state_dict) -> bool:
+    """Check that a cached state dict holds packed int8 weights for every Linear of the module"""
+    from torch import nn
+    
+    if not isinstance(state_dict, dict):
+        return False
+    linear_names = [name for name, child in module.named_modules() if type(child) is nn.Linear]
+    return bool(linear_names) and all(f"{name}._packed_params._packed_params" in state_dict for name in linear_names)
+
+
+def quantize_token_model(model, model_name: str, cache_dir: Optional[Path] = None) -> bool:
+    """
+    Apply dynamic int8 quantization to the linear layers of model.t3 (in place)
+    
+    The first run quantizes the fp32 weights and saves the result under
+    ~/.cache/chatterbox_tts/quantized; later runs load that checkpoint.
+    Only the token model is quantized - the S3Gen vocoder and the voice
+    encoder stay in fp32.
+    
+    A cached checkpoint is read and checked before any layer is swapped;
+    an unreadable or mismatching one is deleted and the fp32 weights are
+    quantized again.
+    
+    Args:
+        model: Loaded Chatterbox model on the CPU
+        model_name: Cache key prefix (e.g. "english", "multilingual")
+        cache_dir: Optional override for the quantized checkpoint folder
+    
+    Returns:
+        bool: True if the model is now quantized. On False the token model
+            may be half converted - reload the model before using it.
+    """
+    import time
+    import torch
+    from torch import nn
+    
+    t3 = getattr(model, "t3", None)
+    if t3 is None:
+        print(f"⚠️ {model_name} model has no token model to quantize")
+        return False
+    
+    cache_dir = Path(cache_dir or QUANTIZED_CACHE_DIR)
+    start_time = time.time()
+    size_before = module_size_bytes(t3)
+    
+    cache_path = None
+    state_dict = None
+    try:
+        cache_path = cache_dir / f"{model_name}_t3_int8_{_fingerprint(t3)}.pt"
+        
+        if cache_path.exists():
+            try:
+                # Our own cache file - packed int8 params need full unpickling
+                state_dict = torch.load(cache_path, map_location="cpu", weights_only=False)
+            except Exception as e:
+                print(f"⚠️ Could not read quantized checkpoint {cache_path.name}: {e}")
+            if state_dict is not None and not _checkpoint_matches(t3, state_dict):
+                print(f"⚠️ Quantized checkpoint {cache_path.name} does not match the {model_name} token model")
+                state_dict = None
+            if state_dict is None:
+                cache_path.unlink(missing_ok=True)
+        
+        if state_dict is not None:
+            print(f"📦 Loading quantized {model_name} token model: {cache_path.name}")
+            _swap_linear_for_dynamic(t3)
+            t3.load_state_dict(state_dict)
+        else:
+            print(f"⚙️ Quantizing {model_name} token model to int8 (one-time, cached afterwards)...")
+            torch.ao.quantization.quantize_dynamic(t3, {nn.Linear}, dtype=torch.qint8, inplace=True)
+            
+            cache_dir.mkdir(parents=True, exist_ok=True)
+            # Remove checkpoints of older weights for this model
+            for stale in cache_dir.glob(f"{model_name}_t3_int8_*.pt"):
+                stale.unlink()
+            temp_path = cache_path.with_suffix(".tmp")
+            torch.save(t3.state_dict(), temp_path)
+            os.replace(temp_path, cache_path)
+            print(f"💾 Quantized checkpoint saved: {cache_path}")
+    except Exception as e:
+        print(f"❌ Quantization failed for {model_name} model: {e}")
+        if state_dict is not None:
+            # Do not retry the same checkpoint on the next load
+            cache_path.unlink(missing_ok=True)
+        return False
+    
+    size_after = module_size_bytes(t3)
+    print(
+        f"✅ {model_name.capitalize()} token model quantized in {time.time() - start_time:.1f}s "
+        f"({size_before / 1024**2:.0f} MB → {size_after / 1024**2:.0f} MB)"
+    )
+    return True
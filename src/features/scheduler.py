@@ -0,0 +1,325 @@
+"""
+Generation Scheduler Feature
+Runs generation jobs one at a time on a background worker thread
+"""
+
+import heapq
+import inspect
+import itertools
+import threading
+import time
+import traceback
+from concurrent.futures import Future
+from typing import Optional, Callable, List, Any
+
+from utils.config import PRIORITY_INTERACTIVE, PRIORITY_NORMAL, PRIORITY_BACKGROUND
+from features.tracing import tracer
+from features.metrics_registry import metrics_registry
+
+
+PRIORITY_NAMES = {
+    PRIORITY_INTERACTIVE: "interactive",
+    PRIORITY_NORMAL: "normal",
+    PRIORITY_BACKGROUND: "background",
+}
+
+
+class GenerationJob:
+    """
+    A single unit of work for the scheduler (usually one generate_audio call)
+    
+    If run() returns a generator, the scheduler advances it one step at a
+    time (one step per text chunk). Between steps a higher-priority job may
+    preempt it; the preempted job resumes from the same chunk afterwards.
+    
+    If the result is a Future (work handed off to a post-processing stage),
+    the job stays "finishing" until it resolves while the worker moves on.
+    """
+    
+    def __init__(
+        self,
+        label: str,
+        run: Callable[[], Any],
+        on_complete: Optional[Callable] = None,
+        priority: int = PRIORITY_NORMAL,
+        metrics=None
+    ):
+        """
+        Args:
+            label: Human readable label (shown in status messages)
+            run: Callable doing the work, its return value (or the generator's
+                return value) becomes job.result
+            on_complete: Optional callback(job) fired on the worker thread when done
+            priority: PRIORITY_INTERACTIVE, PRIORITY_NORMAL or PRIORITY_BACKGROUND
+            metrics: Optional GenerationMetrics - time spent waiting in the
+                queue (or preempted) is added to its "queue_wait" stage
+        """
+        self.label = label
+        self.run = run
+        self.on_complete = on_complete
+        self.priority = priority
+        self.status = "queued"  # "queued", "running", "preempted", "finishing", "done", "failed", "cancelled"
+        self.result = None
+        self.error: Optional[Exception] = None
+        self.batch: Optional["GenerationBatch"] = None
+        self.steps = None  # Generator while the job is in progress
+        self.sequence = None  # Submission order within the priority class
+        self.cancelled = False
+        self.metrics = metrics
+        self.queued_at: Optional[float] = None  # perf_counter() when last (re)queued
+    
+    @property
+    def is_cancelled(self) -> bool:
+        return self.cancelled or bool(self.batch and self.batch.cancelled)
+    
+    def cancel(self):
+        """Cancel the job (takes effect at the next chunk boundary)"""
+        self.cancelled = True
+
+
+class GenerationBatch:
+    """
+    A group of jobs scheduled together (e.g. a preset sweep)
+    """
+    
+    def __init__(
+        self,
+        label: str,
+        jobs: List[GenerationJob],
+        on_job_complete: Optional[Callable] = None,
+        on_batch_complete: Optional[Callable] = None
+    ):
+        """
+        Args:
+            label: Human readable label for the batch
+            jobs: Jobs in render order
+            on_job_complete: Optional callback(batch, job) after each job
+            on_batch_complete: Optional callback(batch) after the last job
+        """
+        self.label = label
+        self.jobs = jobs
+        self.on_job_complete = on_job_complete
+        self.on_batch_complete = on_batch_complete
+        self.cancelled = False
+        self.completion_fired = False  # on_batch_complete runs once (set under the scheduler lock)
+        
+        for job in jobs:
+            job.batch = self
+    
+    @property
+    def finished_count(self) -> int:
+        return sum(1 for job in self.jobs if job.status in ("done", "failed", "cancelled"))
+    
+    @property
+    def is_finished(self) -> bool:
+        return self.finished_count == len(self.jobs)
+    
+    def cancel(self):
+        """Cancel all jobs of this batch that have not finished yet"""
+        self.cancelled = True
+
+
+class GenerationScheduler:
+    """
+    Serializes access to the TTS models
+    
+    Models hold per-voice conditioning state, so only one job may run at a
+    time. Jobs run highest priority first (FIFO within a priority class) on
+    a single daemon thread. Step-wise jobs are checked for preemption at
+    every chunk boundary. Callbacks run on the worker thread, or on the
+    thread that resolves a job's Future result (the post-processor), so
+    they may run concurrently - UI code must marshal back with root.after().
+    """
+    
+    def __init__(self):
+        self._heap = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._batch_lock = threading.Lock()
+        self._worker: Optional[threading.Thread] = None
+        self.current_job: Optional[GenerationJob] = None
+    
+    def submit(self, job: GenerationJob) -> GenerationJob:
+        """
+        Queue a single job
+        
+        Args:
+            job: Job to run
+        
+        Returns:
+            GenerationJob: The submitted job
+        """
+        with self._condition:
+            self._push(job, next(self._sequence))
+            self._ensure_worker()
+            self._condition.notify()
+        return job
+    
+    def submit_batch(self, batch: GenerationBatch) -> GenerationBatch:
+        """
+        Queue all jobs of a batch back to back
+        
+        Args:
+            batch: Batch to run
+        
+        Returns:
+            GenerationBatch: The submitted batch
+        """
+        with self._condition:
+            for job in batch.jobs:
+                self._push(job, next(self._sequence))
+            self._ensure_worker()
+            self._condition.notify()
+        return batch
+    
+    @property
+    def pending_count(self) -> int:
+        """Number of jobs waiting to run (including preempted ones)"""
+        with self._condition:
+            return len(self._heap)
+    
+    def _push(self, job: GenerationJob, sequence: int):
+        """Add a job to the priority heap (caller holds the lock)"""
+        job.sequence = sequence
+        job.queued_at = time.perf_counter()
+        heapq.heappush(self._heap, (job.priority, sequence, job))
+    
+    def _ensure_worker(self):
+        """Start the worker thread if it is not running (caller holds the lock)"""
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run_worker, daemon=True)
+            self._worker.start()
+    
+    def _should_preempt(self, job: GenerationJob) -> bool:
+        """Check whether a strictly higher priority job is waiting"""
+        with self._condition:
+            return bool(self._heap) and self._heap[0][0] < job.priority
+    
+    def _run_worker(self):
+        """Worker loop - runs jobs in priority order"""
+        while True:
+            with self._condition:
+                while not self._heap:
+                    self._condition.wait()
+                _, _, job = heapq.heappop(self._heap)
+            
+            popped_at = time.perf_counter()
+            tracer.complete("queue wait", "scheduler", job.queued_at, popped_at, job=job.label)
+            if job.metrics is not None:
+                job.metrics.add("queue_wait", popped_at - job.queued_at)
+            
+            if job.is_cancelled:
+                self._finish(job, "cancelled")
+                continue
+            
+            if job.status == "preempted":
+                print(f"▶️ Resuming {PRIORITY_NAMES.get(job.priority, job.priority)} job '{job.label}'")
+            
+            self.current_job = job
+            job.status = "running"
+            started_at = time.perf_counter()
+            try:
+                if job.steps is None:
+                    result = job.run()
+                    if not inspect.isgenerator(result):
+                        self._complete(job, result)
+                        continue
+                    job.steps = result
+                
+                preempted = False
+                while True:
+                    try:
+                        next(job.steps)
+                    except StopIteration as stop:
+                        self._complete(job, stop.value)
+                        break
+                    
+                    # Chunk boundary: honour cancellation and preemption
+                    if job.is_cancelled:
+                        job.steps.close()
+                        self._finish(job, "cancelled")
+                        break
+                    
+                    if self._should_preempt(job):
+                        preempted = True
+                        break
+                
+                if preempted:
+                    print(f"⏸️ Preempting {PRIORITY_NAMES.get(job.priority, job.priority)} job '{job.label}'")
+                    job.status = "preempted"
+                    with self._condition:
+                        # Keep the original sequence so it resumes before later jobs of its class
+                        self._push(job, job.sequence)
+            except Exception as e:
+                job.error = e
+                print(f"❌ Job '{job.label}' failed: {e}")
+                traceback.print_exc()
+                self._finish(job, "failed")
+            finally:
+                self.current_job = None
+                # One span per run slice (a preempted job gets one per resume)
+                tracer.complete(
+                    job.label, "job", started_at, time.perf_counter(),
+                    priority=PRIORITY_NAMES.get(job.priority, job.priority), status=job.status
+                )
+    
+    def _complete(self, job: GenerationJob, result: Any):
+        """
+        Record a job's result, deferring completion if it is still in flight
+        
+        A Future result finishes the job from the thread that resolves it,
+        so the worker can start the next job right away.
+        """
+        if not isinstance(result, Future):
+            job.result = result
+            self._finish(job, "done")
+            return
+        
+        job.status = "finishing"
+        job.steps = None
+        
+        def resolved(future: Future):
+            try:
+                job.result = future.result()
+            except Exception as e:
+                job.error = e
+                print(f"❌ Job '{job.label}' failed: {e}")
+                self._finish(job, "failed")
+                return
+            self._finish(job, "done")
+        
+        result.add_done_callback(resolved)
+    
+    def _finish(self, job: GenerationJob, status: str):
+        """Mark a job finished and fire its callbacks"""
+        job.status = status
+        job.steps = None
+        metrics_registry.counter("chatterbox_jobs", "Scheduler jobs finished").inc(status=status)
+        
+        try:
+            if job.on_complete:
+                job.on_complete(job)
+            
+            batch = job.batch
+            if batch:
+                if batch.on_job_complete:
+                    batch.on_job_complete(batch, job)
+                # Jobs finish on two threads - let exactly one of them complete the batch
+                with self._batch_lock:
+                    fire = batch.is_finished and not batch.completion_fired
+                    if fire:
+                        batch.completion_fired = True
+                if fire and batch.on_batch_complete:
+                    batch.on_batch_complete(batch)
+        except Exception as e:
+            print(f"⚠️ Scheduler callback error: {e}")
+            traceback.print_exc()
+
+
+# Global instance
+generation_scheduler = GenerationScheduler()
+
+metrics_registry.gauge(
+    "chatterbox_queue_depth", "Jobs waiting or running on the model stage",
+    lambda: generation_scheduler.pending_count + (1 if generation_scheduler.current_job else 0)
+)
@@ -0,0 +1,141 @@
+"""
+Session Recorder Feature
+Optionally records every generation request (settings and timings) to a
+JSONL file, so a real session can be replayed later as a benchmark
+workload (see benchmarks/replay.py)
+
+The text itself is only stored with --record-text; otherwise the replay
+substitutes filler text of the same length.
+"""
+
+import json
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+
+class SessionRecorder:
+    """
+    Appends one JSON line per finished generation
+    
+    Disabled by default; request() then returns None and nothing is kept.
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.path: Optional[Path] = None
+        self.include_text = False
+        self.started_at: Optional[float] = None
+        self._lock = threading.Lock()
+    
+    def start(self, path: Path, include_text: bool = False):
+        """
+        Start recording (appends to an existing file)
+        
+        Args:
+            path: Session JSONL file
+            include_text: Store the generated text too (not just its length)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.include_text = include_text
+        self.started_at = time.time()
+        self.enabled = True
+    
+    def stop(self):
+        """Stop recording"""
+        self.enabled = False
+    
+    def request(
+        self,
+        text: str,
+        voice_config: Dict[str, Any],
+        expression_config: Dict[str, Any],
+        language_code: str,
+        quality: str,
+        seed: Optional[int]
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Describe a generation request as it starts
+        
+        Returns:
+            Optional[dict]: Record to pass to record() once the generation
+            finished, or None when not recording
+        """
+        if not self.enabled:
+            return None
+        
+        voice_file = voice_config.get("voice_file")
+        custom_path = voice_config.get("custom_path")
+        record = {
+            "at": datetime.now().isoformat(timespec="seconds"),
+            "offset_seconds": round(time.time() - self.started_at, 3),
+            "characters": len(text),
+            "language": language_code,
+            "quality": quality,
+            "seed": seed,
+            "voice": {
+                "mode": voice_config.get("mode"),
+                "voice": voice_config.get("voice"),
+                "voice_file": str(voice_file) if voice_file else None,
+                "custom_path": str(custom_path) if custom_path else None,
+            },
+            "expression": dict(expression_config),
+        }
+        if self.include_text:
+            record["text"] = text
+        return record
+    
+    def record(self, request: Dict[str, Any], metrics):
+        """
+        Add the outcome to a request from request() and append it
+        
+        Args:
+            request: Record from request()
+            metrics: The generation's GenerationMetrics
+        """
+        if not self.enabled:
+            return
+        
+        request = dict(
+            request,
+            status=metrics.status,
+            total_seconds=round(metrics.total_seconds, 3),
+            audio_seconds=None if metrics.audio_seconds is None else round(metrics.audio_seconds, 3),
+            rtf=None if metrics.rtf is None else round(metrics.rtf, 4),
+            stages={stage: round(seconds, 4) for stage, seconds in dict(metrics.stages).items()},
+        )
+        line = json.dumps(request, ensure_ascii=False, default=str) + "\n"
+        
+        try:
+            with self._lock:
+                with open(self.path, "a", encoding="utf-8") as session_file:
+                    session_file.write(line)
+        except OSError as e:
+            print(f"⚠️ Could not record session request: {e}")
+
+
+def read_session(path: Path) -> List[Dict[str, Any]]:
+    """
+    Read a recorded session (malformed lines are skipped)
+    
+    Args:
+        path: Session JSONL file
+    
+    Returns:
+        list: Records in recording order
+    """
+    records = []
+    with open(path, "r", encoding="utf-8") as session_file:
+        for line in session_file:
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                continue
+    return records
+
+
+# Global instance
+session_recorder = SessionRecorder()
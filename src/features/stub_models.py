@@ -0,0 +1,118 @@
+"""
+Stub Models Feature
+Drop-in stand-ins for ChatterboxTTS / ChatterboxMultilingualTTS that return
+deterministic synthetic audio, so everything around the model (progress,
+pitch shift, saving, export, playback) can be run and timed without the
+model weights
+"""
+
+import os
+import time
+import zlib
+from typing import Optional
+
+STUB_SAMPLE_RATE = 24000
+
+# Read from the environment so a synthesis worker process inherits the settings
+STUB_RTF_ENV = "CHATTERBOX_STUB_RTF"
+STUB_DELAY_ENV = "CHATTERBOX_STUB_DELAY"
+
+# Roughly the speaking rate of the real models (~15 characters per second)
+SECONDS_PER_CHARACTER = 0.065
+
+
+def configure_stub_models(rtf: Optional[float] = None, fixed_delay: Optional[float] = None):
+    """
+    Set the simulated synthesis cost of the stub models
+    
+    Args:
+        rtf: Seconds of simulated compute per second of generated audio
+        fixed_delay: Extra seconds per generate call (e.g. reference encoding)
+    """
+    if rtf is not None:
+        os.environ[STUB_RTF_ENV] = str(rtf)
+    if fixed_delay is not None:
+        os.environ[STUB_DELAY_ENV] = str(fixed_delay)
+
+
+def stub_audio_seconds(text: str) -> float:
+    """Duration of the audio a stub model produces for a text"""
+    return max(0.5, len(text.strip()) * SECONDS_PER_CHARACTER)
+
+
+class StubConditionals:
+    """Stand-in for the model's Conditionals (remembers the reference file)"""
+    
+    def __init__(self, audio_prompt_path: Optional[str] = None, exaggeration: float = 0.5):
+        self.audio_prompt_path = audio_prompt_path
+        self.exaggeration = exaggeration
+
+
+class StubChatterboxTTS:
+    """
+    Fake ChatterboxTTS: same constructors and generate() signature
+    
+    The waveform is a few sines with a syllable-like envelope, seeded by
+    the text and voice so the same request always yields the same audio.
+    generate() sleeps for the configured simulated compute time.
+    """
+    
+    sr = STUB_SAMPLE_RATE
+    
+    def __init__(self, device: str = "cpu"):
+        self.device = device
+        self.conds = StubConditionals()
+    
+    @classmethod
+    def from_pretrained(cls, device: str = "cpu"):
+        return cls(device)
+    
+    @classmethod
+    def from_local(cls, ckpt_dir, device: str = "cpu"):
+        return cls(device)
+    
+    def prepare_conditionals(self, wav_fpath: str, exaggeration: float = 0.5):
+        """Remember the reference file (a real model encodes it here)"""
+        if not os.path.exists(wav_fpath):
+            raise FileNotFoundError(wav_fpath)
+        self.conds = StubConditionals(str(wav_fpath), exaggeration)
+    
+    def generate(
+        self,
+        text: str,
+        repetition_penalty: float = 1.2,
+        min_p: float = 0.05,
+        top_p: float = 1.0,
+        audio_prompt_path: Optional[str] = None,
+        exaggeration: float = 0.5,
+        cfg_weight: float = 0.5,
+        temperature: float = 0.8,
+        language_id: Optional[str] = None
+    ):
+        """
+        Synthesize deterministic placeholder audio
+        
+        Returns:
+            Waveform tensor of shape (1, samples)
+        """
+        import torch
+        
+        if audio_prompt_path:
+            self.prepare_conditionals(audio_prompt_path, exaggeration)
+        
+        seconds = stub_audio_seconds(text)
+        time.sleep(
+            float(os.environ.get(STUB_DELAY_ENV, 0))
+            + float(os.environ.get(STUB_RTF_ENV, 0)) * seconds
+        )
+        
+        key = f"{language_id or 'en'}|{self.conds.audio_prompt_path}|{text}"
+        base = 110 + zlib.crc32(key.encode("utf-8")) % 110  # 110-220 Hz "voice"
+        t = torch.arange(int(seconds * self.sr), dtype=torch.float32) / self.sr
+        wav = sum(torch.sin(2 * torch.pi * base * harmonic * t) / harmonic for harmonic in (1, 2, 3))
+        envelope = 0.5 - 0.5 * torch.cos(2 * torch.pi * 4.0 * t)  # ~4 syllables per second
+        return (0.2 * wav * envelope).unsqueeze(0)
+
+
+class StubChatterboxMultilingualTTS(StubChatterboxTTS):
+    """Fake ChatterboxMultilingualTTS (language_id is part of the seed)"""
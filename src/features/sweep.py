@@ -0,0 +1,181 @@
+"""
+Expression Sweep Feature
+Render one line across several expression presets or a parameter grid
+"""
+
+import itertools
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Callable
+
+from features.generate import tts_generator
+from features.scheduler import GenerationJob, GenerationBatch, generation_scheduler
+from features.metrics import GenerationMetrics
+from utils.config import PRIORITY_NORMAL
+from utils.file_utils import generate_audio_filename
+
+
+def build_preset_variants(presets: Dict[str, Dict[str, Any]], names: List[str]) -> List[Dict[str, Any]]:
+    """
+    Build sweep variants from named expression presets
+    
+    Args:
+        presets: Preset table (name -> energy/speed/emphasis/pitch)
+        names: Preset names to include, in render order
+    
+    Returns:
+        List[Dict]: Variants with 'label' and 'expression_config'
+    """
+    variants = []
+    for name in names:
+        values = presets.get(name)
+        if not values:
+            continue
+        variants.append({
+            "label": name,
+            "expression_config": {"mode": "preset", "preset": name, **values}
+        })
+    return variants
+
+
+def build_grid_variants(
+    energy: List[float],
+    speed: List[float],
+    emphasis: List[float],
+    pitch: List[int]
+) -> List[Dict[str, Any]]:
+    """
+    Build sweep variants from the cartesian product of parameter values
+    
+    Args:
+        energy: Energy (exaggeration) values
+        speed: Speed (cfg_weight) values
+        emphasis: Emphasis (temperature) values
+        pitch: Pitch shift values in semitones
+    
+    Returns:
+        List[Dict]: Variants with 'label' and 'expression_config'
+    """
+    variants = []
+    for e, s, t, p in itertools.product(energy, speed, emphasis, pitch):
+        variants.append({
+            "label": f"energy {e:.2f}, speed {s:.2f}, emphasis {t:.2f}, pitch {int(p):+d}",
+            "expression_config": {
+                "mode": "parameters",
+                "energy": e,
+                "speed": s,
+                "emphasis": t,
+                "pitch": int(p)
+            }
+        })
+    return variants
+
+
+def _label_to_filename(index: int, label: str) -> str:
+    """Turn a variant label into a safe, sortable file name"""
+    label = label.replace("+", "up").replace("-", "down")
+    clean = "".join(c if c.isalnum() else "_" for c in label.encode("ascii", "ignore").decode())
+    clean = "_".join(part for part in clean.split("_") if part).lower()
+    return f"{index:02d}_{clean or 'take'}.wav"
+
+
+def schedule_sweep(
+    text: str,
+    voice_config: Dict[str, Any],
+    variants: List[Dict[str, Any]],
+    output_folder: Path,
+    language_code: str = "en",
+    on_progress: Optional[Callable] = None,
+    on_complete: Optional[Callable] = None,
+    priority: int = PRIORITY_NORMAL,
+    generator=None
+) -> GenerationBatch:
+    """
+    Schedule a sweep render as one batch
+    
+    All takes share the same text and reference voice, so the voice
+    conditioning is encoded once and reused for every take.
+    
+    Args:
+        text: Line to render
+        voice_config: Voice configuration dict (same as generate_audio)
+        variants: Variants from build_preset_variants/build_grid_variants
+        output_folder: Parent folder - a sweep_* subfolder is created in it
+        language_code: Language code
+        on_progress: Optional callback(done, total, label) after each take
+        on_complete: Optional callback(sweep_folder, results) when the batch ends,
+            results is a list of (label, Optional[Path])
+        priority: Scheduler priority class for every take
+        generator: Object with iter_generate_audio (default: the in-process
+            tts_generator, or a DaemonClient)
+    
+    Returns:
+        GenerationBatch: The scheduled batch
+    """
+    stem = generate_audio_filename(text).rsplit(".", 1)[0]
+    sweep_folder = Path(output_folder) / f"sweep_{stem}"
+    sweep_folder.mkdir(parents=True, exist_ok=True)
+    
+    jobs = []
+    for index, variant in enumerate(variants, start=1):
+        output_path = sweep_folder / _label_to_filename(index, variant["label"])
+        
+        metrics = GenerationMetrics(variant["label"], kind="sweep")
+        
+        def run(variant=variant, output_path=output_path, metrics=metrics):
+            return (generator or tts_generator).iter_generate_audio(
+                text,
+                voice_config,
+                variant["expression_config"],
+                output_path,
+                language_code,
+                metrics=metrics
+            )
+        
+        jobs.append(GenerationJob(variant["label"], run, priority=priority, metrics=metrics))
+    
+    def job_done(batch, job):
+        if on_progress:
+            on_progress(batch.finished_count, len(batch.jobs), job.label)
+    
+    def batch_done(batch):
+        results = [(job.label, job.result if job.status == "done" else None) for job in batch.jobs]
+        _write_manifest(sweep_folder, text, language_code, variants, results)
+        print(f"✅ Sweep complete: {sum(1 for _, path in results if path)}/{len(results)} takes in {sweep_folder}")
+        if on_complete:
+            on_complete(sweep_folder, results)
+    
+    batch = GenerationBatch(f"Sweep ({len(jobs)} takes)", jobs, job_done, batch_done)
+    print(f"🎛️ Scheduling sweep with {len(jobs)} takes → {sweep_folder}")
+    return generation_scheduler.submit_batch(batch)
+
+
+def _write_manifest(
+    sweep_folder: Path,
+    text: str,
+    language_code: str,
+    variants: List[Dict[str, Any]],
+    results: List[Any]
+):
+    """Write sweep.json mapping each take file to its label and parameters"""
+    takes = []
+    for variant, (label, path) in zip(variants, results):
+        takes.append({
+            "label": label,
+            "file": path.name if path else None,
+            "expression": variant["expression_config"]
+        })
+    
+    manifest = {
+        "created": datetime.now().isoformat(),
+        "text": text,
+        "language_code": language_code,
+        "takes": takes
+    }
+    
+    try:
+        with open(sweep_folder / "sweep.json", "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+    except Exception as e:
+        print(f"⚠️ Could not write sweep manifest: {e}")
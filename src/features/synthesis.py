@@ -0,0 +1,208 @@
+"""
+Staged Synthesis Feature
+Drives the two Chatterbox model stages (T3 token generation and S3Gen
+vocoding) separately so their settings can be tuned per generation
+"""
+
+from contextlib import contextmanager
+from typing import Optional
+
+# Speech token vocabulary size of the S3 tokenizer (tokens >= this are special)
+SPEECH_VOCAB_SIZE = 6561
+
+
+def supports_staged_synthesis(model) -> bool:
+    """
+    Check that a model exposes the internals needed for staged synthesis
+    
+    Args:
+        model: ChatterboxTTS or ChatterboxMultilingualTTS instance
+    
+    Returns:
+        bool: True if generate_speech_tokens/vocode_speech_tokens can be used
+    """
+    required = ("t3", "s3gen", "tokenizer", "conds", "watermarker", "sr", "device")
+    return all(hasattr(model, attr) for attr in required)
+
+
+def _update_exaggeration(model, exaggeration: float):
+    """Update the emotion conditioning on the model (same as model.generate does)"""
+    import torch
+    from chatterbox.models.t3.modules.cond_enc import T3Cond
+    
+    cond = model.conds.t3
+    if float(exaggeration) != float(cond.emotion_adv[0, 0, 0].item()):
+        model.conds.t3 = T3Cond(
+            speaker_emb=cond.speaker_emb,
+            cond_prompt_speech_tokens=cond.cond_prompt_speech_tokens,
+            emotion_adv=exaggeration * torch.ones(1, 1, 1),
+        ).to(device=model.device)
+
+
+def generate_speech_tokens(
+    model,
+    text: str,
+    language_code: str = "en",
+    exaggeration: float = 0.5,
+    cfg_weight: float = 0.5,
+    temperature: float = 0.8,
+    max_new_tokens: int = 1000
+):
+    """
+    Stage 1: turn text into speech tokens with the T3 model
+    
+    The model's conditionals must already be prepared (see
+    TTSGenerator._prepare_voice_conditioning).
+    
+    Args:
+        model: Loaded Chatterbox model
+        text: Text chunk to synthesize
+        language_code: Language code ("en" uses the English model conventions)
+        exaggeration: Emotion exaggeration
+        cfg_weight: Classifier-free guidance weight
+        temperature: Sampling temperature
+        max_new_tokens: Token budget (25 tokens ~ 1 second of speech)
+    
+    Returns:
+        1-D tensor of valid speech tokens on the model device
+    """
+    import torch
+    import torch.nn.functional as F
+    from chatterbox.models.s3tokenizer import drop_invalid_tokens
+    
+    _update_exaggeration(model, exaggeration)
+    
+    if language_code == "en":
+        from chatterbox.tts import punc_norm
+        text_tokens = model.tokenizer.text_to_tokens(punc_norm(text)).to(model.device)
+        repetition_penalty = 1.2
+    else:
+        from chatterbox.mtl_tts import punc_norm
+        text_tokens = model.tokenizer.text_to_tokens(
+            punc_norm(text), language_id=language_code.lower()
+        ).to(model.device)
+        repetition_penalty = 2.0
+    
+    # Two sequences for classifier-free guidance (the multilingual model always uses CFG)
+    if cfg_weight > 0.0 or language_code != "en":
+        text_tokens = torch.cat([text_tokens, text_tokens], dim=0)
+    
+    sot = model.t3.hp.start_text_token
+    eot = model.t3.hp.stop_text_token
+    text_tokens = F.pad(text_tokens, (1, 0), value=sot)
+    text_tokens = F.pad(text_tokens, (0, 1), value=eot)
+    
+    with torch.inference_mode():
+        speech_tokens = model.t3.inference(
+            t3_cond=model.conds.t3,
+            text_tokens=text_tokens,
+            max_new_tokens=max_new_tokens,
+            temperature=temperature,
+            cfg_weight=cfg_weight,
+            repetition_penalty=repetition_penalty,
+            min_p=0.05,
+            top_p=1.0,
+        )
+        # Keep only the conditional batch
+        speech_tokens = drop_invalid_tokens(speech_tokens[0])
+        speech_tokens = speech_tokens[speech_tokens < SPEECH_VOCAB_SIZE]
+    
+    return speech_tokens.to(model.device)
+
+
+@contextmanager
+def seeded_sampling(seed: Optional[int]):
+    """
+    Make T3 token sampling draw from a private, seeded random generator
+    
+    The vocoder draws noise from the global torch RNG. When the two stages
+    run on different threads, sharing that RNG would make the output depend
+    on timing, so torch.multinomial gets its own generator here instead.
+    
+    Args:
+        seed: Sampling seed, or None to keep using the global RNG
+    """
+    if seed is None:
+        yield
+        return
+    
+    import torch
+    
+    original_multinomial = torch.multinomial
+    generators = {}
+    
+    def multinomial(input, *args, **kwargs):
+        if kwargs.get("generator") is None:
+            generator = generators.get(input.device)
+            if generator is None:
+                generator = torch.Generator(device=input.device)
+                generator.manual_seed(seed)
+                generators[input.device] = generator
+            kwargs["generator"] = generator
+        return original_multinomial(input, *args, **kwargs)
+    
+    torch.multinomial = multinomial
+    try:
+        yield
+    finally:
+        torch.multinomial = original_multinomial
+
+
+@contextmanager
+def flow_steps_override(model, flow_steps: Optional[int]):
+    """
+    Temporarily change the number of flow-matching (ODE) steps in S3Gen
+    
+    The decoder is called with a fixed n_timesteps=10; fewer steps trade
+    some audio detail for a proportionally faster vocoder stage.
+    
+    Args:
+        model: Loaded Chatterbox model
+        flow_steps: Number of steps, or None to keep the model default
+    """
+    decoder = getattr(getattr(getattr(model, "s3gen", None), "flow", None), "decoder", None)
+    if not flow_steps or decoder is None:
+        yield
+        return
+    
+    original_forward = decoder.forward
+    
+    def forward(*args, **kwargs):
+        if len(args) >= 3:
+            args = args[:2] + (flow_steps,) + args[3:]
+        else:
+            kwargs["n_timesteps"] = flow_steps
+        return original_forward(*args, **kwargs)
+    
+    decoder.forward = forward
+    try:
+        yield
+    finally:
+        del decoder.forward
+
+
+def vocode_speech_tokens(model, speech_tokens, flow_steps: Optional[int] = None, ref_dict=None):
+    """
+    Stage 2: turn speech tokens into a watermarked waveform with S3Gen
+    
+    Args:
+        model: Loaded Chatterbox model
+        speech_tokens: Tokens from generate_speech_tokens
+        flow_steps: Optional flow-matching step count override
+        ref_dict: Vocoder voice conditioning (default: model.conds.gen). Pass
+            the one captured at token time when vocoding on another thread.
+    
+    Returns:
+        Waveform tensor of shape (1, samples) on the CPU
+    """
+    import torch
+    
+    with torch.inference_mode(), flow_steps_override(model, flow_steps):
+        wav, _ = model.s3gen.inference(
+            speech_tokens=speech_tokens,
+            ref_dict=ref_dict if ref_dict is not None else model.conds.gen,
+        )
+        wav = wav.squeeze(0).detach().cpu().numpy()
+        watermarked_wav = model.watermarker.apply_watermark(wav, sample_rate=model.sr)
+    
+    return torch.from_numpy(watermarked_wav).unsqueeze(0)
@@ -0,0 +1,246 @@
+"""
+Synthesis Worker Feature
+Runs the models in a child process so synthesis never holds the UI's GIL
+
+Commands go over a multiprocessing Pipe. Waveforms come back through
+multiprocessing.shared_memory: the worker writes the samples into a
+segment and sends only its name and shape, the parent copies them out
+once - no pickling of audio data. If the worker dies, it is restarted
+and the chunk is retried once.
+"""
+
+import multiprocessing
+import threading
+import time
+import traceback
+from multiprocessing import shared_memory
+from typing import Dict, Any
+
+from features.tracing import tracer
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach to a segment created by the worker without taking over its cleanup
+    
+    The worker creates, unlinks and so owns the tracking of every segment.
+    Python 3.13+ can attach untracked; older versions register the name with
+    the resource tracker the spawned child shares with us, where it is
+    already registered, so attaching plainly changes nothing there.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _worker_main(conn, init_options: Dict[str, Any]):
+    """
+    Child process entry point
+    
+    Loads its own TTSGenerator, then serves "synthesize", "calibrate" and
+    "shutdown" commands until the pipe closes. The segment of the previous
+    result stays alive until the next command arrives (Windows frees a
+    segment as soon as its last handle closes).
+    """
+    import numpy as np
+    from features.generate import TTSGenerator
+    from features.metrics import GenerationMetrics
+    
+    generator = TTSGenerator()
+    if not generator.initialize(**init_options):
+        conn.send({"type": "ready", "ok": False})
+        return
+    
+    conn.send({
+        "type": "ready",
+        "ok": True,
+        "sample_rate": generator.sample_rate,
+        "device_name": generator.device_name,
+        "resident_models": generator.residency.resident_names,
+    })
+    
+    pending_segment = None
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            break
+        
+        # The parent has copied the previous result by now
+        if pending_segment is not None:
+            pending_segment.close()
+            pending_segment.unlink()
+            pending_segment = None
+        
+        command = message.get("cmd")
+        if command == "shutdown":
+            break
+        
+        try:
+            if command == "synthesize":
+                tracer.enabled = message.get("trace", False)
+                metrics = GenerationMetrics()
+                wav = generator.synthesize_model_chunk(message["model_name"], metrics=metrics, **message["kwargs"])
+                samples = wav.detach().cpu().contiguous().numpy().astype(np.float32, copy=False)
+                
+                pending_segment = shared_memory.SharedMemory(create=True, size=max(samples.nbytes, 1))
+                np.ndarray(samples.shape, dtype=np.float32, buffer=pending_segment.buf)[...] = samples
+                conn.send({
+                    "type": "audio",
+                    "segment": pending_segment.name,
+                    "shape": samples.shape,
+                    "stages": metrics.stages,
+                    "trace_events": tracer.drain() if tracer.enabled else None,
+                })
+            elif command == "calibrate":
+                from features.thread_tuner import calibrate_threads
+                conn.send({"type": "result", "value": calibrate_threads(generator)})
+            else:
+                conn.send({"type": "error", "error": f"Unknown command: {command}"})
+        except Exception as e:
+            traceback.print_exc()
+            conn.send({"type": "error", "error": f"{type(e).__name__}: {e}"})
+    
+    if pending_segment is not None:
+        pending_segment.close()
+        pending_segment.unlink()
+
+
+class SynthesisWorker:
+    """
+    Parent side handle of the synthesis child process
+    """
+    
+    def __init__(self, init_options: Dict[str, Any]):
+        """
+        Args:
+            init_options: Keyword arguments for TTSGenerator.initialize in the child
+        """
+        self.init_options = init_options
+        self.process = None
+        self.conn = None
+        self.sample_rate = None
+        self.device_name = None
+        self.resident_models = []
+        self.restarts = 0
+        self._lock = threading.Lock()
+    
+    @property
+    def is_alive(self) -> bool:
+        return self.process is not None and self.process.is_alive()
+    
+    def start(self):
+        """
+        Start the child process and wait until its models are loaded
+        
+        Raises:
+            RuntimeError: If the child fails to load the models
+        """
+        # spawn: a forked child would inherit Tk and torch thread state
+        context = multiprocessing.get_context("spawn")
+        parent_conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, self.init_options),
+            name="chatterbox-synthesis",
+            daemon=True
+        )
+        
+        start_time = time.time()
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+        
+        try:
+            ready = self.conn.recv()
+        except EOFError:
+            ready = {"ok": False}
+        if not ready.get("ok"):
+            self.stop()
+            raise RuntimeError("Synthesis worker failed to load the models")
+        
+        self.sample_rate = ready["sample_rate"]
+        self.device_name = ready["device_name"]
+        self.resident_models = ready["resident_models"]
+        print(f"🧩 Synthesis worker ready (pid {self.process.pid}, {time.time() - start_time:.1f}s)")
+    
+    def stop(self):
+        """Shut the child process down"""
+        if self.conn is not None:
+            try:
+                self.conn.send({"cmd": "shutdown"})
+            except (OSError, EOFError):
+                pass
+            self.conn.close()
+            self.conn = None
+        if self.process is not None:
+            self.process.join(timeout=5)
+            if self.process.is_alive():
+                self.process.kill()
+            self.process = None
+    
+    def restart(self):
+        """Replace a crashed (or hung) child process"""
+        exit_code = self.process.exitcode if self.process else None
+        print(f"⚠️ Synthesis worker died (exit code {exit_code}) - restarting")
+        self.stop()
+        self.restarts += 1
+        self.start()
+    
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a command and wait for its reply (raises on a crashed worker)"""
+        if not self.is_alive:
+            raise BrokenPipeError("Synthesis worker is not running")
+        self.conn.send(message)
+        reply = self.conn.recv()
+        if reply.get("type") == "error":
+            raise RuntimeError(reply["error"])
+        return reply
+    
+    def _request_with_restart(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Send a command, restarting the worker and retrying once if it crashed"""
+        with self._lock:
+            try:
+                return self._request(message)
+            except (EOFError, OSError):
+                self.restart()
+                return self._request(message)
+    
+    def synthesize(self, model_name: str, metrics=None, **kwargs):
+        """
+        Synthesize one chunk in the child process
+        
+        Args:
+            model_name: Residency name ("english", "multilingual")
+            metrics: Optional GenerationMetrics to add the child's stage timings to
+            **kwargs: Arguments for TTSGenerator.synthesize_model_chunk
+        
+        Returns:
+            Waveform tensor of shape (1, samples)
+        """
+        import numpy as np
+        import torch
+        
+        reply = self._request_with_restart({
+            "cmd": "synthesize",
+            "model_name": model_name,
+            "kwargs": kwargs,
+            "trace": tracer.enabled,
+        })
+        
+        segment = _attach(reply["segment"])
+        try:
+            samples = np.ndarray(reply["shape"], dtype=np.float32, buffer=segment.buf).copy()
+        finally:
+            segment.close()
+        
+        if metrics is not None:
+            metrics.merge(reply.get("stages", {}))
+        if reply.get("trace_events"):
+            tracer.merge(reply["trace_events"])
+        return torch.from_numpy(samples)
+    
+    def calibrate_threads(self) -> Dict[str, Any]:
+        """Run the CPU thread calibration in the child (threads are per process)"""
+        return self._request_with_restart({"cmd": "calibrate"})["value"]
@@ -0,0 +1,230 @@
+"""
+Thread Tuner Feature
+Calibrates PyTorch CPU thread counts and remembers the best setting per host
+"""
+
+import json
+import os
+import platform
+import statistics
+import time
+from datetime import datetime
+from typing import Optional, Dict, Any, List
+
+from utils.config import CACHE_DIR, THREAD_CALIBRATION_TEXT, THREAD_CALIBRATION_RUNS
+
+THREAD_PROFILES_PATH = CACHE_DIR / "thread_profiles.json"
+
+
+def host_key() -> str:
+    """
+    Identify this machine for the thread profile table
+    
+    The logical CPU count is part of the key so a profile is re-calibrated
+    when the same host name comes back with a different core allocation
+    (VMs, containers).
+    """
+    return f"{platform.node() or 'unknown'}-{os.cpu_count() or 1}cpu"
+
+
+def candidate_thread_counts(cpu_count: Optional[int] = None) -> List[int]:
+    """
+    Intra-op thread counts worth trying on this machine
+    
+    Powers of two plus a few in-between values up to the logical CPU count,
+    and the CPU count minus two (leaves headroom for the UI, progress and
+    playback threads).
+    
+    Args:
+        cpu_count: Logical CPU count (defaults to os.cpu_count())
+    
+    Returns:
+        list: Sorted unique thread counts
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    counts = {c for c in (1, 2, 4, 6, 8, 12, 16, 24, 32, 48, 64) if c <= cpus}
+    counts.add(cpus)
+    if cpus > 4:
+        counts.add(cpus - 2)
+    return sorted(counts)
+
+
+def load_thread_profiles() -> Dict[str, Any]:
+    """Load the per-host profile table (empty if missing or unreadable)"""
+    try:
+        with open(THREAD_PROFILES_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except Exception as e:
+        print(f"⚠️ Could not read thread profiles: {e}")
+        return {}
+
+
+def load_thread_profile() -> Optional[Dict[str, Any]]:
+    """
+    Get the calibrated thread profile for this host
+    
+    Returns:
+        dict: {"intra_op_threads", "inter_op_threads", "rtf", ...} or None
+    """
+    return load_thread_profiles().get(host_key())
+
+
+def save_thread_profile(profile: Dict[str, Any]):
+    """
+    Store the thread profile for this host
+    
+    Args:
+        profile: Profile dict from calibrate_threads
+    """
+    profiles = load_thread_profiles()
+    profiles[host_key()] = profile
+    
+    THREAD_PROFILES_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = THREAD_PROFILES_PATH.with_suffix(".tmp")
+    with open(temp_path, "w", encoding="utf-8") as f:
+        json.dump(profiles, f, indent=2)
+    os.replace(temp_path, THREAD_PROFILES_PATH)
+    print(f"💾 Thread profile saved for {host_key()}: {THREAD_PROFILES_PATH}")
+
+
+def apply_thread_profile(profile: Optional[Dict[str, Any]] = None) -> bool:
+    """
+    Apply a thread profile to PyTorch
+    
+    Inter-op threads can only be set before PyTorch starts its first
+    parallel work, so call this before loading the models.
+    
+    Args:
+        profile: Profile to apply (defaults to the saved profile for this host)
+    
+    Returns:
+        bool: True if a profile was applied
+    """
+    import torch
+    
+    profile = profile or load_thread_profile()
+    if not profile:
+        return False
+    
+    torch.set_num_threads(int(profile["intra_op_threads"]))
+    try:
+        torch.set_num_interop_threads(int(profile["inter_op_threads"]))
+    except RuntimeError:
+        # Already started - keeps the current inter-op pool
+        pass
+    
+    print(
+        f"🧵 Thread profile: {torch.get_num_threads()} intra-op / "
+        f"{torch.get_num_interop_threads()} inter-op threads"
+    )
+    return True
+
+
+def _time_synthesis(generator, model, text: str, runs: int, seed: int) -> float:
+    """Median real-time factor of synthesizing text runs times"""
+    rtfs = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        wav = generator._synthesize_chunk(model, text, "en", None, 0.5, 0.5, 0.8, seed=seed)
+        elapsed = time.perf_counter() - start
+        audio_seconds = wav.shape[-1] / model.sr
+        rtfs.append(elapsed / audio_seconds if audio_seconds else float("inf"))
+    return statistics.median(rtfs)
+
+
+def iter_calibrate_threads(
+    generator,
+    text: str = THREAD_CALIBRATION_TEXT,
+    runs: int = THREAD_CALIBRATION_RUNS,
+    thread_counts: Optional[List[int]] = None,
+    progress_callback=None,
+    seed: int = 1234
+):
+    """
+    Benchmark a fixed utterance across intra-op thread counts
+    
+    Generator that yields after every measured thread count so the
+    scheduler can pause it for interactive work; its return value is the
+    best profile (also saved for this host). The original thread count is
+    restored at every yield, so jobs that preempt calibration do not run at
+    a candidate count, and if calibration is interrupted.
+    
+    Args:
+        generator: Initialized TTSGenerator (the English model is used)
+        text: Fixed calibration utterance
+        runs: Timed runs per thread count
+        thread_counts: Counts to try (default: candidate_thread_counts())
+        progress_callback: Optional callback(done, total, message)
+        seed: Random seed so every count synthesizes the same tokens
+    """
+    import torch
+    
+    if getattr(generator, "worker", None):
+        # Thread settings are per process - calibrate inside the synthesis worker
+        return generator.worker.calibrate_threads()
+    
+    model = generator.model
+    thread_counts = thread_counts or candidate_thread_counts()
+    original_threads = torch.get_num_threads()
+    results = []
+    completed = False
+    
+    try:
+        print(f"🧪 Calibrating CPU threads: trying {thread_counts}")
+        # Warm-up (first call pays one-time allocation and kernel selection costs)
+        _time_synthesis(generator, model, text, 1, seed)
+        
+        for index, threads in enumerate(thread_counts):
+            torch.set_num_threads(threads)
+            rtf = _time_synthesis(generator, model, text, runs, seed)
+            results.append({"intra_op_threads": threads, "rtf": round(rtf, 4)})
+            print(f"   {threads:>3} threads: RTF {rtf:.3f}")
+            
+            if progress_callback:
+                progress_callback(index + 1, len(thread_counts), f"{threads} threads: RTF {rtf:.3f}")
+            if index < len(thread_counts) - 1:
+                # The next candidate is applied again when calibration resumes
+                torch.set_num_threads(original_threads)
+                yield
+        
+        # Fewest threads within 3% of the best - leaves cores for everything else
+        best_rtf = min(r["rtf"] for r in results)
+        best = min((r for r in results if r["rtf"] <= best_rtf * 1.03), key=lambda r: r["intra_op_threads"])
+        profile = {
+            "intra_op_threads": best["intra_op_threads"],
+            "inter_op_threads": 1,
+            "rtf": best["rtf"],
+            "device": generator.device,
+            "torch_version": torch.__version__,
+            "calibrated_at": datetime.now().isoformat(timespec="seconds"),
+            "results": results,
+        }
+        save_thread_profile(profile)
+        torch.set_num_threads(profile["intra_op_threads"])
+        completed = True
+        print(f"✅ Best thread count: {profile['intra_op_threads']} (RTF {profile['rtf']:.3f})")
+        return profile
+    finally:
+        if not completed:
+            torch.set_num_threads(original_threads)
+
+
+def calibrate_threads(generator, **kwargs) -> Dict[str, Any]:
+    """
+    Run iter_calibrate_threads to completion
+    
+    Args:
+        generator: Initialized TTSGenerator
+        **kwargs: Same as iter_calibrate_threads
+    
+    Returns:
+        dict: Best profile
+    """
+    steps = iter_calibrate_threads(generator, **kwargs)
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
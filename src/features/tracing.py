@@ -0,0 +1,170 @@
+"""
+Timeline Tracing Feature
+Optional span recorder exported as Chrome Trace Event JSON (open the file
+in chrome://tracing or https://ui.perfetto.dev)
+"""
+
+import json
+import multiprocessing
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Dict, Any
+
+from utils.config import TRACE_MAX_EVENTS
+
+
+def _now_us() -> float:
+    """Trace timestamp in microseconds (perf_counter is system-wide, so worker processes line up)"""
+    return time.perf_counter_ns() / 1000
+
+
+class Tracer:
+    """
+    Records spans from every thread of this process
+    
+    Disabled by default; spans then cost one attribute check. Worker
+    processes record into their own tracer and hand their events back with
+    drain(), the parent adds them with merge() - pids keep them apart in
+    the viewer.
+    """
+    
+    def __init__(self, max_events: int = TRACE_MAX_EVENTS):
+        """
+        Args:
+            max_events: Event cap - later events are counted as dropped
+        """
+        self.enabled = False
+        self.max_events = max_events
+        self.dropped = 0
+        self._events: List[Dict[str, Any]] = []
+        self._named = set()
+        self._lock = threading.Lock()
+    
+    def start(self):
+        """Start recording"""
+        self.enabled = True
+    
+    def stop(self):
+        """Stop recording (recorded events are kept until exported or drained)"""
+        self.enabled = False
+    
+    def _append(self, event: Dict[str, Any]):
+        """Store an event, adding process/thread name metadata on first sight"""
+        pid = os.getpid()
+        tid = threading.get_native_id()
+        event["pid"] = pid
+        event["tid"] = tid
+        
+        with self._lock:
+            if pid not in self._named:
+                self._named.add(pid)
+                self._events.append({
+                    "name": "process_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": multiprocessing.current_process().name},
+                })
+            if (pid, tid) not in self._named:
+                self._named.add((pid, tid))
+                self._events.append({
+                    "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                    "args": {"name": threading.current_thread().name},
+                })
+            
+            if len(self._events) >= self.max_events:
+                self.dropped += 1
+                return
+            self._events.append(event)
+    
+    @contextmanager
+    def span(self, name: str, category: str = "app", **args):
+        """
+        Record the body of a with-block as a span
+        
+        Args:
+            name: Span name
+            category: Trace category (e.g. "stage", "job", "model", "ui")
+            **args: Extra values shown in the viewer
+        """
+        if not self.enabled:
+            yield
+            return
+        
+        start = _now_us()
+        try:
+            yield
+        finally:
+            self._append({
+                "name": name, "cat": category, "ph": "X",
+                "ts": start, "dur": _now_us() - start, "args": args,
+            })
+    
+    def complete(self, name: str, category: str, start: float, end: float, **args):
+        """
+        Record a span measured elsewhere
+        
+        Args:
+            name: Span name
+            category: Trace category
+            start: time.perf_counter() at the start
+            end: time.perf_counter() at the end
+            **args: Extra values shown in the viewer
+        """
+        if not self.enabled:
+            return
+        self._append({
+            "name": name, "cat": category, "ph": "X",
+            "ts": start * 1e6, "dur": (end - start) * 1e6, "args": args,
+        })
+    
+    def instant(self, name: str, category: str = "app", **args):
+        """Record a point in time (thread scoped)"""
+        if not self.enabled:
+            return
+        self._append({"name": name, "cat": category, "ph": "i", "s": "t", "ts": _now_us(), "args": args})
+    
+    def drain(self) -> List[Dict[str, Any]]:
+        """Remove and return the recorded events (used by worker processes)"""
+        with self._lock:
+            events, self._events = self._events, []
+            self._named = set()
+        return events
+    
+    def merge(self, events: List[Dict[str, Any]]):
+        """Add events recorded in another process"""
+        with self._lock:
+            room = max(0, self.max_events - len(self._events))
+            self._events.extend(events[:room])
+            self.dropped += max(0, len(events) - room)
+    
+    def export(self, path) -> int:
+        """
+        Write the recorded events as Chrome Trace Event JSON
+        
+        Args:
+            path: Output .json file
+        
+        Returns:
+            int: Number of events written
+        """
+        with self._lock:
+            events = list(self._events)
+            dropped = self.dropped
+        
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps({
+            "traceEvents": events,
+            "displayTimeUnit": "ms",
+            "otherData": {"dropped_events": dropped},
+        }), encoding="utf-8")
+        
+        if dropped:
+            print(f"⚠️ Trace event limit reached - {dropped} event(s) dropped")
+        print(f"🧵 Trace written: {path} ({len(events)} events)")
+        return len(events)
+
+
+# Global instance
+tracer = Tracer()
@@ -0,0 +1,178 @@
+"""
+Weight Loading Feature
+Memory-mapped checkpoint loading for the Chatterbox models
+
+Checkpoint tensors are backed directly by copy-on-write mappings of the
+files in the Hugging Face cache, so pages come from the OS page cache
+(shared with other processes and warm on later launches) instead of being
+read into freshly allocated buffers and copied into the modules.
+"""
+
+import json
+import mmap
+import struct
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import torch
+
+# safetensors dtype names -> torch dtype attribute names
+_SAFETENSORS_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool",
+}
+
+
+def load_safetensors_mmap(path, device="cpu") -> Dict[str, "torch.Tensor"]:
+    """
+    Load a .safetensors file as tensors that view a memory map of the file
+    
+    The mapping is copy-on-write (ACCESS_COPY): pages are shared with the
+    page cache until a tensor is modified in place.
+    
+    Args:
+        path: .safetensors file
+        device: Target device - anything but "cpu" falls back to a normal load
+    
+    Returns:
+        dict: Tensor name -> tensor
+    """
+    import torch
+    
+    if str(device) != "cpu":
+        from safetensors.torch import load_file
+        return load_file(str(path), device=str(device))
+    
+    with open(path, "rb") as f:
+        header_size = struct.unpack("<Q", f.read(8))[0]
+        header = json.loads(f.read(header_size))
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+    
+    data_start = 8 + header_size
+    tensors = {}
+    for name, info in header.items():
+        if name == "__metadata__":
+            continue
+        
+        dtype = getattr(torch, _SAFETENSORS_DTYPES[info["dtype"]])
+        shape = info["shape"]
+        begin, end = info["data_offsets"]
+        offset = data_start + begin
+        itemsize = torch.empty((), dtype=dtype).element_size()
+        count = (end - begin) // itemsize
+        
+        if count == 0:
+            tensors[name] = torch.empty(shape, dtype=dtype)
+            continue
+        
+        tensor = torch.frombuffer(buffer, dtype=dtype, count=count, offset=offset).reshape(shape)
+        if offset % itemsize:
+            # Misaligned data would make kernels slow (or fault) - copy this one
+            tensor = tensor.clone()
+        tensors[name] = tensor
+    
+    return tensors
+
+
+def _has_shared_parameters(module) -> bool:
+    """Check for tied weights (assign=True would untie them)"""
+    return (
+        len(list(module.named_parameters(remove_duplicate=False)))
+        != len(list(module.named_parameters()))
+    )
+
+
+def _can_assign(module, state_dict) -> bool:
+    """
+    Check that a state dict can replace the module tensors as-is
+    
+    Every tensor must be on the CPU with the same dtype as the module
+    entry it replaces; otherwise load_state_dict has to copy anyway.
+    """
+    import torch
+    
+    if _has_shared_parameters(module):
+        return False
+    
+    current = module.state_dict(keep_vars=True)
+    for key, value in state_dict.items():
+        if not isinstance(value, torch.Tensor) or value.device.type != "cpu":
+            return False
+        if key in current and current[key].dtype != value.dtype:
+            return False
+    return True
+
+
+@contextmanager
+def mapped_weight_loading(device: str = "cpu"):
+    """
+    Load model checkpoints memory-mapped while the context is active
+    
+    Patches (and restores on exit):
+    - torch.load: map_location defaults to the CPU and file paths are
+      opened with mmap=True
+    - safetensors load_file as imported by the chatterbox model modules:
+      replaced by load_safetensors_mmap
+    - nn.Module.load_state_dict: uses assign=True when loading to the CPU
+      and the dtypes match, so modules keep the mapped tensors instead of
+      copying them into their freshly initialized parameters
+    
+    Args:
+        device: Device the models will run on
+    """
+    import importlib
+    import torch
+    from torch import nn
+    
+    original_torch_load = torch.load
+    original_load_state_dict = nn.Module.load_state_dict
+    patched_modules = []
+    
+    def patched_torch_load(f, *args, **kwargs):
+        # Force map_location to CPU if not specified
+        if "map_location" not in kwargs:
+            kwargs["map_location"] = torch.device("cpu")
+        if isinstance(f, (str, Path)) and "mmap" not in kwargs:
+            try:
+                return original_torch_load(f, *args, mmap=True, **kwargs)
+            except RuntimeError:
+                # Legacy (non-zipfile) checkpoints cannot be memory-mapped
+                pass
+        return original_torch_load(f, *args, **kwargs)
+    
+    def patched_load_file(filename, device="cpu"):
+        return load_safetensors_mmap(filename, device)
+    
+    def patched_load_state_dict(module, state_dict, strict=True, assign=False):
+        if not assign and device == "cpu" and _can_assign(module, state_dict):
+            assign = True
+        return original_load_state_dict(module, state_dict, strict=strict, assign=assign)
+    
+    torch.load = patched_torch_load
+    nn.Module.load_state_dict = patched_load_state_dict
+    for module_name in ("chatterbox.tts", "chatterbox.mtl_tts"):
+        try:
+            module = importlib.import_module(module_name)
+        except ImportError:
+            continue
+        if hasattr(module, "load_file"):
+            patched_modules.append((module, module.load_file))
+            module.load_file = patched_load_file
+    
+    try:
+        yield
+    finally:
+        torch.load = original_torch_load
+        nn.Module.load_state_dict = original_load_state_dict
+        for module, original_load_file in patched_modules:
+            module.load_file = original_load_file
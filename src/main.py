@@ -7,11 +7,22 @@ Desktop Window for Chatterbox TTS
 Built with Tkinter for a native desktop experience
 """
 
+import sys
+
+# Start timing imports before anything heavy is loaded (see cli.py --profile-startup)
+from utils.startup_profiler import startup_profiler
+if "--profile-startup" in sys.argv:
+    startup_profiler.start()
+
 import tkinter as tk
 from tkinter import ttk, filedialog, messagebox
 from pathlib import Path
 import tempfile
 import threading
+import time
+from contextlib import nullcontext
+import multiprocessing
+import random
 import sv_ttk
 
 # Import components
@@ -23,24 +34,42 @@ from components.naming_scheme import NamingSchemeComponent
 from components.device_selector import DeviceSelector
 from components.loading_screen import LoadingScreen
 from components.audio_player import AudioPlayerComponent
+from components.sweep_dialog import SweepDialog
+from components.performance_panel import PerformancePanel
 
 # Import features
 from features.generate import tts_generator
+from features.daemon import DaemonClient
+from features.scheduler import GenerationJob, generation_scheduler
+from features.metrics import GenerationMetrics, append_metrics
+from features.metrics_registry import metrics_registry
+from features.profiling import GenerationProfiler
+from features.tracing import tracer
+from features.thread_tuner import iter_calibrate_threads
+from features.model_manifest import check_for_model_updates, forget_model_snapshots
+from features.sweep import schedule_sweep
 from features.project import save_project, load_project, new_project
 from features.export import export_audio, preview_audio
 
 # Import utilities
 from utils.config import *
-from utils.file_utils import generate_audio_filename, ensure_folder_exists
+from utils.file_utils import generate_audio_filename, ensure_folder_exists, prune_preview_files
 from utils.themes import get_theme
 from utils.resource_path import get_resource_path
 from store.state import app_state
+from cli import (
+    parse_args, configure_residency, configure_tracing, configure_session_recording, run_headless, run_calibration,
+    run_update_check, run_daemon_process, run_stop_daemon
+)
 
 
 class ChatterboxApp:
     """Main application window"""
     
-    def __init__(self):
+    def __init__(self, options=None):
+        # Command line options (see cli.py)
+        self.options = options or parse_args([])
+        
         self.root = tk.Tk()
         self.root.title(APP_NAME)
         self.root.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}")
@@ -63,6 +92,21 @@ class ChatterboxApp:
         # Flag to prevent infinite loops when syncing UI
         self.is_syncing = False
         
+        # Last draft take (re-rendered at full quality by "Render Final")
+        self.last_draft_request = None
+        
+        # Generation backend: the in-process tts_generator or a DaemonClient
+        self.generator = tts_generator
+        self.daemon = None
+        
+        # Performance panel (Window menu) - docked in the right column or in its own window
+        self.performance_panel = None
+        self.performance_window = None
+        self.performance_docked = True
+        
+        # Profile the next generation (Audio menu or --profile)
+        self.profile_next = self.options.profile
+        
         self._setup_menu()
         self._setup_ui()
         self._setup_keyboard_shortcuts()
@@ -70,6 +114,7 @@ class ChatterboxApp:
         app_state.subscribe(self._on_state_change)
         
         print("✅ Chatterbox TTS Desktop App Ready!")
+        startup_profiler.mark("main window built")
         
         # Show device selector immediately after window is ready
         self.root.after(100, self._show_device_selector)
@@ -91,8 +136,12 @@ class ChatterboxApp:
         audio_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Audio", menu=audio_menu)
         audio_menu.add_command(label="Generate", command=self._generate_audio)
+        audio_menu.add_command(label="Render Final", command=self._render_final)
+        audio_menu.add_command(label="Expression Sweep...", command=self._open_sweep_dialog)
         audio_menu.add_command(label="Preview", command=self._preview_audio)
         audio_menu.add_command(label="Export...", command=self._export_audio)
+        audio_menu.add_separator()
+        audio_menu.add_command(label="Profile Next Generation", command=self._profile_next_generation)
         
         # Window menu for appearance settings
         window_menu = tk.Menu(menubar, tearoff=0)
@@ -102,6 +151,14 @@ class ChatterboxApp:
         appearance_menu = tk.Menu(window_menu, tearoff=0)
         window_menu.add_cascade(label="Appearance", menu=appearance_menu)
         
+        window_menu.add_separator()
+        self.performance_var = tk.BooleanVar(value=False)
+        window_menu.add_checkbutton(
+            label="Performance Panel",
+            variable=self.performance_var,
+            command=self._toggle_performance_panel
+        )
+        
         # Theme variable
         self.theme_var = tk.StringVar(value="dark")
         appearance_menu.add_radiobutton(
@@ -119,6 +176,8 @@ class ChatterboxApp:
         
         help_menu = tk.Menu(menubar, tearoff=0)
         menubar.add_cascade(label="Help", menu=help_menu)
+        help_menu.add_command(label="Check for Model Updates...", command=self._check_model_updates)
+        help_menu.add_separator()
         help_menu.add_command(label="About", command=self._show_about)
     
     def _setup_ui(self):
@@ -160,6 +219,7 @@ class ChatterboxApp:
         right = ttk.Frame(parent, width=300)
         right.pack(side=tk.RIGHT, fill=tk.BOTH, padx=(5, 0))
         right.pack_propagate(False)
+        self.right_panel = right
         
         # Output folder
         output_frame = ttk.LabelFrame(right, text="Output", padding="10")
@@ -194,7 +254,15 @@ class ChatterboxApp:
         
         # Generate button
         self.generate_btn = ttk.Button(right, text="🎤 Generate (Enter)", command=self._generate_audio)
-        self.generate_btn.pack(fill=tk.X, pady=(0, 10))
+        self.generate_btn.pack(fill=tk.X, pady=(0, 5))
+        
+        # Draft mode: fast, lower quality previews while iterating on wording
+        draft_frame = ttk.Frame(right)
+        draft_frame.pack(fill=tk.X, pady=(0, 10))
+        self.draft_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(draft_frame, text="⚡ Draft (fast preview)", variable=self.draft_var).pack(side=tk.LEFT)
+        self.render_final_btn = ttk.Button(draft_frame, text="✨ Render Final", command=self._render_final, state=tk.DISABLED)
+        self.render_final_btn.pack(side=tk.RIGHT)
         
         # Audio player (built-in preview)
         self.audio_player = AudioPlayerComponent(right)
@@ -232,19 +300,46 @@ class ChatterboxApp:
     
     def _show_device_selector(self):
         """Show device selector and then initialize models"""
-        # Show device selector
-        device_selector = DeviceSelector(self.root)
-        selected_device = device_selector.show()
-        
-        # If user closed the dialog without selecting, exit the app
-        if selected_device is None:
-            print("⚠️ Device selection cancelled. Exiting app...")
-            self.root.quit()
-            return
+        # A running daemon already has the models loaded - skip device selection and loading
+        if not (self.options.no_daemon or self.options.stub_models or self.options.profile):
+            self.daemon = DaemonClient.connect(self.options.daemon_info)
+            if self.daemon:
+                print(f"🛰️ Connected to daemon ({self.daemon.device_name})")
+                self.generator = self.daemon
+                self.root.deiconify()
+                self.status_label.config(text=f"Ready ({self.daemon.device_name})")
+                startup_profiler.mark("connected to daemon")
+                startup_profiler.print_report()
+                return
+        
+        if self.options.device:
+            # Device given on the command line - skip the dialog
+            selected_device = self.options.device
+            self.quantize = self.options.quantize
+            self.precision = self.options.precision or DEFAULT_PRECISION
+            self.calibrate_threads = False
+        else:
+            # Show device selector
+            device_selector = DeviceSelector(self.root)
+            self.root.after_idle(lambda: startup_profiler.mark("device dialog shown"))
+            selected_device = device_selector.show()
+            
+            # If user closed the dialog without selecting, exit the app
+            if selected_device is None:
+                print("⚠️ Device selection cancelled. Exiting app...")
+                self.root.quit()
+                return
+            
+            self.quantize = device_selector.quantize or self.options.quantize
+            self.precision = self.options.precision or device_selector.precision
+            self.calibrate_threads = device_selector.calibrate_threads
         
         # Store the selected device
         self.selected_device = selected_device
-        print(f"🎯 Selected device: {selected_device.upper()}")
+        print(
+            f"🎯 Selected device: {selected_device.upper()} ({self.precision})"
+            + (" (int8 quantized)" if self.quantize else "")
+        )
         
         # Give a brief moment before showing loading screen
         self.root.after(100, self._initialize_tts_models)
@@ -328,7 +423,16 @@ class ChatterboxApp:
         loading_screen.show()
         
         # Initialize models with the selected device
-        success = tts_generator.initialize(loading_screen, force_device=self.selected_device)
+        success = tts_generator.initialize(
+            loading_screen,
+            force_device=self.selected_device,
+            quantize=self.quantize,
+            precision=self.precision,
+            online=self.options.online,
+            warmup=WARMUP_ON_START and not self.options.no_warmup,
+            isolate=SYNTHESIS_SUBPROCESS or self.options.isolated_synthesis,
+            stub_models=self.options.stub_models
+        )
         
         # Close loading screen
         if loading_screen.window and loading_screen.window.winfo_exists():
@@ -336,6 +440,8 @@ class ChatterboxApp:
         
         # Show main window after loading is complete
         self.root.deiconify()
+        startup_profiler.mark("models loaded" if success else "model loading failed")
+        startup_profiler.print_report()
         
         if not success:
             if not loading_screen.is_stopped():
@@ -343,6 +449,28 @@ class ChatterboxApp:
                     "Initialization Error",
                     "Failed to load TTS models. Some features may not work."
                 )
+        elif self.calibrate_threads:
+            self._calibrate_threads()
+    
+    def _calibrate_threads(self):
+        """Run the CPU thread calibration as a background job"""
+        def on_progress(done, total, message):
+            self.root.after(0, lambda: self.status_label.config(text=f"🧵 Calibrating threads {done}/{total}: {message}"))
+        
+        def on_complete(job):
+            if job.status == "done" and job.result:
+                text = f"✅ Thread calibration done: {job.result['intra_op_threads']} threads"
+            else:
+                text = "⚠️ Thread calibration did not finish"
+            self.root.after(0, lambda: self.status_label.config(text=text))
+        
+        self.status_label.config(text="🧵 Calibrating CPU threads...")
+        generation_scheduler.submit(GenerationJob(
+            "Thread calibration",
+            lambda: iter_calibrate_threads(tts_generator, progress_callback=on_progress),
+            on_complete=on_complete,
+            priority=PRIORITY_BACKGROUND
+        ))
     
     # Event handlers
     def _generate_audio(self):
@@ -356,6 +484,26 @@ class ChatterboxApp:
             messagebox.showwarning("No Text", "Enter text first")
             return
         
+        # Every take gets a seed so a draft can be re-rendered as the same take
+        request = {
+            "text": text,
+            "voice_config": self.voice_selector.get_voice_config(),
+            "expression_config": self.expression_controls.get_expression_config(),
+            "language_code": app_state.language_code,
+            "quality": "draft" if self.draft_var.get() else "final",
+            "seed": random.randint(0, 2**31 - 1),
+        }
+        self._start_generation(request)
+    
+    def _render_final(self):
+        """Re-render the last draft take at full quality"""
+        if self.is_generating or not self.last_draft_request:
+            return
+        
+        self._start_generation(dict(self.last_draft_request, quality="final"))
+    
+    def _start_generation(self, request: dict):
+        """Queue a preview generation for the given request"""
         # Set generating flag
         self.is_generating = True
         
@@ -365,49 +513,132 @@ class ChatterboxApp:
         self.root.update()
         
         # Use temporary file for preview (without prefix)
-        temp_filename = f"chatterbox_preview_{generate_audio_filename(text)}"
+        prefix = "chatterbox_draft" if request["quality"] == "draft" else "chatterbox_preview"
+        temp_filename = f"{prefix}_{generate_audio_filename(request['text'])}"
         temp_file = Path(tempfile.gettempdir()) / temp_filename
         
         def progress_callback(percentage, status):
             """Update UI with progress - safe for threads"""
-            self.root.after(0, lambda p=percentage, s=status: self.status_label.config(text=f"{s} {int(p)}%"))
+            self._ui_call("progress update", lambda p=percentage, s=status: self.status_label.config(text=f"{s} {int(p)}%"))
+        
+        # Logged once the result is loaded into the player (see _on_generation_complete)
+        metrics = GenerationMetrics("Generate", auto_log=False)
+        
+        profiler = None
+        if self.profile_next:
+            self.profile_next = False
+            profiler = metrics.profiler = GenerationProfiler()
+            profile_base = Path(self.output_folder_var.get()) / f"profile_{time.strftime('%Y%m%d_%H%M%S')}"
+            profiler.start()
+        
+        def run_generation():
+            """Generate audio on the scheduler worker thread (chunk by chunk)"""
+            # The daemon schedules by priority too - keep previews ahead of its batch work
+            extra = {"priority": PRIORITY_INTERACTIVE} if self.daemon else {}
+            steps = self.generator.iter_generate_audio(
+                request["text"], 
+                request["voice_config"], 
+                request["expression_config"], 
+                temp_file,
+                request["language_code"],
+                progress_callback,
+                request["quality"],
+                request["seed"],
+                metrics,
+                **extra
+            )
+            return profiler.wrap_steps(steps) if profiler else steps
         
-        def generate_in_thread():
-            """Generate audio in background thread"""
-            try:
-                voice_config = self.voice_selector.get_voice_config()
-                expression_config = self.expression_controls.get_expression_config()
-                
-                result_path = tts_generator.generate_audio(
-                    text, 
-                    voice_config, 
-                    expression_config, 
-                    temp_file,
-                    app_state.language_code,
-                    progress_callback
-                )
-                
-                # Update UI on main thread
-                self.root.after(0, lambda: self._on_generation_complete(result_path, temp_file))
-                
-            except Exception as e:
-                self.root.after(0, lambda: self._on_generation_error(e))
+        def on_job_complete(job):
+            """Update UI on main thread"""
+            if profiler:
+                self._save_profile(profiler, profile_base)
+            
+            if job.status == "failed":
+                metrics.finish("failed")
+                append_metrics(metrics)
+                self._ui_call("generation error", lambda: self._on_generation_error(job.error))
+            else:
+                self._ui_call("generation complete", lambda: self._on_generation_complete(job.result, temp_file, request, metrics))
+        
+        if generation_scheduler.current_job or generation_scheduler.pending_count:
+            self.status_label.config(text="Pausing batch renders for preview...")
+        
+        # Interactive jobs preempt batch renders at the next chunk boundary
+        generation_scheduler.submit(
+            GenerationJob("Generate", run_generation, on_job_complete, priority=PRIORITY_INTERACTIVE, metrics=metrics)
+        )
+    
+    def _profile_next_generation(self):
+        """Capture the next Generate with cProfile and the stack sampler"""
+        if self.daemon:
+            messagebox.showinfo(
+                "Profile Next Generation",
+                "Generations currently run in the background daemon, so they cannot be profiled from here.\n\n"
+                "Start the app with --no-daemon (or --profile) to profile a generation."
+            )
+            return
+        
+        self.profile_next = True
+        self.status_label.config(text="🔬 The next generation will be profiled")
+    
+    def _save_profile(self, profiler: GenerationProfiler, base_path: Path):
+        """Write the profile files (on the worker thread) and report where they are"""
+        profiler.stop()
+        try:
+            pstats_path, collapsed_path = profiler.save(base_path)
+        except Exception as e:
+            print(f"❌ Could not save profile: {e}")
+            self._ui_call("profile error", lambda error=str(e): messagebox.showerror("Profile", f"Could not save the profile:\n{error}"))
+            return
         
-        # Start generation in background thread
-        thread = threading.Thread(target=generate_in_thread, daemon=True)
-        thread.start()
+        print(f"🔬 Profile saved ({profiler.summary()}): {pstats_path}, {collapsed_path}")
+        files = "\n".join(str(path) for path in (pstats_path, collapsed_path) if path)
+        self._ui_call("profile saved", lambda: messagebox.showinfo(
+            "Profile Saved", f"{profiler.summary()}\n\n{files}\n\nAttach these files when reporting a slowdown."
+        ))
+    
+    def _ui_call(self, name: str, callback):
+        """
+        Run a callback on the Tk thread (from any thread)
+        
+        When tracing, the wait until Tk picks the callback up and the
+        callback itself are recorded as "ui" spans - a long wait means the
+        UI thread is starved.
+        """
+        queued_at = time.perf_counter()
+        
+        def run():
+            tracer.complete(f"{name} (waiting for UI)", "ui", queued_at, time.perf_counter())
+            with tracer.span(name, "ui"):
+                callback()
+        
+        self.root.after(0, run)
     
-    def _on_generation_complete(self, result_path, temp_file):
+    def _on_generation_complete(self, result_path, temp_file, request=None, metrics=None):
         """Handle successful audio generation"""
         if result_path:
             app_state.update(generated_audio_path=result_path)
-            self.audio_player.load_audio(result_path)
+            with metrics.stage("player_load") if metrics else nullcontext():
+                self.audio_player.load_audio(result_path)
             self.export_btn.config(state=tk.NORMAL)
-            self.status_label.config(text="✅ Generation complete!")
+            prune_preview_files()
+            
+            # Drafts can be re-rendered at full quality with the same seed
+            if request and request["quality"] == "draft":
+                self.last_draft_request = request
+                self.status_label.config(text="✅ Draft ready - use Render Final for full quality")
+            else:
+                self.last_draft_request = None
+                self.status_label.config(text="✅ Generation complete!")
         else:
             self.status_label.config(text="❌ Generation failed")
             messagebox.showerror("Generation Failed", "Failed to generate audio. Check console for details.")
         
+        if metrics:
+            metrics.finish()
+            append_metrics(metrics)
+        
         # Clear generating flag
         self.is_generating = False
         
@@ -428,9 +659,53 @@ class ChatterboxApp:
         """Enable or disable UI controls"""
         state = tk.NORMAL if enabled else tk.DISABLED
         self.generate_btn.config(state=state)
+        self.render_final_btn.config(state=state if self.last_draft_request else tk.DISABLED)
         self.text_input.text_widget.config(state=state)
         # Note: Components don't expose enable/disable yet, but generate button is the main one
     
+    def _open_sweep_dialog(self):
+        """Render the current line across several expressions as one batch"""
+        text = self.text_input.get_text()
+        if not text:
+            messagebox.showwarning("No Text", "Enter text first")
+            return
+        
+        dialog = SweepDialog(
+            self.root,
+            self.expression_controls.emotion_presets,
+            self.expression_controls.get_expression_config()
+        )
+        variants = dialog.show()
+        if not variants:
+            return
+        
+        def on_progress(done, total, label):
+            self._ui_call("sweep progress", lambda: self.status_label.config(text=f"Sweep: {done}/{total} rendered ({label})"))
+        
+        def on_complete(sweep_folder, results):
+            rendered = sum(1 for _, path in results if path)
+            self._ui_call("sweep complete", lambda: self._on_sweep_complete(sweep_folder, rendered, len(results)))
+        
+        self.status_label.config(text=f"Sweep: 0/{len(variants)} rendered")
+        schedule_sweep(
+            text,
+            self.voice_selector.get_voice_config(),
+            variants,
+            Path(self.output_folder_var.get()),
+            app_state.language_code,
+            on_progress,
+            on_complete,
+            generator=self.generator
+        )
+    
+    def _on_sweep_complete(self, sweep_folder: Path, rendered: int, total: int):
+        """Handle end of a sweep batch"""
+        self.status_label.config(text=f"✅ Sweep complete: {rendered}/{total} takes")
+        messagebox.showinfo(
+            "Sweep Complete",
+            f"Rendered {rendered} of {total} takes.\n\nSaved to:\n{sweep_folder}\n\nSee sweep.json for the take labels."
+        )
+    
     def _preview_audio(self):
         if app_state.generated_audio_path:
             preview_audio(app_state.generated_audio_path)
@@ -602,6 +877,50 @@ class ChatterboxApp:
         if file_path:
             save_project(Path(file_path))
     
+    def _metrics_snapshot(self) -> dict:
+        """Metrics of whichever process runs the models"""
+        return self.daemon.metrics_snapshot() if self.daemon else metrics_registry.snapshot()
+    
+    def _toggle_performance_panel(self):
+        if self.performance_var.get():
+            self._show_performance_panel()
+        else:
+            self._hide_performance_panel()
+    
+    def _show_performance_panel(self):
+        """Create the panel in the right column (docked) or a separate window"""
+        self._hide_performance_panel()
+        
+        if self.performance_docked:
+            parent = self.right_panel
+        else:
+            self.performance_window = tk.Toplevel(self.root)
+            self.performance_window.title("Performance")
+            self.performance_window.geometry("340x420")
+            self.performance_window.protocol("WM_DELETE_WINDOW", self._close_performance_window)
+            parent = self.performance_window
+        
+        self.performance_panel = PerformancePanel(
+            parent, self._metrics_snapshot, on_dock_toggle=self._toggle_performance_dock, docked=self.performance_docked
+        )
+        self.performance_panel.frame.pack(fill=tk.BOTH, expand=True, padx=0 if self.performance_docked else 10, pady=(0, 10))
+    
+    def _hide_performance_panel(self):
+        if self.performance_panel:
+            self.performance_panel.destroy()
+            self.performance_panel = None
+        if self.performance_window:
+            self.performance_window.destroy()
+            self.performance_window = None
+    
+    def _toggle_performance_dock(self):
+        self.performance_docked = not self.performance_docked
+        self._show_performance_panel()
+    
+    def _close_performance_window(self):
+        self.performance_var.set(False)
+        self._hide_performance_panel()
+    
     def _on_close(self):
         if app_state.unsaved_changes:
             response = messagebox.askyesnocancel("Unsaved Changes", "Save before closing?")
@@ -611,6 +930,47 @@ class ChatterboxApp:
                 self._save_project()
         tts_generator.cleanup()
         self.root.destroy()
+        # Takes the player still holds open are removed after the next session's first take
+        prune_preview_files(keep=0)
+    
+    def _check_model_updates(self):
+        """Ask the hub for newer model revisions (the only deliberate network access)"""
+        self.status_label.config(text="🔎 Checking for model updates...")
+        
+        def check():
+            try:
+                results = check_for_model_updates()
+                self.root.after(0, lambda: self._on_model_updates_checked(results))
+            except Exception as e:
+                print(f"❌ Update check failed: {e}")
+                self.root.after(0, lambda error=str(e): self._on_model_updates_checked(None, error))
+        
+        threading.Thread(target=check, daemon=True).start()
+    
+    def _on_model_updates_checked(self, results, error: str = None):
+        """Show the update check result"""
+        self.status_label.config(text="Ready")
+        if error is not None:
+            messagebox.showerror("Update Check Failed", f"Could not reach the model hub:\n{error}")
+            return
+        if not results:
+            messagebox.showinfo("Model Updates", "No models recorded yet - load the models once first.")
+            return
+        
+        lines = [
+            f"{name}: {info['local_revision'][:8]} → {info['remote_revision'][:8]}" if info["update_available"]
+            else f"{name}: up to date ({info['local_revision'][:8]})"
+            for name, info in results.items()
+        ]
+        if not any(info["update_available"] for info in results.values()):
+            messagebox.showinfo("Model Updates", "\n".join(lines))
+            return
+        
+        if messagebox.askyesno(
+            "Model Updates",
+            "\n".join(lines) + "\n\nDownload the new models the next time the app starts?"
+        ):
+            forget_model_snapshots()
     
     def _show_about(self):
         messagebox.showinfo("About", f"{APP_NAME}\nVersion {APP_VERSION}\n\nModular desktop TTS app\nby {APP_AUTHOR}")
@@ -620,9 +980,27 @@ class ChatterboxApp:
 
 
 def main():
-    app = ChatterboxApp()
+    startup_profiler.mark("imports done")
+    options = parse_args()
+    configure_residency(options)
+    configure_tracing(options)
+    configure_session_recording(options)
+    if options.stop_daemon:
+        sys.exit(run_stop_daemon(options))
+    if options.daemon:
+        sys.exit(run_daemon_process(options))
+    if options.check_updates:
+        sys.exit(run_update_check(options))
+    if options.calibrate_threads:
+        sys.exit(run_calibration(options))
+    if options.text:
+        sys.exit(run_headless(options))
+    
+    app = ChatterboxApp(options)
     app.run()
 
 
 if __name__ == "__main__":
+    # Needed for the synthesis worker process in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -20,6 +20,9 @@ OUTPUT_FOLDER = BASE_DIR / "outputs"
 PROJECTS_FOLDER = BASE_DIR / "projects"
 REFERENCE_FOLDER = BASE_DIR / "reference_audio"
 
+# Model cache (Hugging Face downloads, quantized checkpoints, host profiles)
+CACHE_DIR = Path.home() / ".cache" / "chatterbox_tts"
+
 # Create folders if they don't exist
 OUTPUT_FOLDER.mkdir(exist_ok=True)
 PROJECTS_FOLDER.mkdir(exist_ok=True)
@@ -122,6 +125,100 @@ SPEED_RANGE = (0.5, 2.0)
 PITCH_RANGE = (-12, 12)
 EMPHASIS_RANGE = (0, 100)
 
+# ============================================
+# GENERATION SCHEDULING
+# ============================================
+# Priority classes (lower value runs first). Higher priority jobs preempt
+# lower ones at chunk boundaries; preempted jobs resume automatically.
+PRIORITY_INTERACTIVE = 0  # Generate button / quick previews
+PRIORITY_NORMAL = 1       # Sweeps and other batch renders
+PRIORITY_BACKGROUND = 2   # Long unattended renders
+
+# Long texts are synthesized in sentence chunks of at most this many characters
+MAX_CHUNK_CHARS = 300
+
+# ============================================
+# PRECISION
+# ============================================
+# "bf16" runs the token model under bfloat16 autocast (fast on AVX-512/AMX CPUs)
+PRECISIONS = ["fp32", "bf16"]
+DEFAULT_PRECISION = "fp32"
+
+# ============================================
+# MODEL RESIDENCY
+# ============================================
+# RAM budget for loaded models - least recently used models are unloaded
+# to stay under it (0 = unlimited, both models stay loaded)
+MODEL_RAM_BUDGET_GB = 0
+# Unload models after this many idle minutes (0 = never)
+MODEL_IDLE_UNLOAD_MINUTES = 0
+
+# ============================================
+# SYNTHESIS PROCESS
+# ============================================
+# Run the models in a child process so heavy renders never stall the UI
+# (waveforms come back through shared memory; a crashed worker is restarted)
+SYNTHESIS_SUBPROCESS = False
+
+# ============================================
+# WARM-UP
+# ============================================
+# Tiny synthesis per loaded model after startup (background priority) so the
+# first real request does not pay allocator growth / kernel selection costs
+WARMUP_ON_START = True
+WARMUP_TEXT = "Warming up."
+
+# ============================================
+# CPU THREAD CALIBRATION
+# ============================================
+# Fixed utterance timed at each thread count (profile stored per host in CACHE_DIR)
+THREAD_CALIBRATION_TEXT = "Calibration run. The quick brown fox jumps over the lazy dog."
+THREAD_CALIBRATION_RUNS = 2  # Timed runs per thread count (after one warm-up)
+
+# ============================================
+# GENERATION QUALITY
+# ============================================
+# "draft" trades quality for speed for quick auditioning, "final" is full quality
+GENERATION_QUALITIES = ["final", "draft"]
+
+# Draft mode: fewer flow-matching steps in the S3Gen vocoder (model default: 10)
+DRAFT_FLOW_STEPS = 4
+
+# Speech token budget per chunk (25 tokens ~ 1 second of speech). Drafts use the
+# same budget - a smaller cap would cut drafts short and "Render Final" would
+# no longer be the same take
+MAX_NEW_TOKENS = 1000  # Same as model.generate
+
+# Pitch shift analysis settings (Praat "To Manipulation" + librosa fallback)
+PITCH_TIERS = {
+    "quality": {"name": "quality", "time_step": 0.01, "pitch_floor": 75, "pitch_ceiling": 600, "res_type": "soxr_hq"},
+    "fast": {"name": "fast", "time_step": 0.025, "pitch_floor": 100, "pitch_ceiling": 500, "res_type": "soxr_lq"},
+}
+
+# ============================================
+# GENERATION METRICS
+# ============================================
+# Per-stage timings of every generation are appended to a JSONL log in
+# CACHE_DIR; the oldest half is dropped once the file grows past this size
+METRICS_LOG_MAX_BYTES = 5 * 1024 * 1024
+
+# Event cap of the optional timeline tracer (--trace); later events are dropped
+TRACE_MAX_EVENTS = 200_000
+
+# Stack sampling interval of "Profile Next Generation" / --profile (seconds)
+PROFILE_SAMPLE_INTERVAL = 0.005
+
+# OpenMetrics endpoint of the daemon (http://127.0.0.1:<port>/metrics, 0 = off)
+DAEMON_METRICS_PORT = 9464
+
+# Generate requests arriving within this window are queued together, grouped
+# by language and voice so the model and voice conditioning caches are reused
+# (0 = submit each request as it arrives)
+DAEMON_BATCH_WINDOW_MS = 0
+
+# Refresh interval of the Performance panel
+PERFORMANCE_PANEL_REFRESH_MS = 1000
+
 # ============================================
 # FILE SETTINGS
 # ============================================
@@ -138,6 +235,11 @@ PROJECT_FORMATS = [
     ("All Files", "*.*"),
 ]
 
+# Preview/draft takes are written to the temp folder; older ones are deleted
+# once more than this many exist (the newest one is the one in the player)
+PREVIEW_FILE_PREFIXES = ("chatterbox_preview_", "chatterbox_draft_")
+PREVIEW_FILES_KEEP = 5
+
 # ============================================
 # KEYBOARD SHORTCUTS
 # ============================================
@@ -3,10 +3,13 @@ File utilities for project save/load and file operations
 """
 
 import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, Dict, Any
 
+from utils.config import PREVIEW_FILE_PREFIXES, PREVIEW_FILES_KEEP
+
 
 def save_project_to_file(state_dict: Dict[str, Any], file_path: Path) -> bool:
     """
@@ -106,3 +109,38 @@ def ensure_folder_exists(folder_path: Path) -> bool:
     except Exception as e:
         print(f"Error creating folder: {e}")
         return False
+
+
+def prune_preview_files(keep: int = PREVIEW_FILES_KEEP, folder: Optional[Path] = None) -> int:
+    """
+    Delete all but the newest preview/draft takes from the temp folder
+    
+    Every Generate writes a new timestamped file, so without pruning a long
+    session (and every earlier one) leaves them piling up.
+    
+    Args:
+        keep: Number of most recent takes to keep
+        folder: Folder holding the takes (default: the system temp folder)
+        
+    Returns:
+        int: Number of files deleted
+    """
+    folder = Path(folder or tempfile.gettempdir())
+    takes = []
+    for prefix in PREVIEW_FILE_PREFIXES:
+        for path in folder.glob(f"{prefix}*.wav"):
+            try:
+                takes.append((path.stat().st_mtime, path))
+            except OSError:
+                continue
+    takes.sort(reverse=True)
+    
+    deleted = 0
+    for _, path in takes[keep:]:
+        try:
+            path.unlink()
+            deleted += 1
+        except OSError:
+            # Still open (e.g. in the player on Windows) - retried next time
+            pass
+    return deleted
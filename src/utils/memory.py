@@ -0,0 +1,78 @@
+"""
+Process Memory Utilities
+Resident memory of this process without extra dependencies
+"""
+
+import os
+import sys
+from typing import Optional
+
+
+def _windows_memory_counters():
+    """GetProcessMemoryInfo for the current process (Windows only)"""
+    import ctypes
+    from ctypes import wintypes
+    
+    class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+        _fields_ = [
+            ("cb", wintypes.DWORD),
+            ("PageFaultCount", wintypes.DWORD),
+            ("PeakWorkingSetSize", ctypes.c_size_t),
+            ("WorkingSetSize", ctypes.c_size_t),
+            ("QuotaPeakPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaPeakNonPagedPoolUsage", ctypes.c_size_t),
+            ("QuotaNonPagedPoolUsage", ctypes.c_size_t),
+            ("PagefileUsage", ctypes.c_size_t),
+            ("PeakPagefileUsage", ctypes.c_size_t),
+        ]
+    
+    counters = PROCESS_MEMORY_COUNTERS()
+    counters.cb = ctypes.sizeof(counters)
+    process = ctypes.windll.kernel32.GetCurrentProcess()
+    if not ctypes.windll.psapi.GetProcessMemoryInfo(process, ctypes.byref(counters), counters.cb):
+        return None
+    return counters
+
+
+def peak_rss_bytes() -> Optional[int]:
+    """
+    High-water mark of this process's resident memory
+    
+    Uses getrusage on Linux/macOS and GetProcessMemoryInfo on Windows.
+    
+    Returns:
+        Optional[int]: Peak RSS in bytes, or None if it cannot be read
+    """
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.PeakWorkingSetSize if counters else None
+    
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def current_rss_bytes() -> Optional[int]:
+    """
+    Current resident memory of this process
+    
+    Reads /proc on Linux and GetProcessMemoryInfo on Windows.
+    
+    Returns:
+        Optional[int]: RSS in bytes, or None if it cannot be read (e.g. macOS)
+    """
+    if sys.platform == "win32":
+        counters = _windows_memory_counters()
+        return counters.WorkingSetSize if counters else None
+    
+    try:
+        with open("/proc/self/statm", "r") as statm:
+            resident_pages = int(statm.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
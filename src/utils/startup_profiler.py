@@ -0,0 +1,133 @@
+"""
+Startup Profiler
+Import timing and startup milestones for --profile-startup
+
+Times every module import (like python -X importtime) with a meta path
+hook, and records named milestones (window shown, models loaded...).
+Times are relative to the moment the profiler was started, which is
+right after the interpreter itself is up.
+"""
+
+import sys
+import time
+from importlib.abc import MetaPathFinder
+from typing import Optional, List, Tuple
+
+
+class _TimingLoader:
+    """Wraps a module loader to time exec_module"""
+    
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+    
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+    
+    def exec_module(self, module):
+        self._profiler._enter_import()
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._exit_import(module.__name__, time.perf_counter() - start)
+    
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _TimingFinder(MetaPathFinder):
+    """Meta path finder that wraps the loaders found by the other finders"""
+    
+    def __init__(self, profiler: "StartupProfiler"):
+        self._profiler = profiler
+    
+    def find_spec(self, fullname, path, target=None):
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                    spec.loader = _TimingLoader(spec.loader, self._profiler)
+                return spec
+        return None
+
+
+class StartupProfiler:
+    """
+    Collects import timings and milestones during startup
+    """
+    
+    def __init__(self):
+        self.enabled = False
+        self.start_time: Optional[float] = None
+        self.imports: List[Tuple[str, float, float]] = []  # (module, self seconds, cumulative seconds)
+        self.milestones: List[Tuple[str, float]] = []
+        self._child_time = [0.0]
+        self._finder: Optional[_TimingFinder] = None
+    
+    def start(self):
+        """Install the import hook and start the clock"""
+        if self.enabled:
+            return
+        self.enabled = True
+        self.start_time = time.perf_counter()
+        self._finder = _TimingFinder(self)
+        sys.meta_path.insert(0, self._finder)
+    
+    def stop(self):
+        """Remove the import hook"""
+        if self._finder in sys.meta_path:
+            sys.meta_path.remove(self._finder)
+        self._finder = None
+    
+    def mark(self, name: str):
+        """
+        Record a startup milestone
+        
+        Args:
+            name: Milestone name (e.g. "main window ready")
+        """
+        if self.enabled:
+            self.milestones.append((name, time.perf_counter() - self.start_time))
+    
+    def _enter_import(self):
+        self._child_time.append(0.0)
+    
+    def _exit_import(self, module_name: str, cumulative: float):
+        children = self._child_time.pop()
+        self._child_time[-1] += cumulative
+        self.imports.append((module_name, cumulative - children, cumulative))
+    
+    def report(self, top: int = 25) -> str:
+        """
+        Build the startup timing report
+        
+        Args:
+            top: Number of slowest imports to list
+        
+        Returns:
+            str: Report text
+        """
+        lines = ["", "⏱️ Startup profile (ms since the profiler started)"]
+        for name, elapsed in self.milestones:
+            lines.append(f"   {elapsed * 1000:9.1f}  {name}")
+        
+        total_imports = sum(self_time for _, self_time, _ in self.imports)
+        lines.append(f"   Imports: {len(self.imports)} modules, {total_imports * 1000:.1f} ms total")
+        lines.append(f"   {'self ms':>9} {'cumul. ms':>10}  module")
+        for module_name, self_time, cumulative in sorted(self.imports, key=lambda item: -item[2])[:top]:
+            lines.append(f"   {self_time * 1000:9.1f} {cumulative * 1000:10.1f}  {module_name}")
+        return "\n".join(lines)
+    
+    def print_report(self, top: int = 25):
+        """Print the report once (no-op when profiling is off)"""
+        if self.enabled:
+            print(self.report(top))
+            self.stop()
+            self.enabled = False
+
+
+# Global instance
+startup_profiler = StartupProfiler()
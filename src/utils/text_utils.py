@@ -0,0 +1,99 @@
+"""
+Text utilities for splitting input into synthesis chunks
+"""
+
+import re
+from typing import List
+
+
+# Sentence end: . ! ? and their CJK/Devanagari/Arabic counterparts, followed by space or end
+_SENTENCE_END = re.compile(r"(?<=[.!?。！？।؟])\s+|(?<=[。！？])")
+
+# Chinese/Japanese characters and punctuation - written without spaces between words
+_CJK = re.compile(r"[\u3000-\u303f\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]")
+
+
+def _join(left: str, right: str) -> str:
+    """Join two pieces with a space, or directly when either side is CJK"""
+    if not left:
+        return right
+    if _CJK.match(left[-1]) or _CJK.match(right[0]):
+        return left + right
+    return f"{left} {right}"
+
+
+def split_text_into_chunks(text: str, max_chars: int = 300) -> List[str]:
+    """
+    Split text into chunks at sentence boundaries
+    
+    Sentences are packed greedily into chunks of at most max_chars.
+    A single sentence longer than max_chars is split at commas, then at
+    whitespace, and as a last resort by character count (CJK text has no
+    spaces), so no chunk exceeds the limit. Pieces are joined with a space
+    except next to CJK characters.
+    
+    Args:
+        text: Input text
+        max_chars: Maximum characters per chunk
+    
+    Returns:
+        List[str]: Non-empty chunks in order (empty list for blank text)
+    """
+    text = text.strip()
+    if not text:
+        return []
+    if len(text) <= max_chars:
+        return [text]
+    
+    pieces = []
+    for sentence in _SENTENCE_END.split(text):
+        sentence = sentence.strip()
+        if not sentence:
+            continue
+        if len(sentence) <= max_chars:
+            pieces.append(sentence)
+        else:
+            pieces.extend(_split_long_sentence(sentence, max_chars))
+    
+    chunks = []
+    current = ""
+    for piece in pieces:
+        candidate = _join(current, piece)
+        if len(candidate) <= max_chars:
+            current = candidate
+        else:
+            if current:
+                chunks.append(current)
+            current = piece
+    if current:
+        chunks.append(current)
+    
+    return chunks
+
+
+def _split_long_sentence(sentence: str, max_chars: int) -> List[str]:
+    """Split an over-long sentence at commas, falling back to whitespace, then character count"""
+    parts = []
+    for clause in re.split(r"(?<=[,;:，、；])\s*", sentence):
+        clause = clause.strip()
+        if not clause:
+            continue
+        if len(clause) <= max_chars:
+            parts.append(clause)
+            continue
+        
+        words = []
+        for word in clause.split():
+            words.extend(word[i:i + max_chars] for i in range(0, len(word), max_chars))
+        
+        current = ""
+        for word in words:
+            candidate = _join(current, word)
+            if len(candidate) <= max_chars:
+                current = candidate
+            else:
+                parts.append(current)
+                current = word
+        if current:
+            parts.append(current)
+    return parts